@@ -0,0 +1,8 @@
+"""Async Page Objects Package - built on playwright.async_api"""
+
+from pages.async_api.base_page import AsyncBasePage
+from pages.async_api.home_page import AsyncHomePage
+from pages.async_api.login_page import AsyncLoginPage
+from pages.async_api.outfittery_home_page import AsyncOutfitteryHomePage
+
+__all__ = ['AsyncBasePage', 'AsyncHomePage', 'AsyncLoginPage', 'AsyncOutfitteryHomePage']
@@ -0,0 +1,145 @@
+"""Async Base Page Object - Parent class for all async page objects"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from pages.page_object import PageObject
+from pages.page_scripts import (
+    MUTATION_SEEN_JS, OBSERVE_MUTATION_JS, TEXT_CHANGED_JS, NetworkTracker, UrlPattern, mutation_key,
+)
+from pages.page_state import QUERY_STATE_JS, PageSnapshot
+from pages.performance import COLLECT_PERFORMANCE_JS
+
+
+class AsyncBasePage(PageObject):
+    """Async base page class mirroring pages.base_page.BasePage"""
+    
+    async def navigate(self, url: str):
+        """Navigate to a specific URL"""
+        await self.page.goto(url)
+        recorder = self.performance_recorder
+        if recorder is not None:
+            recorder.record(self.page.url, self.page.viewport_size, await self.measure_performance())
+    
+    async def measure_performance(self, settle_ms: int = 100) -> Dict[str, Any]:
+        """Read navigation, paint, LCP/CLS and resource timings of the current document"""
+        return await self.page.evaluate(COLLECT_PERFORMANCE_JS, settle_ms)
+    
+    async def get_title(self) -> str:
+        """Get the page title"""
+        return await self.page.title()
+    
+    def get_url(self) -> str:
+        """Get the current URL"""
+        return self.page.url
+    
+    async def wait_for_url(self, url: str, timeout: int = 10000):
+        """Wait for URL to match"""
+        await self.page.wait_for_url(url, timeout=timeout)
+    
+    async def click(self, selector: str):
+        """Click an element"""
+        await self.page.click(selector)
+    
+    async def fill(self, selector: str, text: str):
+        """Fill a text input"""
+        await self.page.fill(selector, text)
+    
+    async def is_visible(self, selector: str) -> bool:
+        """Check if element is visible"""
+        return await self.locator(selector).is_visible()
+    
+    async def take_screenshot(self, path: str):
+        """Take a screenshot"""
+        await self.page.screenshot(path=path)
+    
+    async def query_state(self, spec: Dict[str, List[str]]) -> PageSnapshot:
+        """Read many selector properties in a single in-page evaluation (see BasePage.query_state)"""
+        data = await self.page.evaluate(QUERY_STATE_JS, spec)
+        for selector, state in data["selectors"].items():
+            if state.get("unsupported"):
+                data["selectors"][selector] = await self._query_state_with_locators(selector, spec[selector])
+        return PageSnapshot(data)
+    
+    async def _query_state_with_locators(self, selector: str, props: List[str]) -> Dict:
+        matches = self.locator(selector)
+        first = self.locator(selector, first=True)
+        count = await matches.count()
+        state = {}
+        for prop in props:
+            if prop == "visible":
+                state[prop] = False
+                for i in range(count):
+                    if await matches.nth(i).is_visible():
+                        state[prop] = True
+                        break
+            elif prop == "count":
+                state[prop] = count
+            elif not count:
+                state[prop] = None
+            elif prop == "text":
+                state[prop] = await first.text_content()
+            elif prop == "inner_text":
+                state[prop] = await first.inner_text()
+            elif prop == "bbox":
+                state[prop] = await first.bounding_box()
+            elif prop.startswith("attr:"):
+                state[prop] = await first.get_attribute(prop[len("attr:"):])
+        return state
+    
+    # ------------------------------------------------------------------
+    # Wait engine - see BasePage for the sync equivalents
+    # ------------------------------------------------------------------
+    
+    async def wait_for_url_change(self, previous_url: str, timeout: int = 10000):
+        """Wait until the URL differs from previous_url"""
+        await self.page.wait_for_url(lambda url: url != previous_url, timeout=timeout)
+    
+    async def wait_for_text_change(self, selector: str, previous_text: Optional[str], timeout: int = 10000):
+        """Wait until the first element matching selector has different text"""
+        await self.page.wait_for_function(TEXT_CHANGED_JS, arg=[selector, previous_text], timeout=timeout)
+    
+    async def wait_for_network_quiet(self, url_patterns: Optional[List[UrlPattern]] = None,
+                                     quiet_ms: int = 500, timeout: int = 10000):
+        """Wait until no matching request has been in flight for quiet_ms"""
+        async with self.expect_network_quiet(url_patterns, quiet_ms=quiet_ms, timeout=timeout):
+            pass
+    
+    @asynccontextmanager
+    async def expect_url_change(self, timeout: int = 10000) -> AsyncIterator[None]:
+        """Wait for the URL to change after the wrapped action"""
+        previous_url = self.page.url
+        yield
+        await self.wait_for_url_change(previous_url, timeout=timeout)
+    
+    @asynccontextmanager
+    async def expect_dom_mutation(self, selector: str = "body", timeout: int = 10000) -> AsyncIterator[None]:
+        """Wait for a DOM mutation under selector caused by the wrapped action"""
+        key = mutation_key()
+        await self.page.evaluate(OBSERVE_MUTATION_JS, [selector, key])
+        yield
+        await self.page.wait_for_function(MUTATION_SEEN_JS, arg=key, timeout=timeout)
+    
+    @asynccontextmanager
+    async def expect_text_change(self, selector: str, timeout: int = 10000) -> AsyncIterator[None]:
+        """Wait for the text of selector to change after the wrapped action"""
+        previous_text = await self.locator(selector, first=True).text_content()
+        yield
+        await self.wait_for_text_change(selector, previous_text, timeout=timeout)
+    
+    @asynccontextmanager
+    async def expect_network_quiet(self, url_patterns: Optional[List[UrlPattern]] = None,
+                                   quiet_ms: int = 500, timeout: int = 10000) -> AsyncIterator[None]:
+        """Wait for matching network traffic to settle after the wrapped action"""
+        tracker = NetworkTracker(self.page, url_patterns)
+        try:
+            yield
+            deadline = time.monotonic() + timeout / 1000
+            while not tracker.is_quiet(quiet_ms, deadline, timeout, PlaywrightTimeoutError):
+                await asyncio.sleep(0.025)
+        finally:
+            tracker.detach()
@@ -0,0 +1,39 @@
+"""Async Home Page Object"""
+
+from playwright.async_api import Page
+from pages.async_api.base_page import AsyncBasePage
+from pages.home_page import HomePageLocators
+
+
+class AsyncHomePage(AsyncBasePage, HomePageLocators):
+    """Async Page Object for Home/Landing Page"""
+    
+    def __init__(self, page: Page, base_url: str):
+        super().__init__(page)
+        self.base_url = base_url
+    
+    async def navigate_to_home(self):
+        """Navigate to the home page"""
+        await self.navigate(self.base_url)
+    
+    async def is_header_visible(self) -> bool:
+        """Check if header is visible"""
+        snapshot = await self.query_state({self.HEADER: ["visible"], "body": ["visible"], "h1": ["visible"]})
+        return any(state["visible"] for state in snapshot.selectors.values())
+    
+    async def click_logo(self):
+        """Click the logo"""
+        await self.click(self.LOGO)
+    
+    async def search(self, query: str):
+        """Perform a search"""
+        await self.fill(self.SEARCH_INPUT, query)
+        await self.page.keyboard.press("Enter")
+    
+    async def click_login(self):
+        """Click the login link"""
+        await self.click(self.LOGIN_LINK)
+    
+    async def click_signup(self):
+        """Click the signup link"""
+        await self.click(self.SIGNUP_LINK)
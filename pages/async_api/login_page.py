@@ -0,0 +1,36 @@
+"""Async Login Page Object"""
+
+from playwright.async_api import Page
+from pages.async_api.base_page import AsyncBasePage
+from pages.page_object import cached_locator
+from pages.login_page import LoginPageLocators
+
+
+class AsyncLoginPage(AsyncBasePage, LoginPageLocators):
+    """Async Page Object for Login Page"""
+    
+    error_message = cached_locator(LoginPageLocators.ERROR_MESSAGE)
+    
+    def __init__(self, page: Page, base_url: str):
+        super().__init__(page)
+        self.base_url = base_url
+    
+    async def navigate_to_login(self):
+        """Navigate to the login page"""
+        await self.navigate(f"{self.base_url}/login")
+    
+    async def login(self, username: str, password: str):
+        """Perform login action"""
+        await self.page.fill(self.EMAIL_INPUT, username)
+        await self.page.fill(self.PASSWORD_INPUT, password)
+        await self.page.click(self.LOGIN_BUTTON)
+    
+    async def get_error_message(self) -> str:
+        """Get error message text if present"""
+        if await self.error_message.is_visible():
+            return await self.error_message.inner_text()
+        return ""
+    
+    async def is_error_displayed(self) -> bool:
+        """Check if error message is displayed"""
+        return await self.error_message.is_visible()
@@ -0,0 +1,104 @@
+"""Async Page Object for Outfittery Homepage"""
+
+from playwright.async_api import Page
+from pages.async_api.base_page import AsyncBasePage
+from pages.page_object import cached_locator
+from pages.consent import first_claim, seed_onetrust_consent_async
+from pages.page_state import PageSnapshot
+from pages.outfittery_home_page import OutfitteryHomePageLocators
+
+
+class AsyncOutfitteryHomePage(AsyncBasePage, OutfitteryHomePageLocators):
+    """Async Page Object for Outfittery.com Homepage"""
+    
+    logo = cached_locator(OutfitteryHomePageLocators.LOGO, first=True)
+    header = cached_locator(OutfitteryHomePageLocators.HEADER, first=True)
+    cookie_accept_button = cached_locator(OutfitteryHomePageLocators.COOKIE_ACCEPT_BUTTON, first=True)
+    how_it_works_link = cached_locator(OutfitteryHomePageLocators.HOW_IT_WORKS_LINK, first=True)
+    for_men_link = cached_locator(OutfitteryHomePageLocators.FOR_MEN_LINK, first=True)
+    for_women_link = cached_locator(OutfitteryHomePageLocators.FOR_WOMEN_LINK, first=True)
+    get_started_button = cached_locator(OutfitteryHomePageLocators.GET_STARTED_BUTTON, first=True)
+    
+    def __init__(self, page: Page, base_url: str):
+        super().__init__(page)
+        self.base_url = base_url
+    
+    async def navigate_to_home(self):
+        """Navigate to Outfittery homepage (cookie consent is pre-seeded, so no banner)"""
+        await self.prepare_consent()
+        await self.navigate(self.base_url)
+    
+    async def prepare_consent(self):
+        """Store OneTrust consent in the context and dismiss the banner if it shows anyway"""
+        first = first_claim(self.page)
+        await seed_onetrust_consent_async(self.page, self.base_url, init_script=first)
+        if not first:
+            return
+        await self.page.add_locator_handler(
+            self.page.locator(self.ONETRUST_BANNER), self.dismiss_consent_banner, no_wait_after=True
+        )
+    
+    async def dismiss_consent_banner(self):
+        """Click the OneTrust accept button (the locator handler's fallback)"""
+        await self.page.locator(self.ONETRUST_ACCEPT_BUTTON).click()
+    
+    async def accept_cookies(self):
+        """Accept a cookie banner if one is showing right now (no waiting for it to appear)"""
+        banner = self.page.locator(f"{self.COOKIE_BANNER} >> visible=true").first
+        if not (await banner.is_visible() and await self.cookie_accept_button.is_visible()):
+            return
+        await self.cookie_accept_button.click()
+        await self.cookie_accept_button.wait_for(state="hidden", timeout=3000)
+    
+    async def is_logo_visible(self) -> bool:
+        """Check if logo is visible"""
+        return await self.logo.is_visible()
+    
+    async def is_header_visible(self) -> bool:
+        """Check if header/navigation is visible"""
+        return await self.header.is_visible()
+    
+    async def click_how_it_works(self):
+        """Click 'How it works' link"""
+        await self.how_it_works_link.click()
+    
+    async def click_for_men(self):
+        """Click 'For Men' link"""
+        await self.for_men_link.click()
+    
+    async def click_for_women(self):
+        """Click 'For Women' link"""
+        await self.for_women_link.click()
+    
+    async def click_get_started(self):
+        """Click 'Get Started' CTA button"""
+        await self.get_started_button.click()
+    
+    async def scroll_to_footer(self, smooth=False):
+        """Scroll to page footer
+        
+        Args:
+            smooth: If True, scrolls with smooth animation (slower but visible)
+        """
+        behavior = "smooth" if smooth else "instant"
+        await self.page.evaluate(
+            "behavior => window.scrollTo({top: document.body.scrollHeight, behavior})",
+            behavior,
+        )
+        # Wait until the viewport actually reaches the bottom
+        await self.page.wait_for_function(
+            "() => window.innerHeight + window.scrollY >= document.body.scrollHeight - 1",
+            timeout=5000,
+        )
+    
+    async def get_smoke_state(self) -> PageSnapshot:
+        """Logo, header and language of the page in one round-trip"""
+        return await self.query_state({
+            self.LOGO: ["visible"],
+            self.HEADER: ["visible"],
+            "html": ["attr:lang"],
+        })
+    
+    async def get_page_language(self) -> str:
+        """Get the page language from html tag"""
+        return await self.page.locator("html").get_attribute("lang") or "unknown"
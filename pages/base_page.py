@@ -1,17 +1,40 @@
 """Base Page Object - Parent class for all page objects"""
 
-from playwright.sync_api import Page, expect
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
 
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError, expect
 
-class BasePage:
+from pages.page_object import PageObject, cached_locator
+from pages.page_scripts import (
+    MUTATION_SEEN_JS, OBSERVE_MUTATION_JS, TEXT_CHANGED_JS, NetworkTracker, UrlPattern, mutation_key,
+)
+from pages.page_state import QUERY_STATE_JS, PageSnapshot
+from pages.performance import COLLECT_PERFORMANCE_JS
+
+
+class BasePage(PageObject):
     """Base page class that all page objects inherit from"""
     
-    def __init__(self, page: Page):
-        self.page = page
-    
     def navigate(self, url: str):
         """Navigate to a specific URL"""
         self.page.goto(url)
+        recorder = self.performance_recorder
+        if recorder is not None:
+            recorder.record(self.page.url, self.page.viewport_size, self.measure_performance())
+    
+    def measure_performance(self, settle_ms: int = 100) -> Dict[str, Any]:
+        """Read navigation, paint, LCP/CLS and resource timings of the current document
+        
+        Args:
+            settle_ms: How long to collect buffered LCP/layout-shift entries
+        
+        Returns:
+            Metrics named in pages.performance.METRICS (None where the browser
+            doesn't support them) plus the five slowest resources
+        """
+        return self.page.evaluate(COLLECT_PERFORMANCE_JS, settle_ms)
     
     def get_title(self) -> str:
         """Get the page title"""
@@ -35,9 +58,115 @@ class BasePage:
     
     def is_visible(self, selector: str) -> bool:
         """Check if element is visible"""
-        return self.page.locator(selector).is_visible()
+        return self.locator(selector).is_visible()
     
     def take_screenshot(self, path: str):
         """Take a screenshot"""
         self.page.screenshot(path=path)
-
+    
+    def query_state(self, spec: Dict[str, List[str]]) -> PageSnapshot:
+        """Read many selector properties in a single in-page evaluation
+        
+        Args:
+            spec: Maps selectors to properties - "visible" (any match visible),
+                "text", "inner_text", "count", "bbox" or "attr:<name>"
+        
+        Example:
+            snap = self.query_state({self.HEADER: ["visible"], "html": ["attr:lang"]})
+        """
+        data = self.page.evaluate(QUERY_STATE_JS, spec)
+        for selector, state in data["selectors"].items():
+            if state.get("unsupported"):
+                # Selector engines the in-page query can't handle go through locators
+                data["selectors"][selector] = self._query_state_with_locators(selector, spec[selector])
+        return PageSnapshot(data)
+    
+    def _query_state_with_locators(self, selector: str, props: List[str]) -> Dict:
+        matches = self.locator(selector)
+        first = self.locator(selector, first=True)
+        count = matches.count()
+        state = {}
+        for prop in props:
+            if prop == "visible":
+                state[prop] = any(matches.nth(i).is_visible() for i in range(count))
+            elif prop == "count":
+                state[prop] = count
+            elif not count:
+                state[prop] = None
+            elif prop == "text":
+                state[prop] = first.text_content()
+            elif prop == "inner_text":
+                state[prop] = first.inner_text()
+            elif prop == "bbox":
+                state[prop] = first.bounding_box()
+            elif prop.startswith("attr:"):
+                state[prop] = first.get_attribute(prop[len("attr:"):])
+        return state
+    
+    # ------------------------------------------------------------------
+    # Wait engine - wait for the real outcome of an action, not a fixed sleep
+    # ------------------------------------------------------------------
+    
+    def wait_for_url_change(self, previous_url: str, timeout: int = 10000):
+        """Wait until the URL differs from previous_url"""
+        self.page.wait_for_url(lambda url: url != previous_url, timeout=timeout)
+    
+    def wait_for_text_change(self, selector: str, previous_text: Optional[str], timeout: int = 10000):
+        """Wait until the first element matching selector has different text"""
+        self.page.wait_for_function(TEXT_CHANGED_JS, arg=[selector, previous_text], timeout=timeout)
+    
+    def wait_for_network_quiet(self, url_patterns: Optional[List[UrlPattern]] = None,
+                               quiet_ms: int = 500, timeout: int = 10000):
+        """Wait until no matching request has been in flight for quiet_ms"""
+        with self.expect_network_quiet(url_patterns, quiet_ms=quiet_ms, timeout=timeout):
+            pass
+    
+    @contextmanager
+    def expect_url_change(self, timeout: int = 10000) -> Iterator[None]:
+        """Wait for the URL to change after the wrapped action
+        
+        Example:
+            with shop.expect_url_change():
+                page.click("button[type='submit']")
+        """
+        previous_url = self.page.url
+        yield
+        self.wait_for_url_change(previous_url, timeout=timeout)
+    
+    @contextmanager
+    def expect_dom_mutation(self, selector: str = "body", timeout: int = 10000) -> Iterator[None]:
+        """Wait for a DOM mutation under selector caused by the wrapped action
+        
+        The MutationObserver is installed in the page before the action runs.
+        """
+        key = mutation_key()
+        self.page.evaluate(OBSERVE_MUTATION_JS, [selector, key])
+        yield
+        self.page.wait_for_function(MUTATION_SEEN_JS, arg=key, timeout=timeout)
+    
+    @contextmanager
+    def expect_text_change(self, selector: str, timeout: int = 10000) -> Iterator[None]:
+        """Wait for the text of selector (e.g. '#cart-count') to change after the wrapped action"""
+        previous_text = self.locator(selector, first=True).text_content()
+        yield
+        self.wait_for_text_change(selector, previous_text, timeout=timeout)
+    
+    @contextmanager
+    def expect_network_quiet(self, url_patterns: Optional[List[UrlPattern]] = None,
+                             quiet_ms: int = 500, timeout: int = 10000) -> Iterator[None]:
+        """Wait for matching network traffic to settle after the wrapped action
+        
+        Args:
+            url_patterns: Glob strings or compiled regexes; None tracks every request
+            quiet_ms: How long the matching traffic must stay idle
+            timeout: Overall timeout in milliseconds
+        """
+        tracker = NetworkTracker(self.page, url_patterns)
+        try:
+            yield
+            deadline = time.monotonic() + timeout / 1000
+            while not tracker.is_quiet(quiet_ms, deadline, timeout, PlaywrightTimeoutError):
+                # Short poll lets the sync driver dispatch request events
+                self.page.wait_for_timeout(25)
+        finally:
+            tracker.detach()
@@ -0,0 +1,102 @@
+"""Pre-seeded OneTrust cookie consent
+
+OneTrust only shows its banner when no decision is stored. Seeding the
+decision (cookies in the context, plus localStorage via a page init script)
+before the first navigation means the banner never renders, so no test waits
+for it or clicks it.
+"""
+
+import json
+import uuid
+import weakref
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence
+from urllib.parse import quote, urlparse
+
+from playwright.async_api import Page as AsyncPage
+from playwright.sync_api import Page
+
+
+# Strictly necessary, performance, functional, targeting
+ONETRUST_GROUPS = ("C0001", "C0002", "C0003", "C0004")
+ONETRUST_VERSION = "202402.1.0"
+
+# Contexts/pages already set up, so repeated page objects don't stack init scripts or handlers
+_claimed = weakref.WeakSet()
+
+
+def onetrust_values(groups: Sequence[str] = ONETRUST_GROUPS) -> Dict[str, str]:
+    """OptanonAlertBoxClosed / OptanonConsent values recording an "accept" decision"""
+    now = datetime.now(timezone.utc)
+    consent = "&".join([
+        "isGpcEnabled=0",
+        f"datestamp={quote(now.strftime('%a %b %d %Y %H:%M:%S GMT+0000'))}",
+        f"version={ONETRUST_VERSION}",
+        "browserGpcFlag=0",
+        "isIABGlobal=false",
+        "hosts=",
+        f"consentId={uuid.uuid4()}",
+        "interactionCount=1",
+        "landingPath=NotLandingPage",
+        f"groups={quote(','.join(f'{group}:1' for group in groups))}",
+        "AwaitingReconsent=false",
+    ])
+    return {
+        "OptanonAlertBoxClosed": now.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        "OptanonConsent": consent,
+    }
+
+
+def onetrust_cookies(url: str, values: Dict[str, str]) -> List[Dict]:
+    """Consent cookies for the site's registrable domain and all its subdomains"""
+    host = urlparse(url).hostname or ""
+    domain = "." + host[4:] if host.startswith("www.") else "." + host
+    expires = int(datetime.now(timezone.utc).timestamp()) + 365 * 24 * 3600
+    return [
+        {"name": name, "value": value, "domain": domain, "path": "/", "expires": expires, "sameSite": "Lax"}
+        for name, value in values.items()
+    ]
+
+
+def onetrust_init_script(url: str, values: Dict[str, str]) -> str:
+    """Init script writing the decision to localStorage on the site's pages only"""
+    host = (urlparse(url).hostname or "").replace("www.", "", 1)
+    return f"""
+        (() => {{
+            if (!location.hostname.endsWith({json.dumps(host)})) return;
+            try {{
+                for (const [key, value] of Object.entries({json.dumps(values)})) {{
+                    if (localStorage.getItem(key) === null) localStorage.setItem(key, value);
+                }}
+            }} catch (e) {{}}  // storage disabled (opaque origins, sandboxed frames)
+        }})();
+    """
+
+
+def seed_onetrust_consent(page: Page, url: str, init_script: bool = True):
+    """Store an "accept all" decision for the page
+    
+    Cookies are (re)added every time since pooled contexts clear them between
+    tests. The init script goes on the page, not the context: a pooled context
+    can't drop its init scripts, but its pages are replaced after every test.
+    """
+    values = onetrust_values()
+    page.context.add_cookies(onetrust_cookies(url, values))
+    if init_script:
+        page.add_init_script(onetrust_init_script(url, values))
+
+
+async def seed_onetrust_consent_async(page: AsyncPage, url: str, init_script: bool = True):
+    """Async counterpart of seed_onetrust_consent"""
+    values = onetrust_values()
+    await page.context.add_cookies(onetrust_cookies(url, values))
+    if init_script:
+        await page.add_init_script(onetrust_init_script(url, values))
+
+
+def first_claim(target) -> bool:
+    """True the first time a context (or page) is passed - for one-off setup"""
+    if target in _claimed:
+        return False
+    _claimed.add(target)
+    return True
@@ -4,15 +4,18 @@ from playwright.sync_api import Page
 from pages.base_page import BasePage
 
 
-class HomePage(BasePage):
-    """Page Object for Home/Landing Page"""
+class HomePageLocators:
+    """Home page selectors shared by the sync and async page objects"""
     
-    # Locators
     HEADER = 'header, .header, nav'
     LOGO = 'a[href="/"], .logo, img[alt*="logo"]'
     SEARCH_INPUT = 'input[type="search"], input[placeholder*="Search"]'
     LOGIN_LINK = 'a[href*="login"], button:has-text("Login")'
     SIGNUP_LINK = 'a[href*="signup"], a[href*="register"], button:has-text("Sign up")'
+
+
+class HomePage(BasePage, HomePageLocators):
+    """Page Object for Home/Landing Page"""
     
     def __init__(self, page: Page, base_url: str):
         super().__init__(page)
@@ -25,9 +28,8 @@ class HomePage(BasePage):
     def is_header_visible(self) -> bool:
         """Check if header is visible"""
         # For example.com, check for any navigation or main content
-        return (self.is_visible(self.HEADER) or 
-                self.is_visible("body") or 
-                self.is_visible("h1"))
+        snapshot = self.query_state({self.HEADER: ["visible"], "body": ["visible"], "h1": ["visible"]})
+        return any(state["visible"] for state in snapshot.selectors.values())
     
     def click_logo(self):
         """Click the logo"""
@@ -45,4 +47,3 @@ class HomePage(BasePage):
     def click_signup(self):
         """Click the signup link"""
         self.click(self.SIGNUP_LINK)
-
@@ -1,17 +1,22 @@
 """Login Page Object"""
 
 from playwright.sync_api import Page
-from pages.base_page import BasePage
+from pages.base_page import BasePage, cached_locator
 
 
-class LoginPage(BasePage):
-    """Page Object for Login Page"""
+class LoginPageLocators:
+    """Login page selectors shared by the sync and async page objects"""
     
-    # Locators
     EMAIL_INPUT = 'input[name="email"], input[type="email"], #email'
     PASSWORD_INPUT = 'input[name="password"], input[type="password"], #password'
     LOGIN_BUTTON = 'button[type="submit"], button:has-text("Sign in"), button:has-text("Login")'
     ERROR_MESSAGE = '.error, .alert-danger, [role="alert"]'
+
+
+class LoginPage(BasePage, LoginPageLocators):
+    """Page Object for Login Page"""
+    
+    error_message = cached_locator(LoginPageLocators.ERROR_MESSAGE)
     
     def __init__(self, page: Page, base_url: str):
         super().__init__(page)
@@ -29,11 +34,10 @@ class LoginPage(BasePage):
     
     def get_error_message(self) -> str:
         """Get error message text if present"""
-        if self.page.locator(self.ERROR_MESSAGE).is_visible():
-            return self.page.locator(self.ERROR_MESSAGE).inner_text()
+        if self.error_message.is_visible():
+            return self.error_message.inner_text()
         return ""
     
     def is_error_displayed(self) -> bool:
         """Check if error message is displayed"""
-        return self.page.locator(self.ERROR_MESSAGE).is_visible()
-
+        return self.error_message.is_visible()
@@ -1,17 +1,21 @@
 """Page Object for Outfittery Homepage"""
 
 from playwright.sync_api import Page, expect
-from pages.base_page import BasePage
+from pages.base_page import BasePage, cached_locator
+from pages.consent import first_claim, seed_onetrust_consent
+from pages.page_state import PageSnapshot
 
 
-class OutfitteryHomePage(BasePage):
-    """Page Object for Outfittery.com Homepage"""
+class OutfitteryHomePageLocators:
+    """Outfittery homepage selectors shared by the sync and async page objects"""
     
-    # Locators
     HEADER = 'header, nav, [role="navigation"]'
     LOGO = 'a[href="/"], img[alt*="Outfittery"], .logo'
     COOKIE_BANNER = '[class*="cookie"], [id*="cookie"], #onetrust-banner-sdk'
     COOKIE_ACCEPT_BUTTON = 'button:has-text("Accept"), button:has-text("Akzeptieren"), #onetrust-accept-btn-handler'
+    # Only the OneTrust banner triggers the locator handler - generic "Accept" buttons must not
+    ONETRUST_BANNER = '#onetrust-banner-sdk'
+    ONETRUST_ACCEPT_BUTTON = '#onetrust-accept-btn-handler'
     
     # Navigation links
     HOW_IT_WORKS_LINK = 'a:has-text("How it works"), a:has-text("Wie es funktioniert")'
@@ -20,55 +24,76 @@ class OutfitteryHomePage(BasePage):
     
     # Call-to-action buttons
     GET_STARTED_BUTTON = 'button:has-text("Get started"), a:has-text("Get started"), button:has-text("Jetzt starten")'
+
+
+class OutfitteryHomePage(BasePage, OutfitteryHomePageLocators):
+    """Page Object for Outfittery.com Homepage"""
+    
+    logo = cached_locator(OutfitteryHomePageLocators.LOGO, first=True)
+    header = cached_locator(OutfitteryHomePageLocators.HEADER, first=True)
+    cookie_accept_button = cached_locator(OutfitteryHomePageLocators.COOKIE_ACCEPT_BUTTON, first=True)
+    how_it_works_link = cached_locator(OutfitteryHomePageLocators.HOW_IT_WORKS_LINK, first=True)
+    for_men_link = cached_locator(OutfitteryHomePageLocators.FOR_MEN_LINK, first=True)
+    for_women_link = cached_locator(OutfitteryHomePageLocators.FOR_WOMEN_LINK, first=True)
+    get_started_button = cached_locator(OutfitteryHomePageLocators.GET_STARTED_BUTTON, first=True)
     
     def __init__(self, page: Page, base_url: str):
         super().__init__(page)
         self.base_url = base_url
     
     def navigate_to_home(self):
-        """Navigate to Outfittery homepage"""
+        """Navigate to Outfittery homepage (cookie consent is pre-seeded, so no banner)"""
+        self.prepare_consent()
         self.navigate(self.base_url)
     
+    def prepare_consent(self):
+        """Store OneTrust consent in the context and dismiss the banner if it shows anyway"""
+        first = first_claim(self.page)
+        seed_onetrust_consent(self.page, self.base_url, init_script=first)
+        if not first:
+            return
+        # Runs before any action that the banner would block, only when it's visible
+        self.page.add_locator_handler(
+            self.page.locator(self.ONETRUST_BANNER), self.dismiss_consent_banner, no_wait_after=True
+        )
+    
+    def dismiss_consent_banner(self):
+        """Click the OneTrust accept button (the locator handler's fallback)"""
+        self.page.locator(self.ONETRUST_ACCEPT_BUTTON).click()
+        print("✓ Cookie banner shown despite seeded consent - accepted")
+    
     def accept_cookies(self):
-        """Accept cookie banner if present"""
-        try:
-            # Wait for cookie banner with short timeout
-            self.page.wait_for_selector(self.COOKIE_BANNER, timeout=3000)
-            
-            # Click accept button if visible
-            if self.page.locator(self.COOKIE_ACCEPT_BUTTON).is_visible():
-                self.page.locator(self.COOKIE_ACCEPT_BUTTON).first.click()
-                # Wait for banner to disappear
-                self.page.wait_for_timeout(1000)
-                print("✓ Cookies accepted")
-        except:
-            # Cookie banner not present, continue
-            print("ℹ No cookie banner found")
-            pass
+        """Accept a cookie banner if one is showing right now (no waiting for it to appear)"""
+        banner = self.page.locator(f"{self.COOKIE_BANNER} >> visible=true").first
+        if not (banner.is_visible() and self.cookie_accept_button.is_visible()):
+            return
+        self.cookie_accept_button.click()
+        self.cookie_accept_button.wait_for(state="hidden", timeout=3000)
+        print("✓ Cookies accepted")
     
     def is_logo_visible(self) -> bool:
         """Check if logo is visible"""
-        return self.page.locator(self.LOGO).first.is_visible()
+        return self.logo.is_visible()
     
     def is_header_visible(self) -> bool:
         """Check if header/navigation is visible"""
-        return self.page.locator(self.HEADER).first.is_visible()
+        return self.header.is_visible()
     
     def click_how_it_works(self):
         """Click 'How it works' link"""
-        self.page.locator(self.HOW_IT_WORKS_LINK).first.click()
+        self.how_it_works_link.click()
     
     def click_for_men(self):
         """Click 'For Men' link"""
-        self.page.locator(self.FOR_MEN_LINK).first.click()
+        self.for_men_link.click()
     
     def click_for_women(self):
         """Click 'For Women' link"""
-        self.page.locator(self.FOR_WOMEN_LINK).first.click()
+        self.for_women_link.click()
     
     def click_get_started(self):
         """Click 'Get Started' CTA button"""
-        self.page.locator(self.GET_STARTED_BUTTON).first.click()
+        self.get_started_button.click()
     
     def scroll_to_footer(self, smooth=False):
         """Scroll to page footer
@@ -84,13 +109,23 @@ class OutfitteryHomePage(BasePage):
                     behavior: 'smooth'
                 });
             """)
-            self.page.wait_for_timeout(2000)  # Wait to see animation
         else:
             # Instant scroll for fast tests
             self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            self.page.wait_for_timeout(500)
+        # Wait until the viewport actually reaches the bottom
+        self.page.wait_for_function(
+            "() => window.innerHeight + window.scrollY >= document.body.scrollHeight - 1",
+            timeout=5000,
+        )
+    
+    def get_smoke_state(self) -> PageSnapshot:
+        """Logo, header and language of the page in one round-trip"""
+        return self.query_state({
+            self.LOGO: ["visible"],
+            self.HEADER: ["visible"],
+            "html": ["attr:lang"],
+        })
     
     def get_page_language(self) -> str:
         """Get the page language from html tag"""
         return self.page.locator("html").get_attribute("lang") or "unknown"
-
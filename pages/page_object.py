@@ -0,0 +1,68 @@
+"""API-neutral core of the sync and async base pages
+
+Locators are created synchronously in both Playwright APIs, so the locator
+memo, cached_locator and the performance-recorder lookup live here once.
+"""
+
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+
+# Performance recorders by Playwright page, set by the performance_budget fixture.
+# Weak keys so a recorder goes away with its test's page.
+_performance_recorders: "weakref.WeakKeyDictionary[Any, Any]" = weakref.WeakKeyDictionary()
+
+
+class cached_locator:
+    """Declare a page-object attribute that resolves to a memoized Locator
+    
+    Example:
+        class LoginPage(BasePage, LoginPageLocators):
+            error_message = cached_locator(LoginPageLocators.ERROR_MESSAGE)
+    """
+    
+    def __init__(self, selector: str, first: bool = False):
+        self.selector = selector
+        self.first = first
+    
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return obj.locator(self.selector, first=self.first)
+
+
+class PageObject:
+    """Locator memo and performance-recorder lookup shared by BasePage and AsyncBasePage"""
+    
+    def __init__(self, page: Any):
+        self.page = page
+        self._locators: Dict[Tuple[str, bool], Any] = {}
+        self._locators_url = page.url
+    
+    def locator(self, selector: str, first: bool = False) -> Any:
+        """Get a memoized locator for selector (cache is cleared on navigation)"""
+        # Locators are lazy, so checking the URL on access is enough - no listener on the page
+        if self.page.url != self._locators_url:
+            self._locators.clear()
+            self._locators_url = self.page.url
+        key = (selector, first)
+        locator = self._locators.get(key)
+        if locator is None:
+            locator = self.page.locator(selector)
+            if first:
+                locator = locator.first
+            self._locators[key] = locator
+        return locator
+    
+    @property
+    def performance_recorder(self) -> Optional[Any]:
+        """Recorder that navigate() reports metrics to, if one is attached to this page"""
+        return _performance_recorders.get(self.page)
+    
+    @staticmethod
+    def attach_performance_recorder(page: Any, recorder: Optional[Any]):
+        """Report navigations of every page object on page to recorder (None detaches)"""
+        if recorder is None:
+            _performance_recorders.pop(page, None)
+        else:
+            _performance_recorders[page] = recorder
@@ -0,0 +1,97 @@
+"""In-page scripts and the network tracker behind the wait engine
+
+Shared by pages.base_page.BasePage and pages.async_api.base_page.AsyncBasePage;
+only sleeping between polls differs between the two APIs.
+"""
+
+import time
+from fnmatch import fnmatch
+from typing import Any, List, Optional, Pattern, Union
+
+
+UrlPattern = Union[str, Pattern]
+
+# Installed before an action; flips a window flag on the first DOM change
+# under the target so the wait afterwards can't miss a fast mutation.
+OBSERVE_MUTATION_JS = """
+([selector, key]) => {
+    const target = document.querySelector(selector) || document.documentElement;
+    window.__pwMutations = window.__pwMutations || {};
+    window.__pwMutations[key] = false;
+    const observer = new MutationObserver(() => {
+        window.__pwMutations[key] = true;
+        observer.disconnect();
+    });
+    observer.observe(target, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+}
+"""
+
+MUTATION_SEEN_JS = "key => !!(window.__pwMutations && window.__pwMutations[key])"
+
+TEXT_CHANGED_JS = """
+([selector, previous]) => {
+    const el = document.querySelector(selector);
+    return !!el && el.textContent !== previous;
+}
+"""
+
+
+def mutation_key() -> str:
+    """Unique window flag name for one expect_dom_mutation block"""
+    return f"m{time.monotonic_ns()}"
+
+
+class NetworkTracker:
+    """Counts in-flight requests whose URL matches the given patterns
+    
+    Works with sync and async pages alike: event listeners are plain callbacks in both.
+    """
+    
+    def __init__(self, page: Any, url_patterns: Optional[List[UrlPattern]] = None):
+        self.page = page
+        self.url_patterns = url_patterns
+        self.inflight = set()
+        self.last_activity = time.monotonic()
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_done)
+        page.on("requestfailed", self._on_done)
+    
+    def _matches(self, url: str) -> bool:
+        if not self.url_patterns:
+            return True
+        for pattern in self.url_patterns:
+            if isinstance(pattern, str):
+                if fnmatch(url, pattern):
+                    return True
+            elif pattern.search(url):
+                return True
+        return False
+    
+    def _on_request(self, request: Any):
+        if self._matches(request.url):
+            self.inflight.add(request)
+            self.last_activity = time.monotonic()
+    
+    def _on_done(self, request: Any):
+        if request in self.inflight:
+            self.inflight.discard(request)
+            self.last_activity = time.monotonic()
+    
+    def is_quiet(self, quiet_ms: int, deadline: float, timeout: int, timeout_error: type) -> bool:
+        """True once nothing matching has been in flight for quiet_ms; raises past the deadline"""
+        now = time.monotonic()
+        if not self.inflight and (now - self.last_activity) * 1000 >= quiet_ms:
+            return True
+        if now >= deadline:
+            raise timeout_error(
+                f"Network not quiet after {timeout}ms "
+                f"({len(self.inflight)} matching request(s) in flight)"
+            )
+        return False
+    
+    def detach(self):
+        self.page.remove_listener("request", self._on_request)
+        self.page.remove_listener("requestfinished", self._on_done)
+        self.page.remove_listener("requestfailed", self._on_done)
@@ -0,0 +1,133 @@
+"""Batched page-state snapshots
+
+Reads visibility, text, attributes, counts and bounding boxes for many
+selectors in a single in-page evaluation instead of one driver round-trip per
+check, and lets tests soft-assert against the result.
+"""
+
+from typing import Any, Dict, List, Optional
+
+
+# Evaluated in the page. Handles CSS plus Playwright's :has-text("...") pseudo
+# class; any other engine (text=, xpath=, >>) is reported back as unsupported.
+QUERY_STATE_JS = """
+(spec) => {
+    const HAS_TEXT = /^(.*):has-text\\((["'])(.*)\\2\\)$/;
+    
+    const splitUnion = (selector) => {
+        const parts = [];
+        let depth = 0, quote = null, start = 0;
+        for (let i = 0; i < selector.length; i++) {
+            const c = selector[i];
+            if (quote) { if (c === quote) quote = null; continue; }
+            if (c === '"' || c === "'") quote = c;
+            else if (c === '(' || c === '[') depth++;
+            else if (c === ')' || c === ']') depth--;
+            else if (c === ',' && depth === 0) { parts.push(selector.slice(start, i).trim()); start = i + 1; }
+        }
+        parts.push(selector.slice(start).trim());
+        return parts;
+    };
+    
+    const queryAll = (selector) => {
+        if (/(^|\\s)(text|xpath|css|id|data-testid)=|>>|:text|:visible|:nth-match/.test(selector)) {
+            throw new Error('unsupported');
+        }
+        const found = new Set();
+        for (const part of splitUnion(selector)) {
+            const m = part.match(HAS_TEXT);
+            if (m) {
+                const needle = m[3].toLowerCase();
+                document.querySelectorAll(m[1] || '*').forEach((el) => {
+                    if ((el.textContent || '').toLowerCase().includes(needle)) found.add(el);
+                });
+            } else {
+                document.querySelectorAll(part).forEach((el) => found.add(el));
+            }
+        }
+        return [...found].sort((a, b) =>
+            a.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING ? -1 : 1);
+    };
+    
+    const isVisible = (el) => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    };
+    
+    const result = {title: document.title, url: location.href, selectors: {}};
+    for (const [selector, props] of Object.entries(spec)) {
+        let els;
+        try {
+            els = queryAll(selector);
+        } catch (e) {
+            result.selectors[selector] = {unsupported: true};
+            continue;
+        }
+        const first = els[0] || null;
+        const state = {};
+        for (const prop of props) {
+            if (prop === 'visible') state.visible = els.some(isVisible);
+            else if (prop === 'count') state.count = els.length;
+            else if (prop === 'text') state.text = first ? first.textContent : null;
+            else if (prop === 'inner_text') state.inner_text = first ? first.innerText : null;
+            else if (prop === 'bbox') {
+                if (first) {
+                    const r = first.getBoundingClientRect();
+                    state.bbox = {x: r.x, y: r.y, width: r.width, height: r.height};
+                } else {
+                    state.bbox = null;
+                }
+            } else if (prop.startsWith('attr:')) {
+                state[prop] = first ? first.getAttribute(prop.slice(5)) : null;
+            }
+        }
+        result.selectors[selector] = state;
+    }
+    return result;
+}
+"""
+
+
+class PageSnapshot:
+    """Result of BasePage.query_state with soft assertions on top
+    
+    Example:
+        snap = home.query_state({home.LOGO: ["visible"], "html": ["attr:lang"]})
+        snap.expect(home.LOGO, "visible", True, "Logo should be visible")
+        snap.expect("html", "attr:lang", lambda lang: bool(lang), "Page needs a lang attribute")
+        snap.assert_all()
+    """
+    
+    def __init__(self, data: Dict[str, Any]):
+        self.title: str = data.get("title", "")
+        self.url: str = data.get("url", "")
+        self.selectors: Dict[str, Dict[str, Any]] = data.get("selectors", {})
+        self.failures: List[str] = []
+    
+    def __getitem__(self, selector: str) -> Dict[str, Any]:
+        return self.selectors[selector]
+    
+    def get(self, selector: str, prop: str, default: Any = None) -> Any:
+        """Get one property of one selector"""
+        return self.selectors.get(selector, {}).get(prop, default)
+    
+    def expect(self, selector: str, prop: str, expected: Any = True, message: Optional[str] = None) -> bool:
+        """Soft-assert a property; expected may be a value or a predicate"""
+        actual = self.get(selector, prop)
+        ok = expected(actual) if callable(expected) else actual == expected
+        if not ok:
+            self.failures.append(message or f"{selector} {prop}: expected {expected!r}, got {actual!r}")
+        return ok
+    
+    def check(self, condition: bool, message: str) -> bool:
+        """Soft-assert an arbitrary condition (e.g. on snapshot.title)"""
+        if not condition:
+            self.failures.append(message)
+        return condition
+    
+    def assert_all(self):
+        """Raise one AssertionError listing every failed soft assertion"""
+        if self.failures:
+            raise AssertionError(
+                f"{len(self.failures)} soft assertion(s) failed:\n" + "\n".join(f"  - {f}" for f in self.failures)
+            )
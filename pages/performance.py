@@ -0,0 +1,89 @@
+"""In-page performance metrics
+
+Reads Navigation Timing, paint timings, Largest Contentful Paint, Cumulative
+Layout Shift and resource timing for the current document in one evaluation.
+"""
+
+# Numeric metrics kept in baselines and checked against budgets. Times are in
+# milliseconds from navigation start, cls is unitless, transfer_bytes in bytes.
+METRICS = (
+    "ttfb",
+    "dom_content_loaded",
+    "load",
+    "first_paint",
+    "first_contentful_paint",
+    "lcp",
+    "cls",
+    "resource_count",
+    "transfer_bytes",
+)
+
+# LCP and layout shifts are only exposed to PerformanceObserver, so the buffered
+# entries are collected for settleMs. Engines without them (Firefox/WebKit for
+# LCP/CLS) report null, which budgets and baselines skip.
+COLLECT_PERFORMANCE_JS = """
+async (settleMs) => {
+    const observe = (type) => new Promise((resolve) => {
+        const entries = [];
+        let observer;
+        try {
+            observer = new PerformanceObserver((list) => entries.push(...list.getEntries()));
+            observer.observe({type, buffered: true});
+        } catch (e) {
+            resolve(null);
+            return;
+        }
+        setTimeout(() => {
+            entries.push(...observer.takeRecords());
+            observer.disconnect();
+            resolve(entries);
+        }, settleMs);
+    });
+    
+    // CLS as defined by web-vitals: the worst session window of shifts
+    // (gaps under 1s, windows capped at 5s) not caused by recent input
+    const cumulativeLayoutShift = (shifts) => {
+        if (!shifts) return null;
+        let worst = 0, current = 0, first = 0, last = 0;
+        for (const shift of shifts) {
+            if (shift.hadRecentInput) continue;
+            if (current && shift.startTime - last < 1000 && shift.startTime - first < 5000) {
+                current += shift.value;
+            } else {
+                current = shift.value;
+                first = shift.startTime;
+            }
+            last = shift.startTime;
+            worst = Math.max(worst, current);
+        }
+        return worst;
+    };
+    
+    const [lcpEntries, shiftEntries] = await Promise.all([
+        observe('largest-contentful-paint'), observe('layout-shift'),
+    ]);
+    const nav = performance.getEntriesByType('navigation')[0];
+    const paints = {};
+    performance.getEntriesByType('paint').forEach((p) => { paints[p.name] = p.startTime; });
+    const resources = performance.getEntriesByType('resource');
+    const positive = (value) => (value > 0 ? value : null);
+    
+    return {
+        ttfb: nav ? positive(nav.responseStart) : null,
+        dom_content_loaded: nav ? positive(nav.domContentLoadedEventEnd) : null,
+        load: nav ? positive(nav.loadEventEnd) : null,
+        first_paint: paints['first-paint'] ?? null,
+        first_contentful_paint: paints['first-contentful-paint'] ?? null,
+        lcp: lcpEntries && lcpEntries.length ? lcpEntries[lcpEntries.length - 1].startTime : null,
+        cls: cumulativeLayoutShift(shiftEntries),
+        resource_count: resources.length,
+        transfer_bytes: resources.reduce((sum, r) => sum + (r.transferSize || 0), nav ? nav.transferSize || 0 : 0),
+        slowest_resources: [...resources]
+            .sort((a, b) => b.duration - a.duration)
+            .slice(0, 5)
+            .map((r) => ({
+                url: r.name, initiator: r.initiatorType, duration: r.duration, transfer_size: r.transferSize,
+            })),
+    };
+}
+"""
@@ -1,61 +1,527 @@
 """Pytest configuration and fixtures"""
 
 import os
+import re
+import shutil
+import time
 import pytest
-from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
+from pages.base_page import BasePage
+from pages.login_page import LoginPage
+from utils.action_timing import ActionTimer, all_subclasses, summarize, summary_html, write_test_timings
+from utils.auth_state import AuthStateCache, credential_key
+from utils.browser_state import BrowserState, StateSnapshots
+from utils.cart_seeder import CartSeeder, CartTemplateCache
+from utils.context_pool import ContextPool
+from utils.data_factory import DataFactory, new_seed
+from utils.duration_scheduler import DurationHistory, DurationSchedulerPlugin
+from utils.event_hub import EventHub
+from utils.har_replay import HarArchives, HarRouter
+from utils.impact import ImpactTracer, SymbolIndex, affected_tests
+from utils.local_server import LocalServer
+from utils.perf_budget import PerformanceBaseline, PerformanceBudget, PerformanceRecorder, parse_budgets
+from utils.recording import Recorder, RecordingCalibration
+from utils.resource_blocker import (
+    DEFAULT_BLOCKED_DOMAINS,
+    DEFAULT_BLOCKED_TYPES,
+    DEFAULT_STUBBED_TYPES,
+    ResourceBlocker,
+    ResourceSizeCatalog,
+)
+from utils.screenshot_writer import ScreenshotWriter, capture_options
+from utils.viewport_matrix import ViewportMatrix
+from utils.visual_diff import VisualBaselines
 
 # Load environment variables
 load_dotenv()
 
+
+def _env_list(name: str) -> list:
+    """Read a comma-separated environment variable as a list"""
+    return [item.strip() for item in os.getenv(name, "").split(",") if item.strip()]
+
+
 # Configuration
 BASE_URL = os.getenv("BASE_URL", "https://example.com")
 DEFAULT_TIMEOUT = int(os.getenv("DEFAULT_TIMEOUT", "10000"))
 SCREENSHOT_ON_FAILURE = os.getenv("SCREENSHOT_ON_FAILURE", "true").lower() == "true"
+SCREENSHOT_FORMAT = os.getenv("SCREENSHOT_FORMAT", "png").lower()
+SCREENSHOT_QUALITY = int(os.getenv("SCREENSHOT_QUALITY", "80"))
+# Off unless opted in: recording makes the browser encode video for the whole test
+VIDEO_ON_FAILURE = os.getenv("VIDEO_ON_FAILURE", "false").lower() == "true"
+# Empty values (as in env.example) mean "not set"
+VIDEO_MODE = (os.getenv("VIDEO_MODE") or ("retain-on-failure" if VIDEO_ON_FAILURE else "off")).lower()
+TRACE_MODE = (os.getenv("TRACE_MODE") or "off").lower()
+RECORDING_PRESET = (os.getenv("RECORDING_PRESET") or "low").lower()
+RECORDING_MAX_OVERHEAD = float(os.getenv("RECORDING_MAX_OVERHEAD", "10"))
+EVENT_BUFFER_SIZE = int(os.getenv("EVENT_BUFFER_SIZE", "500"))
+EVENT_LOG_LEVEL = os.getenv("EVENT_LOG_LEVEL", "debug").lower()
+EVENT_STREAM = os.getenv("EVENT_STREAM", "false").lower() == "true"
+AUTH_STATE_TTL = int(os.getenv("AUTH_STATE_TTL", "1800"))
+CONTEXT_POOL = os.getenv("CONTEXT_POOL", "false").lower() == "true"
+CONTEXT_POOL_SIZE = int(os.getenv("CONTEXT_POOL_SIZE", "2"))
+CONTEXT_POOL_MAX_USES = int(os.getenv("CONTEXT_POOL_MAX_USES", "25"))
+CONTEXT_POOL_MAX_HEAP_MB = float(os.getenv("CONTEXT_POOL_MAX_HEAP_MB", "256"))
+BLOCK_RESOURCE_TYPES = _env_list("BLOCK_RESOURCE_TYPES")
+BLOCK_DOMAINS = _env_list("BLOCK_DOMAINS")
+STUB_RESOURCE_TYPES = _env_list("STUB_RESOURCE_TYPES")
+# Let tests without blocking record resource sizes too (a callback per response)
+LEARN_RESOURCE_SIZES = os.getenv("LEARN_RESOURCE_SIZES", "false").lower() == "true"
+HAR_MODE = os.getenv("HAR_MODE", "off").lower()
+HAR_MISS_POLICY = os.getenv("HAR_MISS_POLICY", "fail").lower()
+TESTSHOP_URL = os.getenv("TESTSHOP_URL", "https://djuanze.github.io/test-ecommerce-site")
+TESTSHOP_DIR = os.getenv("TESTSHOP_DIR", "")
+TESTSHOP_PORT = int(os.getenv("TESTSHOP_PORT", "0"))
+TESTSHOP_LATENCY_MS = float(os.getenv("TESTSHOP_LATENCY_MS", "0"))
+ACTION_TIMING = os.getenv("ACTION_TIMING", "false").lower() == "true"
+DURATION_SCHEDULER = os.getenv("DURATION_SCHEDULER", "false").lower() == "true"
+FAILED_FIRST_RUNS = int(os.getenv("FAILED_FIRST_RUNS", "3"))
+DATA_SEED = os.getenv("DATA_SEED", "")
+IMPACT_BASE = os.getenv("IMPACT_BASE", "")
+IMPACT_TRACE = os.getenv("IMPACT_TRACE", "false").lower() == "true"
+PERF_MONITOR = os.getenv("PERF_MONITOR", "false").lower() == "true"
+PERF_BUDGETS = parse_budgets(os.getenv("PERF_BUDGETS", ""))
+PERF_REGRESSION_SIGMA = float(os.getenv("PERF_REGRESSION_SIGMA", "3"))
+PERF_MIN_SAMPLES = int(os.getenv("PERF_MIN_SAMPLES", "5"))
+PERF_UPDATE_BASELINE = os.getenv("PERF_UPDATE_BASELINE", "true").lower() == "true"
+VISUAL_UPDATE = os.getenv("VISUAL_UPDATE", "false").lower() == "true"
+VISUAL_TOLERANCE = float(os.getenv("VISUAL_TOLERANCE", "0.1"))
+VISUAL_MAX_DIFF_RATIO = float(os.getenv("VISUAL_MAX_DIFF_RATIO", "0.001"))
 
 # Create directories for artifacts
 SCREENSHOTS_DIR = Path("screenshots")
 VIDEOS_DIR = Path("videos")
+TRACES_DIR = Path("traces")
+AUTH_STATE_DIR = Path(".auth")
+STATE_SNAPSHOT_DIR = Path(".cache") / "state_snapshots"
+CART_TEMPLATES_PATH = Path(".cache") / "cart_templates.json"
+RESOURCE_SIZES_PATH = Path(".cache") / "resource_sizes.json"
+HAR_DIR = Path(os.getenv("HAR_DIR", "hars"))
+TIMINGS_DIR = Path("reports") / "timings"
+EVENTS_DIR = Path("reports") / "events"
+DURATIONS_PATH = Path(".cache") / "test_durations.json"
+IMPACT_DIR = Path(".cache") / "impact"
+PERF_BASELINE_PATH = Path(os.getenv("PERF_BASELINE_PATH", ".cache/perf_baseline.json"))
+VISUAL_BASELINE_DIR = Path(os.getenv("VISUAL_BASELINE_DIR", "visual_baselines"))
+VISUAL_ARTIFACTS_DIR = Path("reports") / "visual"
 SCREENSHOTS_DIR.mkdir(exist_ok=True)
 VIDEOS_DIR.mkdir(exist_ok=True)
 
 
+def pytest_configure(config):
+    """Register the duration scheduler and impact tracer and, with ACTION_TIMING=true, instrument page objects"""
+    # xdist workers start after this and inherit the environment, so the whole run shares one seed
+    config.data_seed = DATA_SEED or new_seed()
+    os.environ["DATA_SEED"] = config.data_seed
+    
+    # Durations are recorded (and xdist scheduled) by the controller only
+    if DURATION_SCHEDULER and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(
+            DurationSchedulerPlugin(DurationHistory(DURATIONS_PATH, failed_runs=FAILED_FIRST_RUNS)),
+            "duration_scheduler",
+        )
+    
+    if IMPACT_TRACE:
+        worker = getattr(config, "workerinput", {}).get("workerid", "main")
+        config.pluginmanager.register(
+            ImpactTracer(SymbolIndex.build(config.rootpath), IMPACT_DIR / f"{worker}.json", config.rootpath),
+            "impact_tracer",
+        )
+    
+    config.action_timer = None
+    if not ACTION_TIMING:
+        return
+    # Only the controller clears old results; xdist workers just add to them
+    if not hasattr(config, "workerinput") and TIMINGS_DIR.exists():
+        shutil.rmtree(TIMINGS_DIR)
+    import pages.home_page, pages.outfittery_home_page  # noqa: F401 - register subclasses
+    import utils
+    import utils.helpers
+    timer = ActionTimer()
+    timer.install(all_subclasses(BasePage), modules=[utils.helpers], namespaces=[utils])
+    config.action_timer = timer
+
+
+def pytest_report_header(config):
+    return f"test data seed: {config.data_seed} (DATA_SEED={config.data_seed} replays this run's data)"
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix):
+    """Add the hottest page-object/helper calls to the pytest-html report"""
+    if ACTION_TIMING:
+        postfix.append(summary_html(summarize(TIMINGS_DIR)))
+
+
+def pytest_collection_modifyitems(config, items):
+    """With IMPACT_BASE set, deselect tests the changes since that revision can't affect"""
+    if not IMPACT_BASE:
+        return
+    selected = affected_tests(IMPACT_BASE, root=config.rootpath, dynamic_dir=IMPACT_DIR)
+    if selected is None:
+        return
+    keep = [item for item in items if item.nodeid.split("[", 1)[0] in selected]
+    skipped = [item for item in items if item.nodeid.split("[", 1)[0] not in selected]
+    if skipped:
+        config.hook.pytest_deselected(items=skipped)
+        items[:] = keep
+    print(f"\n🎯 Impact analysis vs {IMPACT_BASE}: {len(keep)} affected, {len(skipped)} deselected")
+
+
 # Hook to capture test result for screenshot on failure
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """Hook to capture test result"""
     outcome = yield
     rep = outcome.get_result()
+    if rep.when == "call":
+        funcargs = getattr(item, "funcargs", {})
+        # Budget breaches and HAR misses fail the test itself rather than erroring in teardown
+        recorder = funcargs.get("performance_budget")
+        if rep.passed and recorder is not None and recorder.failures:
+            rep.outcome = "failed"
+            rep.longrepr = "Performance budget exceeded:\n" + "\n".join(recorder.failures)
+        router = funcargs.get("har_router")
+        if router is not None and router.failing_misses:
+            misses = (f"{len(router.misses)} request(s) missing from {router.archive.path}:\n"
+                      + "\n".join(router.misses[:10]))
+            if rep.passed:
+                rep.outcome = "failed"
+                rep.longrepr = misses
+            else:
+                # The aborted requests likely caused the failure - show them next to it
+                rep.sections.append(("HAR replay misses", misses))
     setattr(item, f"rep_{rep.when}", rep)
 
 
+@pytest.fixture(scope="session")
+def context_pool(browser, browser_context_args):
+    """Warm browser contexts shared by the tests of one worker"""
+    pool = ContextPool(
+        browser,
+        browser_context_args,
+        size=CONTEXT_POOL_SIZE,
+        max_uses=CONTEXT_POOL_MAX_USES,
+        max_heap_mb=CONTEXT_POOL_MAX_HEAP_MB,
+    )
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def recording_calibration(browser, browser_context_args):
+    """Slowdown of actions under recording, measured once per worker and settings on first use"""
+    return RecordingCalibration(browser, browser_context_args)
+
+
+def _recorder(request):
+    """Recorder for the test's video/trace modes (@pytest.mark.recording, else VIDEO_MODE/TRACE_MODE)"""
+    marker = request.node.get_closest_marker("recording")
+    options = marker.kwargs if marker else {}
+    video_mode = options.get("video", VIDEO_MODE)
+    trace_mode = options.get("trace", TRACE_MODE)
+    # pytest-playwright's own --video/--tracing take over when they are used
+    if request.config.getoption("--video", "off") != "off":
+        video_mode = "off"
+    if request.config.getoption("--tracing", "off") != "off":
+        trace_mode = "off"
+    return Recorder(request.node.nodeid, video_mode, trace_mode, preset=options.get("preset", RECORDING_PRESET),
+                    videos_dir=VIDEOS_DIR, traces_dir=TRACES_DIR)
+
+
 @pytest.fixture(scope="function")
-def page(page):
+def page(request):
     """
     Override pytest-playwright's page fixture to add custom behavior
-    Uses the built-in 'page' fixture from pytest-playwright
+    With CONTEXT_POOL=true or @pytest.mark.pooled_context the page comes from a
+    warm pooled context; otherwise from pytest-playwright's per-test 'context',
+    or from a recorded context when the test's video or trace mode isn't off.
     """
-    page.set_default_timeout(DEFAULT_TIMEOUT)
-    yield page
-    # Page cleanup is handled by pytest-playwright
+    if CONTEXT_POOL or request.node.get_closest_marker("pooled_context"):
+        pool = request.getfixturevalue("context_pool")
+        pooled = pool.acquire()
+        pooled.page.set_default_timeout(DEFAULT_TIMEOUT)
+        yield pooled.page
+        # Failed tests may leave odd state behind - don't hand it to the next test
+        failed = hasattr(request.node, 'rep_call') and request.node.rep_call.failed
+        pool.release(pooled, discard=failed)
+    else:
+        recorder = _recorder(request)
+        slowdown = 0.0
+        if recorder.active:
+            # Calibrated before the test's context exists, so it doesn't count towards the test
+            slowdown = request.getfixturevalue("recording_calibration").slowdown(recorder)
+            context = request.getfixturevalue("new_context")(**recorder.context_args())
+            recorder.start(context)
+        else:
+            context = request.getfixturevalue("context")
+        page = context.new_page()
+        page.set_default_timeout(DEFAULT_TIMEOUT)
+        yield page
+        # Page cleanup is handled by pytest-playwright's context fixture, or by the recorder
+        if recorder.active:
+            call = getattr(request.node, 'rep_call', None)
+            for kind, path in recorder.finish(failed=call is None or call.failed).items():
+                print(f"\n🎬 {kind.capitalize()}: {path}")
+            duration = call.duration if call else 0
+            overhead = recorder.overhead_percent(duration, slowdown)
+            if overhead > RECORDING_MAX_OVERHEAD:
+                print(f"\n⚠️ Recording cost ~{recorder.cost_seconds(duration, slowdown):.2f}s "
+                      f"({overhead:.0f}% of the test, limit {RECORDING_MAX_OVERHEAD:.0f}%) - "
+                      f"try RECORDING_PRESET=low or TRACE_MODE=off")
+
+
+@pytest.fixture(scope="function", autouse=True)
+def action_timing(request):
+    """Record per-call timings of page objects and helpers into reports/timings/"""
+    timer = request.config.action_timer
+    if timer is None:
+        yield None
+        return
+    timer.start_test()
+    start = time.perf_counter()
+    yield timer
+    write_test_timings(TIMINGS_DIR, request.node.nodeid, timer.finish_test(), time.perf_counter() - start)
+
+
+@pytest.fixture(scope="session")
+def screenshot_writer(request):
+    """Background writer storing failure screenshots once per distinct image"""
+    # One manifest per xdist worker so workers never write the same file
+    worker = getattr(request.config, "workerinput", {}).get("workerid")
+    writer = ScreenshotWriter(
+        SCREENSHOTS_DIR,
+        image_format=SCREENSHOT_FORMAT,
+        quality=SCREENSHOT_QUALITY,
+        manifest_name=f"manifest-{worker}.json" if worker else "manifest.json",
+    )
+    yield writer
+    writer.close()
 
 
 @pytest.fixture(scope="function", autouse=True)
-def screenshot_on_failure(request, page):
-    """Take screenshot on test failure"""
+def screenshot_on_failure(request, page, screenshot_writer):
+    """Take screenshot on test failure; encoding and writing happen in the background"""
     yield
     
     # Check if test failed and screenshot is enabled
     if SCREENSHOT_ON_FAILURE and hasattr(request.node, 'rep_call') and request.node.rep_call.failed:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        test_name = request.node.name
-        screenshot_path = SCREENSHOTS_DIR / f"{test_name}_{timestamp}.png"
         try:
-            page.screenshot(path=str(screenshot_path))
-            print(f"\n📸 Screenshot saved: {screenshot_path}")
+            image = page.screenshot(**capture_options(screenshot_writer.image_format, SCREENSHOT_QUALITY))
         except Exception as e:
-            print(f"\n⚠️ Could not save screenshot: {e}")
+            print(f"\n⚠️ Could not take screenshot: {e}")
+            return
+        screenshot_path = screenshot_writer.submit(request.node.nodeid, image)
+        print(f"\n📸 Screenshot: {screenshot_path} (see {screenshot_writer.manifest_path.name})")
+
+
+@pytest.fixture(scope="function")
+def event_hub(request, page):
+    """
+    Console, dialog and network events of this test's page
+    Ring buffers of EVENT_BUFFER_SIZE per event type, filtered by EVENT_LOG_LEVEL;
+    EVENT_STREAM=true also writes them to reports/events/. All listeners and
+    subscriptions are removed when the test ends.
+    """
+    stream_path = None
+    if EVENT_STREAM:
+        safe_name = re.sub(r"[^\w.-]+", "_", request.node.nodeid)[-180:]
+        stream_path = EVENTS_DIR / f"{safe_name}.jsonl"
+    hub = EventHub(page, capacity=EVENT_BUFFER_SIZE, min_level=EVENT_LOG_LEVEL, stream_path=stream_path)
+    yield hub
+    if hasattr(request.node, 'rep_call') and request.node.rep_call.failed and hub.errors():
+        print(f"\n🧾 Browser errors ({len(hub.errors())}):")
+        for event in hub.errors()[-10:]:
+            print(f"   {event.kind}: {event.text[:200]}")
+    hub.close()
+
+
+@pytest.fixture(scope="session")
+def worker_data_factory(request):
+    """Test data factory for session-scoped fixtures of this worker"""
+    worker = getattr(request.config, "workerinput", {}).get("workerid", "main")
+    return DataFactory(f"{request.config.data_seed}:{worker}")
+
+
+@pytest.fixture(scope="function")
+def data_factory(request):
+    """
+    Unique, reproducible test data for this test
+    Seeded from DATA_SEED and the test id, so values never collide across tests or
+    xdist workers and the same seed regenerates the same data wherever the test runs.
+    """
+    factory = DataFactory(f"{request.config.data_seed}:{request.node.nodeid}")
+    yield factory
+    if hasattr(request.node, 'rep_call') and request.node.rep_call.failed:
+        print(f"\n🎲 Test data seed: DATA_SEED={request.config.data_seed}")
+
+
+@pytest.fixture(scope="session")
+def state_snapshots():
+    """Named cookie/storage snapshots shared by the tests of one worker (persisted ones under .cache/)"""
+    return StateSnapshots(STATE_SNAPSHOT_DIR)
+
+
+@pytest.fixture(scope="function")
+def browser_state(page, state_snapshots):
+    """Capture, restore and diff the cookies, localStorage and sessionStorage of this test's context"""
+    return BrowserState(page, state_snapshots)
+
+
+@pytest.fixture(scope="session")
+def resource_size_catalog():
+    """Response sizes seen so far, used to estimate bytes avoided by blocking"""
+    catalog = ResourceSizeCatalog(RESOURCE_SIZES_PATH)
+    yield catalog
+    catalog.save()
+
+
+@pytest.fixture(scope="session")
+def har_archives():
+    """One HAR archive per test module (HAR_MODE=record|replay), each saved once at session end"""
+    if HAR_MODE == "off":
+        yield None
+        return
+    archives = HarArchives(HAR_DIR)
+    yield archives
+    archives.save()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def har_router(request, page, har_archives):
+    """
+    Record the test's traffic into, or replay it from, the module's HAR archive
+    HAR_MISS_POLICY decides what happens to unrecorded requests during replay:
+    fail (abort and fail the test), passthrough (go to the network) or record.
+    Misses fail the call phase from pytest_runtest_makereport, not teardown.
+    """
+    if har_archives is None:
+        yield None
+        return
+    
+    har_archive = har_archives.get(request.module.__name__)
+    router = HarRouter(har_archive, mode=HAR_MODE, miss_policy=HAR_MISS_POLICY)
+    router.attach(page.context)
+    yield router
+    router.detach()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def resource_blocker(request, page, har_router, resource_size_catalog):
+    """
+    Block or stub heavy/third-party resources for the test's context
+    Depends on har_router so blocking is decided before HAR record/replay sees a request.
+    Configure with @pytest.mark.block_resources(types=[...], domains=[...], stub_types=[...])
+    or the BLOCK_RESOURCE_TYPES / BLOCK_DOMAINS / STUB_RESOURCE_TYPES env vars.
+    """
+    marker = request.node.get_closest_marker("block_resources")
+    if marker:
+        blocker = ResourceBlocker(
+            blocked_types=marker.kwargs.get("types", DEFAULT_BLOCKED_TYPES),
+            blocked_domains=marker.kwargs.get("domains", DEFAULT_BLOCKED_DOMAINS),
+            stubbed_types=marker.kwargs.get("stub_types", DEFAULT_STUBBED_TYPES),
+            catalog=resource_size_catalog,
+            learn_sizes=LEARN_RESOURCE_SIZES,
+        )
+    else:
+        blocker = ResourceBlocker(
+            blocked_types=BLOCK_RESOURCE_TYPES,
+            blocked_domains=BLOCK_DOMAINS,
+            stubbed_types=STUB_RESOURCE_TYPES,
+            catalog=resource_size_catalog,
+            learn_sizes=LEARN_RESOURCE_SIZES,
+        )
+    # No-op unless the test blocks something or LEARN_RESOURCE_SIZES=true
+    blocker.attach(page.context)
+    yield blocker
+    blocker.detach()
+    if not blocker.enabled:
+        return
+    
+    stats = blocker.stats()
+    request.node.user_properties.append(("resources_avoided", stats))
+    avoided = stats["blocked"] + stats["stubbed"]
+    print(f"\n🚫 Resources avoided: {stats['blocked']} blocked, {stats['stubbed']} stubbed, "
+          f"~{stats['bytes_avoided'] / 1024:.0f} KB ({avoided - stats['unsized']} of {avoided} with a known size)")
+
+
+@pytest.fixture(scope="session")
+def performance_baseline():
+    """Per URL and viewport baseline of passing performance measurements"""
+    baseline = PerformanceBaseline(PERF_BASELINE_PATH)
+    yield baseline
+    baseline.save()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def performance_budget(request, page, performance_baseline):
+    """
+    Measure every BasePage.navigate and fail the test on budget breaches or regressions
+    Enable with PERF_MONITOR=true (budgets from PERF_BUDGETS, e.g. "lcp=2500,cls=0.1")
+    or per test with @pytest.mark.performance_budget(lcp=2500, cls=0.1).
+    """
+    marker = request.node.get_closest_marker("performance_budget")
+    if not (PERF_MONITOR or marker):
+        yield None
+        return
+    
+    budgets = {**PERF_BUDGETS, **(marker.kwargs if marker else {})}
+    recorder = PerformanceRecorder(PerformanceBudget(
+        budgets, performance_baseline, regression_sigma=PERF_REGRESSION_SIGMA, min_samples=PERF_MIN_SAMPLES,
+    ))
+    BasePage.attach_performance_recorder(page, recorder)
+    yield recorder
+    BasePage.attach_performance_recorder(page, None)
+    
+    for key, metrics in recorder.measurements:
+        request.node.user_properties.append(("performance", {"page": key, **metrics}))
+    # Failures were already reported on the call phase by pytest_runtest_makereport
+    passed = hasattr(request.node, "rep_call") and request.node.rep_call.passed
+    if PERF_UPDATE_BASELINE and passed:
+        recorder.update_baseline()
+
+
+@pytest.fixture(scope="session")
+def visual_baselines():
+    """Baseline screenshots in VISUAL_BASELINE_DIR; diffs and heatmaps go to reports/visual/"""
+    return VisualBaselines(
+        VISUAL_BASELINE_DIR,
+        VISUAL_ARTIFACTS_DIR,
+        update=VISUAL_UPDATE,
+        tolerance=VISUAL_TOLERANCE,
+        max_diff_ratio=VISUAL_MAX_DIFF_RATIO,
+    )
+
+
+@pytest.fixture(scope="function")
+def assert_visual_match(page, visual_baselines, browser_name):
+    """
+    Compare a screenshot of the page with its baseline (created on first run)
+    Baselines are kept per browser and viewport. Dynamic elements can be hidden
+    with mask=[selectors], fixed pixel regions ignored with regions=[(x, y, w, h)].
+    """
+    def _assert_visual_match(name, full_page=False, mask=(), regions=(), **options):
+        screenshot = page.screenshot(
+            full_page=full_page,
+            mask=[page.locator(selector) for selector in mask],
+            animations="disabled",
+            caret="hide",
+        )
+        viewport = page.viewport_size
+        size = f"{viewport['width']}x{viewport['height']}" if viewport else "no-viewport"
+        return visual_baselines.check(f"{name}-{browser_name}-{size}", screenshot, masks=regions, **options)
+    
+    return _assert_visual_match
+
+
+@pytest.fixture(scope="session")
+def viewport_matrix(browser, playwright, browser_context_args):
+    """
+    Run one check per TestData.VIEWPORTS entry (or device descriptor)
+    Each target gets its own context on the session's browser; is_mobile devices are skipped on Firefox.
+    """
+    return ViewportMatrix(browser, playwright.devices, browser_context_args)
 
 
 @pytest.fixture(scope="session")
@@ -70,6 +536,44 @@ def outfittery_url():
     return "https://outfittery.com"
 
 
+@pytest.fixture(scope="session")
+def testshop_server():
+    """
+    Local stand-in server for the TestShop static files (None if TESTSHOP_DIR is unset)
+    Set TESTSHOP_LATENCY_MS, or change server.latency_ms at runtime, to simulate a slow backend.
+    """
+    if not TESTSHOP_DIR:
+        yield None
+        return
+    server = LocalServer(TESTSHOP_DIR, port=TESTSHOP_PORT, latency_ms=TESTSHOP_LATENCY_MS).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def testshop_url(testshop_server):
+    """TestShop base URL - the local server when running, otherwise TESTSHOP_URL"""
+    return testshop_server.url if testshop_server else TESTSHOP_URL
+
+
+@pytest.fixture(scope="session")
+def cart_template_cache():
+    """TestShop cart formats learned once through the UI and reused by every worker"""
+    return CartTemplateCache(CART_TEMPLATES_PATH)
+
+
+@pytest.fixture(scope="function")
+def seed_cart(page, testshop_url, testshop_server, browser, browser_context_args, cart_template_cache):
+    """
+    Write a TestShop cart straight into client-side storage before the first navigation
+    Usage: seed_cart(3) or seed_cart(["1", "1", "4"]), then open cart.html.
+    """
+    # The local server gets a new port every session; its directory is the stable identity
+    key = f"dir:{Path(TESTSHOP_DIR).resolve()}" if testshop_server else testshop_url
+    template = cart_template_cache.get(browser, testshop_url, browser_context_args, key=key)
+    return CartSeeder(page, testshop_url, template)
+
+
 @pytest.fixture(scope="session")
 def test_user():
     """Provide test user credentials"""
@@ -77,3 +581,59 @@ def test_user():
         "username": os.getenv("TEST_USERNAME", "demo@example.com"),
         "password": os.getenv("TEST_PASSWORD", "demopass")
     }
+
+
+@pytest.fixture(scope="session")
+def auth_state_cache():
+    """Shared on-disk cache of logged-in storage states"""
+    return AuthStateCache(AUTH_STATE_DIR, ttl_seconds=AUTH_STATE_TTL)
+
+
+@pytest.fixture(scope="function")
+def new_authenticated_context(browser, browser_context_args, auth_state_cache):
+    """
+    Factory for contexts seeded from a cached logged-in storage state
+    Usage: new_authenticated_context(user, site_url, login) where login(page, user)
+    performs the UI login. It only runs once per credential set until the state expires.
+    """
+    contexts = []
+    
+    def _new_context(user, site_url, login):
+        state_path = auth_state_cache.get(
+            browser,
+            credential_key(user, site_url),
+            lambda page: login(page, user),
+            context_args=browser_context_args,
+        )
+        context = browser.new_context(**browser_context_args, storage_state=state_path)
+        contexts.append(context)
+        return context
+    
+    yield _new_context
+    for context in contexts:
+        context.close()
+
+
+@pytest.fixture(scope="function")
+def authenticated_context(request, new_authenticated_context, base_url, test_user):
+    """
+    Browser context logged in through LoginPage, using the cached storage state
+    Pass a TestData.VALID_USERS entry via indirect parametrization to pick the user.
+    """
+    user = getattr(request, "param", None) or test_user
+    
+    def login(page, user):
+        login_page = LoginPage(page, base_url)
+        login_page.navigate_to_login()
+        with login_page.expect_url_change():
+            login_page.login(user.get("username") or user["email"], user["password"])
+    
+    return new_authenticated_context(user, base_url, login)
+
+
+@pytest.fixture(scope="function")
+def authenticated_page(authenticated_context):
+    """Page in a context that is already logged in"""
+    page = authenticated_context.new_page()
+    page.set_default_timeout(DEFAULT_TIMEOUT)
+    yield page
@@ -3,6 +3,9 @@
 import pytest
 from pages.home_page import HomePage
 
+# Short read-only checks - reuse warm contexts instead of building one per test
+pytestmark = pytest.mark.pooled_context
+
 
 def test_homepage_loads(page, base_url):
     """Test that homepage loads successfully"""
@@ -3,6 +3,9 @@
 import pytest
 from pathlib import Path
 
+from pages.base_page import BasePage
+from utils.test_data import TestData
+
 
 @pytest.mark.smoke
 def test_page_navigation(page, base_url):
@@ -35,11 +38,9 @@ def test_page_back_navigation(page, base_url):
     
     # Create some history by navigating to a different URL
     page.goto("data:text/html,<html><body><h1>Test Page</h1></body></html>")
-    page.wait_for_timeout(100)
     
-    # Go back to original page
+    # Go back to original page (go_back waits for the navigation to load)
     page.go_back()
-    page.wait_for_timeout(500)
     
     # Should be back at the original URL
     assert base_url in page.url, f"Expected to be back at {base_url}, but got {page.url}"
@@ -58,8 +59,8 @@ def test_page_reload(page, base_url):
 
 
 @pytest.mark.smoke
-def test_page_screenshot(page, base_url):
-    """Test taking a screenshot"""
+def test_page_screenshot(page, base_url, assert_visual_match):
+    """Test taking a screenshot and comparing it with the visual baseline"""
     page.goto(base_url)
     
     # Ensure screenshots directory exists
@@ -73,3 +74,27 @@ def test_page_screenshot(page, base_url):
     # Verify screenshot was created
     assert screenshot_path.exists()
     assert screenshot_path.stat().st_size > 0, "Screenshot should not be empty"
+    
+    # Compare against the stored baseline (created on the first run)
+    assert_visual_match("example-home")
+
+
+@pytest.mark.slow
+def test_full_page_visual_regression_4k(page, base_url, assert_visual_match):
+    """Test a 4K full-page screenshot against its visual baseline"""
+    page.set_viewport_size(TestData.VIEWPORTS["4k"])
+    page.goto(base_url)
+    
+    result = assert_visual_match("example-home-full", full_page=True)
+    print(f"\n🖼️ {result.summary()} ({result.tiles_checked} tiles)")
+
+
+@pytest.mark.performance_budget(load=10000, first_contentful_paint=4000, lcp=4000, cls=0.1)
+def test_page_performance_budget(page, base_url, performance_budget):
+    """Test page load stays within its performance budget"""
+    BasePage(page).navigate(base_url)
+    
+    # Budget breaches or regressions fail the test once it returns (see pytest_runtest_makereport)
+    key, metrics = performance_budget.measurements[0]
+    assert metrics["load"] is not None, "Navigation Timing should be available"
+    assert metrics["resource_count"] >= 0
@@ -2,41 +2,36 @@
 
 import pytest
 
-
-@pytest.mark.mobile
-def test_mobile_viewport(page, base_url):
-    """Test page on mobile viewport"""
-    # Set mobile viewport
-    page.set_viewport_size({"width": 375, "height": 667})  # iPhone SE
-    page.goto(base_url)
-    
-    # Verify page loads on mobile
-    assert page.title() != ""
-    assert "Example Domain" in page.title()
+from utils.test_data import get_viewport
 
 
 @pytest.mark.mobile
-def test_tablet_viewport(page, base_url):
-    """Test page on tablet viewport"""
-    # Set tablet viewport
-    page.set_viewport_size({"width": 768, "height": 1024})  # iPad
-    page.goto(base_url)
+def test_page_loads_on_every_viewport(viewport_matrix, base_url):
+    """Test page loads on every TestData.VIEWPORTS size, one context each"""
+    def check(page, name):
+        page.goto(base_url)
+        title = page.title()
+        assert "Example Domain" in title, f"Unexpected title {title!r}"
+        return title
     
-    # Verify page loads on tablet
-    assert page.title() != ""
-    assert "Example Domain" in page.title()
+    result = viewport_matrix.run(check)
+    print(f"\n{result.summary()}")
+    result.assert_all()
 
 
 @pytest.mark.mobile
-def test_desktop_viewport(page, base_url):
-    """Test page on desktop viewport"""
-    # Set desktop viewport
-    page.set_viewport_size({"width": 1920, "height": 1080})  # Full HD
-    page.goto(base_url)
+def test_page_loads_on_mobile_devices(viewport_matrix, base_url):
+    """Test page on real device descriptors (touch, device scale factor, user agent)"""
+    def check(page, name):
+        page.goto(base_url)
+        return page.locator("body").is_visible()
     
-    # Verify page loads on desktop
-    assert page.title() != ""
-    assert "Example Domain" in page.title()
+    result = viewport_matrix.run(check, ["iPhone 13", "Pixel 5", "iPad Mini"])
+    print(f"\n{result.summary()}")
+    if len(result.skipped) == len(result.outcomes):
+        pytest.skip(result.skipped[0]["skipped"])
+    result.assert_all()
+    assert all(o["result"] for o in result.outcomes if not o["skipped"]), "Body should be visible on every device"
 
 
 @pytest.mark.mobile
@@ -45,11 +40,11 @@ def test_responsive_elements(page, base_url):
     page.goto(base_url)
     
     # Desktop view
-    page.set_viewport_size({"width": 1920, "height": 1080})
+    page.set_viewport_size(get_viewport("desktop"))
     page.wait_for_load_state("domcontentloaded")
     
     # Mobile view
-    page.set_viewport_size({"width": 375, "height": 667})
+    page.set_viewport_size(get_viewport("mobile"))
     page.wait_for_load_state("domcontentloaded")
     
     # Page should still be functional
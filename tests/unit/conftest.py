@@ -0,0 +1,27 @@
+"""Unit tests of utils/ and pages/ logic that need no browser
+
+The autouse fixtures of tests/conftest.py all work on a Playwright page, so they
+are replaced with no-ops here - otherwise every unit test would launch a browser.
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def screenshot_on_failure():
+    yield
+
+
+@pytest.fixture(autouse=True)
+def har_router():
+    yield None
+
+
+@pytest.fixture(autouse=True)
+def resource_blocker():
+    yield None
+
+
+@pytest.fixture(autouse=True)
+def performance_budget():
+    yield None
@@ -0,0 +1,92 @@
+"""Storage-state cache of utils.auth_state"""
+
+import json
+import os
+import time
+
+from utils.auth_state import AuthStateCache, credential_key
+
+
+class FakeContext:
+    def __init__(self, state):
+        self.state = state
+        self.closed = False
+    
+    def new_page(self):
+        return "page"
+    
+    def storage_state(self, path):
+        with open(path, "w") as f:
+            json.dump(self.state, f)
+    
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, state=None):
+        self.state = state or {"cookies": [], "origins": []}
+        self.contexts = []
+    
+    def new_context(self, **options):
+        context = FakeContext(self.state)
+        self.contexts.append(context)
+        return context
+
+
+def test_credential_key_depends_on_user_site_and_password():
+    user = {"email": "a@b.c", "password": "one"}
+    
+    key = credential_key(user, "https://shop")
+    
+    assert key.startswith("a@b.c:") and key.endswith("@https://shop")
+    assert "one" not in key
+    assert key == credential_key(dict(user), "https://shop")
+    assert key != credential_key({**user, "password": "two"}, "https://shop")
+    assert key != credential_key(user, "https://other")
+    assert credential_key({"username": "u", "email": "e"}, "s").startswith("u:")
+
+
+def test_login_runs_once_while_the_state_is_fresh(tmp_path):
+    cache = AuthStateCache(tmp_path)
+    browser = FakeBrowser()
+    logins = []
+    
+    first = cache.get(browser, "key", logins.append)
+    second = cache.get(browser, "key", logins.append)
+    
+    assert first == second and logins == ["page"]
+    assert len(browser.contexts) == 1 and browser.contexts[0].closed
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_state_expires_with_its_ttl(tmp_path):
+    cache = AuthStateCache(tmp_path, ttl_seconds=60)
+    cache.get(FakeBrowser(), "key", lambda page: None)
+    old = time.time() - 120
+    os.utime(cache.path_for("key"), (old, old))
+    
+    assert not cache.is_fresh("key")
+
+
+def test_state_with_an_expired_cookie_is_stale(tmp_path):
+    cache = AuthStateCache(tmp_path)
+    expired = {"cookies": [{"name": "sid", "expires": time.time() - 1}], "origins": []}
+    session = {"cookies": [{"name": "sid", "expires": -1}], "origins": []}
+    
+    cache.get(FakeBrowser(expired), "expired", lambda page: None)
+    cache.get(FakeBrowser(session), "session", lambda page: None)
+    
+    assert not cache.is_fresh("expired")
+    assert cache.is_fresh("session")
+
+
+def test_invalidate_forces_a_new_login(tmp_path):
+    cache = AuthStateCache(tmp_path)
+    logins = []
+    cache.get(FakeBrowser(), "key", logins.append)
+    
+    cache.invalidate("key")
+    cache.get(FakeBrowser(), "key", logins.append)
+    
+    assert len(logins) == 2
@@ -0,0 +1,147 @@
+"""Snapshots, restore and StateDiff of utils.browser_state"""
+
+import pytest
+
+from utils.browser_state import (
+    _READ_STORAGE_JS, _WRITE_STORAGE_JS, StateDiff, StateSnapshot, StateSnapshots, capture_state, origin_of,
+    restore_state,
+)
+
+
+class FakeContext:
+    """localStorage per origin is shared by the context's pages, sessionStorage is per page"""
+    
+    def __init__(self):
+        self.pages = []
+        self.cookies = []
+        self.local = {}
+    
+    def storage_state(self):
+        return {
+            "cookies": list(self.cookies),
+            "origins": [
+                {"origin": origin, "localStorage": [{"name": k, "value": v} for k, v in values.items()]}
+                for origin, values in self.local.items() if values
+            ],
+        }
+    
+    def clear_cookies(self):
+        self.cookies = []
+    
+    def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+    
+    def new_page(self, url="about:blank"):
+        page = FakePage(self, url)
+        self.pages.append(page)
+        return page
+
+
+class FakePage:
+    def __init__(self, context, url):
+        self.context = context
+        self.url = url
+        self.session = {}
+    
+    def route(self, pattern, handler):
+        pass
+    
+    def goto(self, url):
+        self.url = url
+    
+    def close(self):
+        self.context.pages.remove(self)
+    
+    def evaluate(self, script, arg=None):
+        local = self.context.local.setdefault(origin_of(self.url), {})
+        if script == _READ_STORAGE_JS:
+            return {"localStorage": dict(local), "sessionStorage": dict(self.session)}
+        assert script == _WRITE_STORAGE_JS
+        for name, values in arg.items():
+            target = local if name == "localStorage" else self.session
+            target.clear()
+            target.update(values)
+
+
+def snapshot(local=None, session=None, cookies=()):
+    origin = "https://shop"
+    return StateSnapshot(list(cookies), {origin: {"localStorage": local or {}, "sessionStorage": session or {}}})
+
+
+def test_diff_reports_added_removed_and_changed_entries():
+    before = snapshot({"cart": "[1]", "theme": "dark"}, cookies=[{"name": "sid", "value": "a", "domain": "shop"}])
+    after = snapshot({"cart": "[1,2]", "token": "x"}, {"step": "2"},
+                     cookies=[{"name": "sid", "value": "b", "domain": "shop"}])
+    
+    diff = before.diff(after)
+    
+    assert diff
+    assert diff.cookies["changed"] == {("sid", "shop", "/"): ("a", "b")}
+    assert diff.storage[("https://shop", "localStorage")] == {
+        "added": {"token": "x"}, "removed": {"theme": "dark"}, "changed": {"cart": ("[1]", "[1,2]")},
+    }
+    assert diff.storage[("https://shop", "sessionStorage")]["added"] == {"step": "2"}
+    assert "localStorage removed: https://shop theme" in diff.summary()
+
+
+def test_equal_snapshots_have_an_empty_diff():
+    diff = StateDiff(snapshot({"a": "1"}), snapshot({"a": "1"}))
+    
+    assert not diff
+    assert diff.summary() == "no changes"
+
+
+def test_snapshot_round_trips_through_disk(tmp_path):
+    snapshots = StateSnapshots(tmp_path)
+    snapshots.save("clean", snapshot({"a": "1"}, {"b": "2"}), persist=True)
+    
+    loaded = StateSnapshots(tmp_path)["clean"]
+    
+    assert "clean" in StateSnapshots(tmp_path)
+    assert loaded.storage("https://shop", "sessionStorage") == {"b": "2"}
+    with pytest.raises(KeyError):
+        StateSnapshots(tmp_path)["missing"]
+
+
+def test_capture_prefers_the_captured_page_and_warns_on_differing_session_storage():
+    context = FakeContext()
+    other = context.new_page("https://shop/cart.html")
+    page = context.new_page("https://shop/products.html")
+    other.session["step"] = "other"
+    page.session["step"] = "mine"
+    
+    with pytest.warns(UserWarning, match="different sessionStorage"):
+        captured = capture_state(page)
+    
+    assert captured.storage("https://shop", "sessionStorage") == {"step": "mine"}
+
+
+def test_restore_writes_session_storage_into_every_open_page():
+    context = FakeContext()
+    page = context.new_page("https://shop/products.html")
+    other = context.new_page("https://blog/post.html")
+    target = StateSnapshot([{"name": "sid", "value": "a"}], {
+        "https://shop": {"localStorage": {"cart": "[]"}, "sessionStorage": {"step": "1"}},
+        "https://blog": {"localStorage": {}, "sessionStorage": {"draft": "x"}},
+    })
+    page.session["stale"] = "y"
+    
+    restore_state(page, target)
+    
+    assert page.session == {"step": "1"} and other.session == {"draft": "x"}
+    assert context.local["https://shop"] == {"cart": "[]"}
+    assert context.cookies == [{"name": "sid", "value": "a"}]
+
+
+def test_restore_warns_when_session_storage_has_no_page_to_go_to():
+    context = FakeContext()
+    page = context.new_page("https://shop/products.html")
+    context.local["https://stale"] = {"old": "1"}
+    target = StateSnapshot([], {"https://blog": {"localStorage": {"a": "1"}, "sessionStorage": {"draft": "x"}}})
+    
+    with pytest.warns(UserWarning, match="No open page is on https://blog"):
+        restore_state(page, target)
+    
+    assert context.local["https://blog"] == {"a": "1"}
+    assert context.local["https://stale"] == {}
+    assert context.pages == [page], "the helper pages are closed again"
@@ -0,0 +1,86 @@
+"""Cart templates and the template cache of utils.cart_seeder"""
+
+import json
+import time
+
+import pytest
+
+from utils import cart_seeder
+from utils.cart_seeder import CartTemplate, CartTemplateCache
+
+
+def template(quantity_field="quantity"):
+    products = [{"id": "1", "name": "Laptop", "quantity": 1}, {"id": "2", "name": "Phone", "quantity": 1}]
+    if quantity_field is None:
+        for product in products:
+            del product["quantity"]
+    return CartTemplate("localStorage", "cart", products, "id", quantity_field)
+
+
+def test_build_cycles_through_the_catalogue():
+    cart = template().build(3)
+    
+    assert [(entry["id"], entry["quantity"]) for entry in cart] == [("1", 2), ("2", 1)]
+    assert len(template(None).build(3)) == 3
+
+
+def test_repeated_skus_become_quantities_or_repeated_entries():
+    assert template().build(["1", "1", 2]) == [
+        {"id": "1", "name": "Laptop", "quantity": 2}, {"id": "2", "name": "Phone", "quantity": 1},
+    ]
+    assert [entry["id"] for entry in template(None).build(["1", "1"])] == ["1", "1"]
+    with pytest.raises(KeyError):
+        template().build(["9"])
+
+
+@pytest.fixture
+def learned(monkeypatch):
+    """Replaces the browser passes: records learn calls, validates per the `valid` flag"""
+    calls = {"learn": 0, "valid": True}
+    
+    def learn(browser, site_url, context_args=None):
+        calls["learn"] += 1
+        return template()
+    
+    monkeypatch.setattr(cart_seeder, "learn_cart_template", learn)
+    monkeypatch.setattr(cart_seeder, "validate_cart_template", lambda *args, **kwargs: calls["valid"])
+    return calls
+
+
+def test_stored_template_is_reused_while_the_shop_accepts_it(tmp_path, learned):
+    path = tmp_path / "carts.json"
+    CartTemplateCache(path).get(None, "https://shop")
+    
+    cached = CartTemplateCache(path).get(None, "https://shop")
+    
+    assert learned["learn"] == 1
+    assert cached.to_dict() == template().to_dict()
+
+
+def test_stored_template_is_relearned_when_validation_fails(tmp_path, learned):
+    path = tmp_path / "carts.json"
+    CartTemplateCache(path).get(None, "https://shop")
+    learned["valid"] = False
+    
+    CartTemplateCache(path).get(None, "https://shop")
+    
+    assert learned["learn"] == 2
+
+
+def test_saving_keeps_templates_other_workers_stored(tmp_path, learned):
+    path = tmp_path / "carts.json"
+    first, second = CartTemplateCache(path), CartTemplateCache(path)
+    
+    first.get(None, "https://a")
+    second.get(None, "https://b")
+    
+    assert set(json.loads(path.read_text())) == {"https://a", "https://b"}
+
+
+def test_expired_entries_are_learned_again_and_dropped(tmp_path, learned):
+    path = tmp_path / "carts.json"
+    path.write_text(json.dumps({"https://old": {"learned_at": time.time() - 10, "template": template().to_dict()}}))
+    
+    CartTemplateCache(path, ttl_seconds=5).get(None, "https://shop")
+    
+    assert set(json.loads(path.read_text())) == {"https://shop"}
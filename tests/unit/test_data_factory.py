@@ -0,0 +1,63 @@
+"""Seeded generation of utils.data_factory"""
+
+import pytest
+
+from utils.data_factory import NAMESPACE_WIDTH, SEQUENCE_WIDTH, DataFactory, _join
+
+
+def test_same_seed_reproduces_the_same_data():
+    first, second = DataFactory("run:test_a"), DataFactory("run:test_a")
+    
+    assert first.users(5) == second.users(5)
+    assert first.email() == second.email()
+
+
+def test_different_seeds_get_different_namespaces():
+    assert DataFactory("run:test_a").namespace != DataFactory("run:test_b").namespace
+    assert len(DataFactory("run:test_a").namespace) == NAMESPACE_WIDTH
+
+
+def test_emails_are_distinct_within_and_across_batches():
+    factory = DataFactory("run:test_a")
+    emails = factory.emails(50_000) + factory.emails(10)
+    
+    assert len(set(emails)) == len(emails)
+    assert all(email.startswith("test_") and email.endswith("@test.com") for email in emails)
+
+
+def test_sequence_widens_past_its_fixed_width():
+    factory = DataFactory("run:test_a")
+    factory._sequence = 36 ** SEQUENCE_WIDTH - 1
+    
+    (short,) = factory.unique_tokens(1)
+    (wide,) = factory.unique_tokens(1)
+    
+    assert short.endswith("zzzzz") and wide.endswith("100000")
+    assert len(wide) == len(short) + 1
+
+
+def test_passwords_contain_every_character_class():
+    for password in DataFactory("run:test_a").passwords(200, length=8):
+        assert len(password) == 8
+        assert any(c.isupper() for c in password) and any(c.islower() for c in password)
+        assert any(c.isdigit() for c in password) and any(c in "!@#$%&*?" for c in password)
+
+
+def test_short_passwords_are_rejected():
+    with pytest.raises(ValueError):
+        DataFactory("run:test_a").passwords(1, length=3)
+
+
+def test_pooled_values_are_handed_out_once():
+    factory = DataFactory("run:test_a", pool_size=4)
+    
+    emails = [factory.email() for _ in range(10)]
+    
+    assert len(set(emails)) == 10
+
+
+def test_join_decodes_non_ascii_constants():
+    factory = DataFactory("run:test_a")
+    
+    assert factory.emails(2, domain="bücher.de")[0].endswith("@bücher.de")
+    assert _join(0, "x") == []
@@ -0,0 +1,149 @@
+"""LPT planning, history and work stealing of utils.duration_scheduler"""
+
+import json
+
+from utils.duration_scheduler import DEFAULT_DURATION, DurationHistory, DurationScheduling, lpt_partition
+
+
+class FakeConfig:
+    def __init__(self, workers):
+        self.workers = workers
+    
+    def getvalue(self, name):
+        return ["popen"] * self.workers if name == "tx" else None
+    
+    def getoption(self, name):
+        return None
+
+
+class FakeGateway:
+    def __init__(self, gateway_id):
+        self.id = gateway_id
+
+
+class FakeNode:
+    def __init__(self, gateway_id):
+        self.gateway = FakeGateway(gateway_id)
+        self.shutting_down = False
+        self.sent = []
+    
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+    
+    def shutdown(self):
+        self.shutting_down = True
+
+
+class FakeHistory:
+    def __init__(self, durations, failed=()):
+        self.durations = durations
+        self.failed = set(failed)
+    
+    def expected(self, nodeid):
+        return self.durations[nodeid]
+    
+    def recently_failed(self, nodeid):
+        return nodeid in self.failed
+
+
+def make_scheduler(durations, workers=2, failed=()):
+    scheduler = DurationScheduling(FakeConfig(workers), log=None, history=FakeHistory(durations, failed))
+    scheduler.log = lambda *args: None
+    nodes = [FakeNode(f"gw{i}") for i in range(workers)]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, list(durations))
+    scheduler.schedule()
+    return scheduler, nodes
+
+
+def finish(scheduler, node, count=1):
+    """Report the oldest `count` tests of node as done, like DSession does"""
+    for _ in range(count):
+        scheduler.mark_test_complete(node, scheduler.node2pending[node][0])
+
+
+def test_lpt_partition_balances_longest_first():
+    plan = lpt_partition([(0, 5), (1, 4), (2, 3), (3, 3), (4, 2), (5, 1)], 2)
+    
+    assert plan == [[0, 3, 5], [1, 2, 4]]
+    assert [sum({0: 5, 1: 4, 2: 3, 3: 3, 4: 2, 5: 1}[i] for i in items) for items in plan] == [9, 9]
+
+
+def test_lpt_partition_puts_failed_items_first():
+    plan = lpt_partition([(0, 9), (1, 1), (2, 1)], 2, first=[1, 2])
+    
+    assert plan[0][0] == 1 and plan[1][0] == 2
+
+
+def test_history_smooths_durations_and_remembers_failures(tmp_path):
+    path = tmp_path / "durations.json"
+    first = DurationHistory(path)
+    first.add_report("t::a", 2.0, False)
+    first.add_report("t::a", 2.0, True)
+    first.save()
+    
+    second = DurationHistory(path)
+    assert second.expected("t::a") == 4.0
+    assert second.recently_failed("t::a")
+    assert second.expected("t::new") == 4.0, "unknown tests get the median"
+    second.add_report("t::a", 2.0, False)
+    second.save()
+    
+    data = json.loads(path.read_text())
+    assert data["run"] == 2
+    assert data["tests"]["t::a"] == {"duration": 3.0, "failed_run": 1}
+
+
+def test_history_without_file_uses_default_duration(tmp_path):
+    history = DurationHistory(tmp_path / "missing.json")
+    
+    assert history.expected("t::a") == DEFAULT_DURATION
+    assert not history.recently_failed("t::a")
+
+
+def test_failures_age_out_after_the_configured_runs(tmp_path):
+    path = tmp_path / "durations.json"
+    path.write_text(json.dumps({"run": 4, "tests": {"t::a": {"duration": 1.0, "failed_run": 1}}}))
+    
+    assert DurationHistory(path, failed_runs=3).recently_failed("t::a") is False
+    assert DurationHistory(path, failed_runs=4).recently_failed("t::a") is True
+
+
+def test_scheduler_sends_two_tests_per_worker_from_its_plan():
+    scheduler, (gw0, gw1) = make_scheduler({"a": 5, "b": 4, "c": 3, "d": 3, "e": 2, "f": 1})
+    
+    assert gw0.sent == [0, 3] and gw1.sent == [1, 2]
+    finish(scheduler, gw0)
+    assert gw0.sent == [0, 3, 5]
+
+
+def test_idle_worker_steals_cheapest_test_of_the_busiest():
+    scheduler, (gw0, gw1) = make_scheduler({"a": 10, "b": 1, "c": 1, "d": 1, "e": 1, "f": 1})
+    
+    # gw0's plan is just a, so its second slot is taken from the end of gw1's queue
+    assert gw0.sent == [0, 5] and gw1.sent == [1, 2]
+    finish(scheduler, gw0)
+    assert gw0.sent == [0, 5, 4]
+    finish(scheduler, gw1, 2)
+    assert gw1.sent == [1, 2, 3]
+    assert not scheduler.pending and gw1.shutting_down
+    finish(scheduler, gw0)
+    assert gw0.shutting_down
+
+
+def test_dead_worker_hands_its_queue_to_the_others():
+    scheduler, (gw0, gw1) = make_scheduler({"a": 4, "b": 3, "c": 2, "d": 1, "e": 1, "f": 1})
+    queued = list(scheduler.node2queue[gw1])
+    
+    crashed = scheduler.remove_node(gw1)
+    
+    assert crashed == "b"
+    finish(scheduler, gw0, 2)
+    assert set(queued) <= set(gw0.sent)
+
+
+def test_recently_failed_tests_run_first():
+    scheduler, (gw0, gw1) = make_scheduler({"a": 5, "b": 4, "c": 3, "d": 1}, failed=["d"])
+    
+    assert gw0.sent[0] == 3
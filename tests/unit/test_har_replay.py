@@ -0,0 +1,125 @@
+"""Request matching and replay of utils.har_replay"""
+
+import base64
+import json
+
+import pytest
+
+from utils.har_replay import HarArchive, HarRouter
+
+
+def record(archive, url, content, method="GET", body=None, status=200):
+    archive.record(method, url, {}, body, status, "OK", {"content-type": "text/plain"}, content, 5.0)
+
+
+def served(entry):
+    return base64.b64decode(entry["response"]["content"]["text"])
+
+
+class FakeRequest:
+    def __init__(self, url, method="GET", body=None):
+        self.url = url
+        self.method = method
+        self.post_data_buffer = body
+        self.headers = {}
+
+
+class FakeRoute:
+    def __init__(self, url, method="GET", body=None):
+        self.request = FakeRequest(url, method, body)
+        self.outcome = None
+    
+    def fulfill(self, status, headers, body):
+        self.outcome = ("fulfilled", status, body)
+    
+    def abort(self, error_code):
+        self.outcome = ("aborted", error_code)
+    
+    def fallback(self):
+        self.outcome = ("fallback",)
+
+
+def test_lookup_matches_method_url_and_body(tmp_path):
+    archive = HarArchive(tmp_path / "m.har")
+    record(archive, "https://api/items", b"get")
+    record(archive, "https://api/items", b"post a", method="POST", body=b"a")
+    record(archive, "https://api/items", b"post b", method="POST", body=b"b")
+    
+    assert served(archive.lookup("GET", "https://api/items", None)) == b"get"
+    assert served(archive.lookup("POST", "https://api/items", b"b")) == b"post b"
+    assert archive.lookup("DELETE", "https://api/items", None) is None
+    # An unrecorded body falls back to the loose match on method and path
+    assert served(archive.lookup("POST", "https://api/items", b"c")) == b"post a"
+
+
+def test_repeated_requests_replay_in_order_then_repeat_the_last(tmp_path):
+    archive = HarArchive(tmp_path / "m.har")
+    record(archive, "https://api/poll", b"1")
+    record(archive, "https://api/poll", b"2")
+    
+    answers = [served(archive.lookup("GET", "https://api/poll", None)) for _ in range(3)]
+    
+    assert answers == [b"1", b"2", b"2"]
+
+
+def test_query_string_is_ignored_when_there_is_no_exact_match(tmp_path):
+    archive = HarArchive(tmp_path / "m.har")
+    record(archive, "https://cdn/app.js?v=1", b"js")
+    
+    assert served(archive.lookup("GET", "https://cdn/app.js?v=2", None)) == b"js"
+    assert archive.lookup("GET", "https://cdn/other.js?v=1", None) is None
+
+
+def test_rerecording_replaces_entries_from_earlier_runs(tmp_path):
+    path = tmp_path / "m.har"
+    old = HarArchive(path)
+    record(old, "https://api/a", b"old")
+    record(old, "https://api/b", b"kept")
+    old.save()
+    
+    new = HarArchive(path)
+    record(new, "https://api/a", b"new 1")
+    record(new, "https://api/a", b"new 2")
+    
+    assert [served(e) for e in new.entries] == [b"kept", b"new 1", b"new 2"]
+
+
+def test_save_merges_entries_saved_by_another_worker(tmp_path):
+    path = tmp_path / "m.har"
+    first, second = HarArchive(path), HarArchive(path)
+    record(first, "https://api/a", b"a")
+    record(second, "https://api/b", b"b")
+    
+    first.save()
+    second.save()
+    
+    urls = [e["request"]["url"] for e in json.loads(path.read_text())["log"]["entries"]]
+    assert sorted(urls) == ["https://api/a", "https://api/b"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.parametrize("policy, outcome", [
+    ("fail", ("aborted", "internetdisconnected")),
+    ("passthrough", ("fallback",)),
+])
+def test_replay_serves_hits_and_applies_the_miss_policy(tmp_path, policy, outcome):
+    archive = HarArchive(tmp_path / "m.har")
+    record(archive, "https://api/a", b"a", status=201)
+    router = HarRouter(archive, mode="replay", miss_policy=policy)
+    hit, miss = FakeRoute("https://api/a"), FakeRoute("https://api/missing")
+    
+    router._handle(hit)
+    router._handle(miss)
+    
+    assert hit.outcome == ("fulfilled", 201, b"a")
+    assert miss.outcome == outcome
+    assert router.hits == 1 and router.misses == ["GET https://api/missing"]
+    assert router.failing_misses is (policy == "fail")
+
+
+def test_invalid_mode_or_policy_is_rejected(tmp_path):
+    archive = HarArchive(tmp_path / "m.har")
+    with pytest.raises(ValueError):
+        HarRouter(archive, mode="playback")
+    with pytest.raises(ValueError):
+        HarRouter(archive, miss_policy="ignore")
@@ -0,0 +1,128 @@
+"""Dependency graph and test selection of utils.impact"""
+
+import textwrap
+
+from utils.impact import RUN_ALL, SymbolIndex, select_tests
+
+
+PAGES = '''
+class LoginPageLocators:
+    EMAIL = "#email"
+    PASSWORD = "#password"
+
+
+class BasePage:
+    def __init__(self, page):
+        self.page = page
+    
+    def wait(self):
+        return self.page
+
+
+class LoginPage(BasePage, LoginPageLocators):
+    def login(self, email):
+        self.page.fill(self.EMAIL, email)
+        self.wait()
+    
+    def reset(self):
+        self.page.fill(self.PASSWORD, "")
+'''
+
+CONFTEST = '''
+import pytest
+from pages.login_page import LoginPage
+
+
+@pytest.fixture
+def login_page(page) -> LoginPage:
+    return LoginPage(page)
+
+
+@pytest.fixture(autouse=True)
+def tidy():
+    yield
+'''
+
+TESTS = '''
+from pages.login_page import LoginPage
+
+
+def test_login(login_page):
+    login_page.login("a@b.c")
+
+
+def test_reset(page):
+    LoginPage(page).reset()
+
+
+class TestUnrelated:
+    def test_title(self, page):
+        assert page.title()
+'''
+
+
+def build_index():
+    index = SymbolIndex()
+    index.add_module("pages/login_page.py", textwrap.dedent(PAGES))
+    index.add_module("tests/conftest.py", textwrap.dedent(CONFTEST))
+    index.add_module("tests/test_login.py", textwrap.dedent(TESTS))
+    return index
+
+
+def test_locator_change_selects_only_tests_using_the_page_object():
+    selected = select_tests(build_index(), {"pages.login_page.LoginPageLocators.EMAIL"})
+    
+    # Class attributes come with every instance, so both LoginPage tests are affected
+    assert set(selected) == {"tests/test_login.py::test_login", "tests/test_login.py::test_reset"}
+
+
+def test_fixture_return_annotation_links_methods_called_on_its_value():
+    selected = select_tests(build_index(), {"pages.login_page.LoginPage.login"})
+    
+    assert set(selected) == {"tests/test_login.py::test_login"}
+
+
+def test_inherited_method_reaches_callers_through_self():
+    selected = select_tests(build_index(), {"pages.login_page.BasePage.wait"})
+    
+    assert set(selected) == {"tests/test_login.py::test_login"}
+
+
+def test_constructor_change_reaches_every_instantiating_test():
+    selected = select_tests(build_index(), {"pages.login_page.BasePage.__init__"})
+    
+    assert set(selected) == {"tests/test_login.py::test_login", "tests/test_login.py::test_reset"}
+
+
+def test_autouse_fixture_change_selects_every_test():
+    selected = select_tests(build_index(), {"tests.conftest.tidy"})
+    
+    assert len(selected) == 3
+    assert "tests/test_login.py::TestUnrelated::test_title" in selected
+
+
+def test_unreached_change_in_a_used_module_runs_everything():
+    index = SymbolIndex()
+    index.add_module("pages/login_page.py", textwrap.dedent(PAGES) + "\n\ndef orphan():\n    pass\n")
+    index.add_module("pages/unused.py", "def helper():\n    pass\n")
+    index.add_module("tests/conftest.py", textwrap.dedent(CONFTEST))
+    index.add_module("tests/test_login.py", textwrap.dedent(TESTS))
+    
+    # The graph may have missed a caller of orphan, but nothing uses pages.unused at all
+    assert select_tests(index, {"pages.login_page.orphan"}) is None
+    assert select_tests(index, {"pages.unused.helper"}) == {}
+
+
+def test_run_all_marker_returns_none():
+    assert select_tests(build_index(), {RUN_ALL}) is None
+
+
+def test_symbols_at_maps_lines_to_innermost_symbol():
+    index = build_index()
+    source = textwrap.dedent(PAGES).splitlines()
+    login_line = next(i for i, line in enumerate(source, 1) if "def login" in line)
+    email_line = next(i for i, line in enumerate(source, 1) if 'EMAIL = ' in line)
+    
+    assert index.symbols_at("pages.login_page", [login_line + 1]) == {"pages.login_page.LoginPage.login"}
+    assert index.symbols_at("pages.login_page", [email_line]) == {"pages.login_page.LoginPageLocators.EMAIL"}
+    assert "pages.login_page.<module>" in index.symbols_at("pages.login_page", [1])
@@ -0,0 +1,171 @@
+"""Keep/drop decisions and cost accounting of utils.recording.Recorder"""
+
+from pathlib import Path
+
+import pytest
+
+from utils import recording
+from utils.recording import Recorder, RecordingCalibration
+
+
+class FakeTracing:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.started = False
+        self.stopped_with = "not stopped"
+    
+    def start(self, **options):
+        self.started = True
+    
+    def stop(self, path=None):
+        self.stopped_with = path
+        if self.fail:
+            raise RuntimeError("tracing.stop failed")
+        if path:
+            Path(path).write_bytes(b"zip")
+
+
+class FakeVideo:
+    def save_as(self, path):
+        Path(path).write_bytes(b"webm")
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.video = FakeVideo()
+
+
+class FakeContext:
+    page_class = FakePage
+    
+    def __init__(self, tracing_fails: bool = False, video: bool = False):
+        self.tracing = FakeTracing(tracing_fails)
+        self.video = video
+        self.closed = False
+        self._listeners = []
+    
+    def on(self, event, callback):
+        self._listeners.append(callback)
+    
+    def new_page(self):
+        page = self.page_class(self)
+        for callback in self._listeners:
+            callback(page)
+        return page
+    
+    def close(self):
+        self.closed = True
+
+
+def _recorded(tmp_path, video_mode, trace_mode, **context_options):
+    recorder = Recorder("tests/test_x.py::test_y", video_mode, trace_mode,
+                        videos_dir=tmp_path / "videos", traces_dir=tmp_path / "traces")
+    recorder.context_args()
+    context = FakeContext(**context_options)
+    recorder.start(context)
+    context.new_page()
+    return recorder, context
+
+
+@pytest.mark.parametrize("mode, failed, kept", [
+    ("on", False, True),
+    ("on", True, True),
+    ("retain-on-failure", False, False),
+    ("retain-on-failure", True, True),
+])
+def test_finish_keeps_or_drops_video_and_trace(tmp_path, mode, failed, kept):
+    recorder, context = _recorded(tmp_path, mode, mode)
+    
+    artifacts = recorder.finish(failed=failed)
+    
+    assert context.closed
+    assert set(artifacts) == ({"video", "trace"} if kept else set())
+    for path in artifacts.values():
+        assert path.exists()
+    if not kept:
+        assert context.tracing.stopped_with is None, "a dropped trace is stopped without a path"
+        assert not (tmp_path / "videos").exists()
+
+
+def test_off_modes_record_nothing(tmp_path):
+    recorder = Recorder("t", "off", "off")
+    
+    assert not recorder.active
+    assert recorder.context_args() == {}
+
+
+def test_finish_cleans_up_when_tracing_stop_fails(tmp_path):
+    recorder, context = _recorded(tmp_path, "retain-on-failure", "on", tracing_fails=True)
+    video_dir = Path(recorder._video_dir)
+    
+    with pytest.raises(RuntimeError):
+        recorder.finish(failed=False)
+    
+    assert context.closed
+    assert not video_dir.exists()
+
+
+def test_rejects_unknown_mode_and_preset():
+    with pytest.raises(ValueError):
+        Recorder("t", video_mode="sometimes")
+    with pytest.raises(ValueError):
+        Recorder("t", preset="ultra")
+
+
+def test_cost_includes_calibrated_in_test_share():
+    recorder = Recorder("t", "on")
+    recorder.overhead_seconds = 0.5
+    
+    # 10 s recorded at a 25% slowdown: 2 s of it is recording
+    assert recorder.cost_seconds(10.0, slowdown=0.25) == pytest.approx(2.5)
+    assert recorder.overhead_percent(10.0, slowdown=0.25) == pytest.approx(25.0)
+    assert recorder.overhead_percent(0.0, slowdown=0.25) == 0.0
+
+
+class FakeClock:
+    """Stands in for utils.recording's time module; only clicks advance it"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def perf_counter(self):
+        return self.now
+
+
+class FakeCalibrationPage(FakePage):
+    clock = None
+    
+    def set_content(self, html):
+        pass
+    
+    def click(self, selector):
+        recorded = self.context.tracing.started or self.context.video
+        self.clock.now += 0.002 if recorded else 0.001
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = 0
+    
+    def new_context(self, **options):
+        self.contexts += 1
+        context = FakeContext(video="record_video_dir" in options)
+        context.page_class = FakeCalibrationPage
+        return context
+
+
+def test_calibration_measures_recorded_slowdown_once_per_settings(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(recording, "time", clock)
+    monkeypatch.setattr(FakeCalibrationPage, "clock", clock)
+    browser = FakeBrowser()
+    calibration = RecordingCalibration(browser)
+    
+    slowdown = calibration.slowdown(Recorder("a", "off", "on"))
+    calibration.slowdown(Recorder("b", "off", "retain-on-failure"))
+    
+    assert slowdown == pytest.approx(1.0), "recorded clicks take twice as long"
+    assert browser.contexts == 2, "one plain and one recorded run, then cached"
+    assert calibration.slowdown(Recorder("c", "on", "off")) == pytest.approx(1.0)
+    assert browser.contexts == 4
@@ -0,0 +1,96 @@
+"""Size catalog and request classification of utils.resource_blocker"""
+
+import json
+
+from utils.resource_blocker import ResourceBlocker, ResourceSizeCatalog
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class FakeResponse:
+    def __init__(self, url, resource_type, length):
+        self.url = url
+        self.request = FakeRequest(url, resource_type)
+        self.headers = {"content-length": str(length)} if length is not None else {}
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = FakeRequest(url, resource_type)
+        self.outcome = None
+    
+    def fulfill(self, **options):
+        self.outcome = "stubbed"
+    
+    def abort(self, error_code):
+        self.outcome = "blocked"
+    
+    def fallback(self):
+        self.outcome = "continued"
+
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+        self.listeners = []
+    
+    def route(self, pattern, handler):
+        self.routes.append(handler)
+    
+    def on(self, event, callback):
+        self.listeners.append(callback)
+
+
+def test_catalog_learns_asset_sizes_from_content_length():
+    catalog = ResourceSizeCatalog()
+    catalog.learn(FakeResponse("https://cdn/a.png", "image", 2048))
+    catalog.learn(FakeResponse("https://api/x", "xhr", 100))
+    catalog.learn(FakeResponse("https://cdn/b.js", "script", None))
+    
+    assert catalog.size_of("https://cdn/a.png") == 2048
+    assert catalog.size_of("https://api/x") is None
+    assert catalog.size_of("https://cdn/b.js") is None
+
+
+def test_catalog_save_merges_with_other_workers(tmp_path):
+    path = tmp_path / "sizes.json"
+    first, second = ResourceSizeCatalog(path), ResourceSizeCatalog(path)
+    first.learn(FakeResponse("https://cdn/a.png", "image", 10))
+    second.learn(FakeResponse("https://cdn/b.png", "image", 20))
+    
+    first.save()
+    second.save()
+    
+    assert json.loads(path.read_text()) == {"https://cdn/a.png": 10, "https://cdn/b.png": 20}
+
+
+def test_blocker_counts_avoided_bytes_and_unsized_requests():
+    catalog = ResourceSizeCatalog()
+    catalog.learn(FakeResponse("https://cdn/hero.png", "image", 5000))
+    blocker = ResourceBlocker(blocked_types=["font"], blocked_domains=["tracker.com"],
+                              stubbed_types=["image"], catalog=catalog)
+    
+    outcomes = []
+    for url, resource_type in [("https://cdn/hero.png", "image"), ("https://cdn/f.woff2", "font"),
+                               ("https://www.tracker.com/t.js", "script"), ("https://shop/app.js", "script")]:
+        route = FakeRoute(url, resource_type)
+        blocker._handle(route)
+        outcomes.append(route.outcome)
+    
+    assert outcomes == ["stubbed", "blocked", "blocked", "continued"]
+    stats = blocker.stats()
+    assert (stats["stubbed"], stats["blocked"], stats["unsized"]) == (1, 2, 2)
+    assert 0 < stats["bytes_avoided"] < 5000, "the stub's own bytes are subtracted"
+
+
+def test_disabled_blocker_attaches_nothing_unless_learning():
+    context = FakeContext()
+    ResourceBlocker().attach(context)
+    assert context.routes == [] and context.listeners == []
+    
+    ResourceBlocker(learn_sizes=True).attach(context)
+    assert context.routes == [] and len(context.listeners) == 1
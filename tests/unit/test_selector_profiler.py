@@ -0,0 +1,48 @@
+"""Union splitting, lint and never-matching report of utils.selector_profiler"""
+
+import pytest
+
+from utils.selector_profiler import LocatorConstant, collect_locators, lint_locators, never_matching, split_alternatives
+
+
+@pytest.mark.parametrize("selector, alternatives", [
+    ("#email", ["#email"]),
+    ('a[href="/"], .logo, img[alt*="logo"]', ['a[href="/"]', ".logo", 'img[alt*="logo"]']),
+    ('button:has-text("Yes, accept"), #accept', ['button:has-text("Yes, accept")', "#accept"]),
+    ("div:is(.a, .b) > span, p", ["div:is(.a, .b) > span", "p"]),
+    ("[data-x='a,b'], [data-y]", ["[data-x='a,b']", "[data-y]"]),
+    (r"[title='it\'s, ok'], .x", [r"[title='it\'s, ok']", ".x"]),
+    (" .a ,, .b , ", [".a", ".b"]),
+])
+def test_split_alternatives_only_splits_top_level_commas(selector, alternatives):
+    assert split_alternatives(selector) == alternatives
+
+
+def test_lint_flags_duplicates_text_engine_and_bare_tags():
+    locator = LocatorConstant("HomeLocators", "LOGO", 'img, .logo, text=Home, .logo, a:has-text("Home")')
+    
+    issues = {(issue["issue"], issue["alternative"]) for issue in lint_locators([locator])}
+    
+    assert issues == {("broad", "img"), ("duplicate", ".logo"), ("text-engine", "text=Home"),
+                      ("text-engine", 'a:has-text("Home")')}
+
+
+def test_never_matching_needs_a_miss_on_every_page():
+    rows = [
+        {"url": "a", "locator": "L.X", "alternative": ".x", "count": 0},
+        {"url": "b", "locator": "L.X", "alternative": ".x", "count": 1},
+        {"url": "a", "locator": "L.X", "alternative": ".y", "count": 0},
+        {"url": "b", "locator": "L.X", "alternative": ".y", "count": None},
+        {"url": "a", "locator": "L.X", "alternative": None, "count": 0},
+    ]
+    
+    assert never_matching(rows) == ["L.X: .y"]
+
+
+def test_collect_locators_finds_page_object_constants_once():
+    locators = collect_locators()
+    names = [locator.qualified_name for locator in locators]
+    
+    assert names == sorted(set(names))
+    assert all("\n" not in locator.selector for locator in locators)
+    assert any(name.startswith("LoginPageLocators.") for name in names)
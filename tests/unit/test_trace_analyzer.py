@@ -0,0 +1,109 @@
+"""Phase attribution and hot-spot ranking of utils.trace_analyzer"""
+
+import json
+import zipfile
+
+import pytest
+
+from utils.trace_analyzer import HotSpots, Trace, _merge, _overlap, _phase_of, analyze_traces
+
+
+def event(kind, **fields):
+    # The type comes first, as in Playwright's traces - the reader only looks at the line start
+    return json.dumps({"type": kind, **fields}, separators=(",", ":"))
+
+
+def write_trace(path, title="test_login"):
+    trace = [
+        event("context-options", title=title),
+        event("before", callId="call@1", apiName="page.goto", method="goto", startTime=0,
+              params={"url": "https://shop/"}),
+        event("log", callId="call@1", time=10, message="navigating to \"https://shop/\""),
+        event("after", callId="call@1", endTime=100),
+        event("frame-snapshot", snapshot={"html": "x" * 1000}),
+        event("before", callId="call@2", apiName="locator.click", method="click", startTime=150,
+              params={"selector": "#submit"}),
+        event("log", callId="call@2", time=150, message="waiting for locator('#submit')"),
+        event("log", callId="call@2", time=200, message="  element is visible, enabled and stable"),
+        event("after", callId="call@2", endTime=250, error={"message": "Timeout"}),
+        '{"type":"before","callId":"call@3","apiName":"page.fi',
+    ]
+    network = [
+        event("resource-snapshot", snapshot={"_monotonicTime": 20, "time": 40,
+                                             "request": {"url": "https://shop/"}, "response": {"status": 200}}),
+    ]
+    stacks = {
+        "files": ["/repo/pages/base_page.py", "/repo/pages/login_page.py", "/repo/tests/test_login.py"],
+        "stacks": [
+            [1, [[2, 10, 1, "test_login"]]],
+            [2, [[0, 40, 1, "click"], [1, 12, 1, "login"], [2, 11, 1, "test_login"]]],
+        ],
+    }
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("trace.trace", "\n".join(trace))
+        archive.writestr("trace.network", "\n".join(network))
+        archive.writestr("trace.stacks", json.dumps(stacks))
+    return path
+
+
+@pytest.mark.parametrize("message, phase", [
+    ("waiting for locator('#a')", "actionability"),
+    ("  retrying click action, attempt #2", "actionability"),
+    ("  <div> intercepts pointer events", "actionability"),
+    ("  element is visible, enabled and stable", "action"),
+    ("  navigations have been finished", "action"),
+    ("  waiting until \"load\"", "navigation"),
+    ("  performing click action", "action"),
+])
+def test_call_log_messages_map_to_phases(message, phase):
+    assert _phase_of(message) == phase
+
+
+def test_overlap_counts_merged_request_time_once():
+    merged = _merge([(0, 10), (5, 20), (30, 40)])
+    starts = [start for start, _ in merged]
+    
+    assert merged == [(0, 20), (30, 40)]
+    assert _overlap(merged, starts, 10, 35) == 15
+    assert _overlap(merged, starts, 20, 30) == 0
+
+
+def test_trace_splits_calls_into_phases(tmp_path):
+    trace = Trace.load(write_trace(tmp_path / "trace.zip"))
+    goto, click = trace.actions
+    
+    assert trace.title == "test_login"
+    assert len(trace.actions) == 2, "the truncated call without an end is dropped"
+    assert goto.breakdown == {"python": 0.0, "actionability": 0.0, "navigation": 60.0, "network": 40.0,
+                              "action": 0.0}
+    assert goto.requests == 1
+    assert click.breakdown == {"python": 50.0, "actionability": 50.0, "navigation": 0.0, "network": 0.0,
+                               "action": 50.0}
+    assert click.error == "Timeout"
+
+
+def test_calls_are_attributed_to_the_outermost_page_object_method(tmp_path):
+    goto, click = Trace.load(write_trace(tmp_path / "trace.zip")).actions
+    
+    assert (click.caller, click.location) == ("login", "/repo/pages/login_page.py:12")
+    assert goto.caller == "test_login", "without a page-object frame the test itself is the caller"
+
+
+def test_hot_spots_sum_over_traces_and_rank_by_total(tmp_path):
+    write_trace(tmp_path / "a.zip", "test_a")
+    write_trace(tmp_path / "b.zip", "test_b")
+    (tmp_path / "broken.zip").write_bytes(b"not a zip")
+    
+    hotspots = analyze_traces([tmp_path], by="method", root=None)
+    report = hotspots.to_dict()
+    
+    assert report["traces"] == 2
+    assert [row["method"] for row in report["hotspots"]] == ["login", "test_login"]
+    login = report["hotspots"][0]
+    assert (login["calls"], login["total_ms"], login["errors"], login["tests"]) == (2, 300.0, 2, 2)
+    assert "login" in hotspots.format()
+
+
+def test_unknown_grouping_is_rejected():
+    with pytest.raises(ValueError):
+        HotSpots(by="file")
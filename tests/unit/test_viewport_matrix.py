@@ -0,0 +1,81 @@
+"""Target resolution, skips and outcomes of utils.viewport_matrix"""
+
+import pytest
+
+from utils.test_data import TestData
+from utils.viewport_matrix import ViewportMatrix
+
+DEVICES = {
+    "Phone": {"viewport": {"width": 390, "height": 844}, "is_mobile": True, "default_browser_type": "webkit"},
+    "Laptop": {"viewport": {"width": 1280, "height": 800}, "is_mobile": False},
+}
+
+
+class FakeBrowserType:
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeContext:
+    def __init__(self, options):
+        self.options = options
+        self.closed = False
+    
+    def new_page(self):
+        return self
+    
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, name="chromium"):
+        self.browser_type = FakeBrowserType(name)
+        self.contexts = []
+    
+    def new_context(self, **options):
+        context = FakeContext(options)
+        self.contexts.append(context)
+        return context
+
+
+def test_targets_resolve_to_context_options():
+    matrix = ViewportMatrix(FakeBrowser(), DEVICES)
+    
+    assert matrix.resolve("mobile") == ("mobile", {"viewport": TestData.VIEWPORTS["mobile"]})
+    assert "default_browser_type" not in matrix.resolve("Phone")[1]
+    assert matrix.resolve(("custom", {"viewport": None})) == ("custom", {"viewport": None})
+    with pytest.raises(KeyError):
+        matrix.resolve("Toaster")
+
+
+def test_each_target_gets_its_own_context_with_shared_args():
+    browser = FakeBrowser()
+    matrix = ViewportMatrix(browser, DEVICES, {"base_url": "https://x", "viewport": {"width": 1, "height": 1}})
+    
+    result = matrix.run(lambda page, name: page.options["viewport"]["width"], ["mobile", "Laptop"])
+    
+    assert [o["result"] for o in result.outcomes] == [TestData.VIEWPORTS["mobile"]["width"], 1280]
+    assert all(c.closed and c.options["base_url"] == "https://x" for c in browser.contexts)
+
+
+def test_failures_are_collected_per_target():
+    def check(page, name):
+        assert name != "Laptop", "too wide"
+    
+    result = ViewportMatrix(FakeBrowser(), DEVICES).run(check, ["mobile", "Laptop"])
+    
+    assert [o["name"] for o in result.failures] == ["Laptop"]
+    with pytest.raises(AssertionError, match="1 of 2 viewport"):
+        result.assert_all()
+
+
+def test_mobile_devices_are_skipped_on_firefox():
+    browser = FakeBrowser("firefox")
+    
+    result = ViewportMatrix(browser, DEVICES).run(lambda page, name: True, ["Phone", "Laptop"])
+    
+    assert result["Phone"]["skipped"] and result["Laptop"]["result"] is True
+    assert len(browser.contexts) == 1
+    result.assert_all()
+    assert "skipped: is_mobile" in result.summary()
@@ -0,0 +1,95 @@
+"""Tiled YIQ comparison of utils.visual_diff"""
+
+import numpy as np
+import pytest
+
+from utils import visual_diff
+from utils.visual_diff import VisualBaselines, compare_images, load_image, save_image
+
+
+def blank(height=64, width=64, value=255):
+    return np.full((height, width, 3), value, dtype=np.uint8)
+
+
+def test_identical_images_pass_without_heatmap():
+    result = compare_images(blank(), blank(), tile=16)
+    
+    assert result.passed
+    assert (result.diff_pixels, result.tiles_checked, result.tiles_total) == (0, 16, 16)
+    assert result.heatmap is None
+
+
+def test_differences_below_tolerance_are_ignored():
+    actual = blank()
+    actual[10:20, 10:20] = 250
+    
+    assert compare_images(actual, blank(), tolerance=0.1, max_diff_pixels=0).passed
+    assert not compare_images(actual, blank(), tolerance=0.0, max_diff_pixels=0).passed
+
+
+def test_changed_pixels_are_counted_against_the_budget():
+    actual = blank()
+    actual[0:10, 0:10] = 0
+    
+    result = compare_images(actual, blank(), max_diff_pixels=99, tile=16, early_exit=False)
+    
+    assert result.diff_pixels == 100
+    assert not result.passed
+    assert "100 differing pixels, budget 99" in result.summary()
+
+
+def test_masked_regions_are_excluded_from_count_and_area():
+    actual = blank()
+    actual[0:10, 0:10] = 0
+    
+    result = compare_images(actual, blank(), masks=[(0, 0, 10, 10)], max_diff_pixels=0)
+    
+    assert result.passed
+    assert result.compared_pixels == 64 * 64 - 100
+
+
+def test_scan_stops_at_the_first_tile_over_budget():
+    actual = blank(value=0)
+    
+    result = compare_images(actual, blank(), max_diff_pixels=10, tile=16)
+    
+    assert result.early_exit
+    assert result.tiles_checked == 1
+    assert result.diff_pixels == 16 * 16
+
+
+def test_size_change_fails_with_reason():
+    result = compare_images(blank(32, 32), blank(64, 64))
+    
+    assert not result.passed
+    assert result.summary().startswith("Size changed: 64x64 -> 32x32")
+
+
+def test_heatmap_is_only_built_when_read(monkeypatch):
+    calls = []
+    build = visual_diff._heatmap
+    monkeypatch.setattr(visual_diff, "_heatmap", lambda *args: calls.append(args) or build(*args))
+    actual = blank()
+    actual[0:4, 0:4] = 0
+    
+    result = compare_images(actual, blank(), max_diff_pixels=0, tile=16)
+    assert calls == []
+    
+    heat = result.heatmap
+    assert result.heatmap is heat and len(calls) == 1
+    assert tuple(heat[0, 0]) == (255, 0, 0), "black on white is drawn full red"
+    assert tuple(heat[-1, -1]) == (63, 63, 63), "unchanged pixels are dimmed to grey"
+
+
+def test_baselines_create_then_fail_with_artifacts(tmp_path):
+    baselines = VisualBaselines(tmp_path / "baselines", tmp_path / "artifacts", max_diff_pixels=0)
+    save_image(blank(), tmp_path / "first.png")
+    changed = blank()
+    changed[0:4, 0:4] = 0
+    save_image(changed, tmp_path / "second.png")
+    
+    assert baselines.check("home", (tmp_path / "first.png").read_bytes()).passed
+    assert baselines.baseline_path("home").exists()
+    with pytest.raises(AssertionError, match="Visual regression in 'home'"):
+        baselines.check("home", (tmp_path / "second.png").read_bytes())
+    assert load_image(tmp_path / "artifacts" / "home-diff.png").shape == (64, 64, 3)
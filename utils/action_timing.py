@@ -0,0 +1,247 @@
+"""Opt-in per-action timing for page objects and helpers
+
+Wraps every public BasePage/page-object method and utils.helpers function and
+records, per call, its wall time, the number of browser round-trips it made
+and how much of it was spent waiting.
+"""
+
+import functools
+import inspect
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+_round_trips = 0
+_connection_patched = False
+
+
+def _patch_connection() -> bool:
+    """Count protocol messages sent to the Playwright driver
+    
+    Relies on a private Playwright method; if it moves, round-trips are reported as None.
+    """
+    global _connection_patched
+    if _connection_patched:
+        return True
+    try:
+        from playwright._impl._connection import Connection
+        original = Connection._send_message_to_server
+    except (ImportError, AttributeError):
+        return False
+    
+    @functools.wraps(original)
+    def counting_send(self, *args, **kwargs):
+        global _round_trips
+        _round_trips += 1
+        return original(self, *args, **kwargs)
+    
+    Connection._send_message_to_server = counting_send
+    _connection_patched = True
+    return True
+
+
+def _is_wait(name: str) -> bool:
+    return name.rsplit(".", 1)[-1].startswith(("wait_for", "expect_"))
+
+
+class _TimedBlock:
+    """Times a `with page_object.expect_...():` block from enter to exit"""
+    
+    def __init__(self, timer: "ActionTimer", name: str, inner):
+        self._timer = timer
+        self._name = name
+        self._inner = inner
+    
+    def __enter__(self):
+        self._start = time.perf_counter()
+        self._trips = _round_trips
+        self._timer._depth += 1
+        return self._inner.__enter__()
+    
+    def __exit__(self, *exc):
+        exit_start = time.perf_counter()
+        try:
+            return self._inner.__exit__(*exc)
+        finally:
+            end = time.perf_counter()
+            self._timer._depth -= 1
+            self._timer._record(self._name, (end - self._start) * 1000, _round_trips - self._trips,
+                                (end - exit_start) * 1000)
+
+
+class ActionTimer:
+    """Collects call records for the currently running test"""
+    
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self.counts_round_trips = False
+        self._depth = 0
+        self._originals: List[tuple] = []
+    
+    def _record(self, name: str, wall_ms: float, round_trips: int, wait_ms: float):
+        self.records.append({
+            "name": name,
+            "wall_ms": round(wall_ms, 3),
+            "round_trips": round_trips if self.counts_round_trips else None,
+            "wait_ms": round(wait_ms, 3),
+            "depth": self._depth,
+        })
+    
+    def wrap(self, func: Callable, name: str) -> Callable:
+        """Wrap a function so each call is timed"""
+        timer = self
+        
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            trips = _round_trips
+            timer._depth += 1
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                timer._depth -= 1
+            if _is_wait(name) and hasattr(result, "__enter__") and hasattr(result, "__exit__"):
+                return _TimedBlock(timer, name, result)
+            wall_ms = (time.perf_counter() - start) * 1000
+            timer._record(name, wall_ms, _round_trips - trips, wall_ms if _is_wait(name) else 0.0)
+            return result
+        
+        timed.__timed__ = True
+        return timed
+    
+    def instrument_class(self, cls: type):
+        """Wrap the public methods a class defines itself"""
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") or not inspect.isfunction(value) or getattr(value, "__timed__", False):
+                continue
+            if inspect.iscoroutinefunction(value):
+                continue
+            self._originals.append((cls, attr, value))
+            setattr(cls, attr, self.wrap(value, f"{cls.__name__}.{attr}"))
+    
+    def instrument_module(self, module, namespaces: Iterable = ()):
+        """Wrap a module's public functions, also rebinding them in other namespaces
+        
+        namespaces are modules that re-export the same function objects (e.g. the utils package).
+        """
+        prefix = module.__name__.rsplit(".", 1)[-1]
+        for attr, value in list(vars(module).items()):
+            if attr.startswith("_") or not inspect.isfunction(value) or value.__module__ != module.__name__:
+                continue
+            if inspect.iscoroutinefunction(value):
+                continue
+            timed = self.wrap(value, f"{prefix}.{attr}")
+            for namespace in (module, *namespaces):
+                if getattr(namespace, attr, None) is value:
+                    self._originals.append((namespace, attr, value))
+                    setattr(namespace, attr, timed)
+    
+    def install(self, classes: Iterable[type], modules: Iterable = (), namespaces: Iterable = ()):
+        """Instrument page-object classes and helper modules"""
+        self.counts_round_trips = _patch_connection()
+        for cls in classes:
+            self.instrument_class(cls)
+        for module in modules:
+            self.instrument_module(module, namespaces)
+    
+    def uninstall(self):
+        """Restore every wrapped attribute"""
+        for owner, attr, original in reversed(self._originals):
+            setattr(owner, attr, original)
+        self._originals.clear()
+    
+    def start_test(self):
+        self.records = []
+        self._depth = 0
+    
+    def finish_test(self) -> List[Dict[str, Any]]:
+        records, self.records = self.records, []
+        return records
+
+
+def all_subclasses(cls: type) -> List[type]:
+    """cls and every (transitively) imported subclass"""
+    found = [cls]
+    for sub in cls.__subclasses__():
+        found.extend(all_subclasses(sub))
+    return found
+
+
+def write_test_timings(directory: Path, nodeid: str, records: List[Dict[str, Any]], duration: float):
+    """Write one test's records as JSON"""
+    directory.mkdir(parents=True, exist_ok=True)
+    safe_name = re.sub(r"[^\w.-]+", "_", nodeid)[-180:]
+    payload = {"test": nodeid, "duration_s": round(duration, 3), "calls": records}
+    (directory / f"{safe_name}.json").write_text(json.dumps(payload, indent=2))
+
+
+def _with_self_times(calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Each call with its children's time and round-trips subtracted
+    
+    Calls are recorded when they finish, so a call's children are the records at
+    depth + 1 that precede it since the last record at its own depth or above.
+    """
+    children: Dict[int, Dict[str, float]] = {}
+    result = []
+    for call in calls:
+        depth = call.get("depth", 0)
+        nested = children.pop(depth + 1, {})
+        own = {
+            "wall_ms": call["wall_ms"] - nested.get("wall_ms", 0.0),
+            "wait_ms": call["wait_ms"] - nested.get("wait_ms", 0.0),
+            "round_trips": (call["round_trips"] or 0) - nested.get("round_trips", 0),
+        }
+        parent = children.setdefault(depth, {"wall_ms": 0.0, "wait_ms": 0.0, "round_trips": 0})
+        parent["wall_ms"] += call["wall_ms"]
+        parent["wait_ms"] += call["wait_ms"]
+        parent["round_trips"] += call["round_trips"] or 0
+        result.append({**call, "self": own})
+    return result
+
+
+def summarize(directory: Path, top: Optional[int] = 25) -> List[Dict[str, Any]]:
+    """Aggregate every per-test JSON in directory into per-method totals, hottest first
+    
+    wall_ms is inclusive of nested calls; self_ms, wait_ms and round_trips count only the
+    method's own share, so a page-object method calling others isn't counted twice.
+    """
+    totals: Dict[str, Dict[str, Any]] = {}
+    for path in Path(directory).glob("*.json"):
+        try:
+            calls = json.loads(path.read_text())["calls"]
+        except (OSError, ValueError, KeyError):
+            continue
+        for call in _with_self_times(calls):
+            entry = totals.setdefault(call["name"], {
+                "name": call["name"], "calls": 0, "wall_ms": 0.0, "self_ms": 0.0, "wait_ms": 0.0,
+                "round_trips": 0,
+            })
+            entry["calls"] += 1
+            entry["wall_ms"] += call["wall_ms"]
+            entry["self_ms"] += call["self"]["wall_ms"]
+            entry["wait_ms"] += call["self"]["wait_ms"]
+            entry["round_trips"] += call["self"]["round_trips"]
+    rows = sorted(totals.values(), key=lambda e: e["self_ms"], reverse=True)
+    for row in rows:
+        row["mean_ms"] = row["wall_ms"] / row["calls"]
+    return rows[:top] if top else rows
+
+
+def summary_html(rows: List[Dict[str, Any]]) -> str:
+    """Render aggregated rows as an HTML table for the pytest-html report"""
+    lines = [
+        "<h2>Action timings</h2>",
+        "<table><tr><th>Call</th><th>Calls</th><th>Self ms</th><th>Total ms</th><th>Mean ms</th>"
+        "<th>Wait ms</th><th>Round-trips</th></tr>",
+    ]
+    for row in rows:
+        lines.append(
+            f"<tr><td>{row['name']}</td><td>{row['calls']}</td><td>{row['self_ms']:.1f}</td>"
+            f"<td>{row['wall_ms']:.1f}</td><td>{row['mean_ms']:.1f}</td><td>{row['wait_ms']:.1f}</td>"
+            f"<td>{row['round_trips']}</td></tr>"
+        )
+    lines.append("</table>")
+    return "\n".join(lines)
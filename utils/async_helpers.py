@@ -0,0 +1,140 @@
+"""Async test helper functions - playwright.async_api counterparts of utils.helpers"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from playwright.async_api import BrowserContext, Page, async_playwright
+
+from utils.event_hub import ConsoleLog
+
+
+async def wait_for_page_load(page: Page, timeout: int = 30000):
+    """Wait for page to fully load"""
+    await page.wait_for_load_state("networkidle", timeout=timeout)
+
+
+async def scroll_to_element(page: Page, selector: str):
+    """Scroll to an element"""
+    await page.locator(selector).scroll_into_view_if_needed()
+
+
+async def get_element_attribute(page: Page, selector: str, attribute: str) -> str:
+    """Get an element's attribute value"""
+    return await page.locator(selector).get_attribute(attribute)
+
+
+async def is_element_present(page: Page, selector: str) -> bool:
+    """Check if element is present in DOM"""
+    return await page.locator(selector).count() > 0
+
+
+async def wait_for_element(page: Page, selector: str, timeout: int = 10000):
+    """Wait for element to be visible"""
+    await page.wait_for_selector(selector, state="visible", timeout=timeout)
+
+
+async def take_full_page_screenshot(page: Page, path: str):
+    """Take a full page screenshot"""
+    await page.screenshot(path=path, full_page=True)
+
+
+async def get_local_storage(page: Page, key: str) -> Any:
+    """Get value from local storage"""
+    return await page.evaluate("key => localStorage.getItem(key)", key)
+
+
+async def set_local_storage(page: Page, key: str, value: str):
+    """Set value in local storage"""
+    await page.evaluate("([key, value]) => localStorage.setItem(key, value)", [key, value])
+
+
+async def clear_local_storage(page: Page):
+    """Clear all local storage"""
+    await page.evaluate("localStorage.clear()")
+
+
+async def get_cookies(page: Page) -> list:
+    """Get all cookies"""
+    return await page.context.cookies()
+
+
+async def clear_cookies(page: Page):
+    """Clear all cookies"""
+    await page.context.clear_cookies()
+
+
+async def hover_element(page: Page, selector: str):
+    """Hover over an element"""
+    await page.locator(selector).hover()
+
+
+async def double_click_element(page: Page, selector: str):
+    """Double click an element"""
+    await page.locator(selector).dblclick()
+
+
+async def right_click_element(page: Page, selector: str):
+    """Right click an element"""
+    await page.locator(selector).click(button="right")
+
+
+async def select_dropdown_option(page: Page, selector: str, value: str):
+    """Select dropdown option by value"""
+    await page.locator(selector).select_option(value)
+
+
+async def upload_file(page: Page, selector: str, file_path: str):
+    """Upload a file"""
+    await page.locator(selector).set_input_files(file_path)
+
+
+def get_page_console_logs(page: Page, max_entries: int = 500) -> ConsoleLog:
+    """Collect console logs (must set up listener first)
+    
+    Keeps the last max_entries messages; the listener is removed on stop() or
+    when the page closes. Inside tests prefer the event_hub fixture.
+    """
+    return ConsoleLog(page, max_entries)
+
+
+Journey = Callable[[Page], Awaitable[Any]]
+
+
+async def run_journeys(journeys: List[Journey], browser_name: str = "chromium",
+                       concurrency: int = 10, headless: bool = True,
+                       context_args: Optional[Dict] = None) -> List[Dict[str, Any]]:
+    """Run independent user journeys concurrently on one event loop
+    
+    Each journey gets its own context and page on a shared browser. At most
+    `concurrency` journeys run at the same time.
+    
+    Returns:
+        One dict per journey with 'index', 'duration', 'result' and 'error'
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def _run(index: int, journey: Journey, context_factory) -> Dict[str, Any]:
+        async with semaphore:
+            context: BrowserContext = await context_factory()
+            start = time.perf_counter()
+            outcome = {"index": index, "result": None, "error": None}
+            try:
+                page = await context.new_page()
+                outcome["result"] = await journey(page)
+            except Exception as e:
+                outcome["error"] = repr(e)
+            finally:
+                outcome["duration"] = time.perf_counter() - start
+                await context.close()
+            return outcome
+    
+    async with async_playwright() as playwright:
+        browser = await getattr(playwright, browser_name).launch(headless=headless)
+        try:
+            context_factory = lambda: browser.new_context(**(context_args or {}))
+            return await asyncio.gather(
+                *(_run(i, journey, context_factory) for i, journey in enumerate(journeys))
+            )
+        finally:
+            await browser.close()
@@ -0,0 +1,90 @@
+"""Authenticated storage-state cache
+
+Logs in once per credential set, saves Playwright storage state to disk and
+hands the saved file to new contexts so tests skip the UI login.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from playwright.sync_api import Browser, Page
+
+
+class AuthStateCache:
+    """Disk-backed cache of logged-in storage states with expiry"""
+    
+    def __init__(self, directory: Path, ttl_seconds: int = 1800):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.directory.mkdir(parents=True, exist_ok=True)
+    
+    def path_for(self, key: str) -> Path:
+        """Get the state file path for a credential key"""
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return self.directory / f"state_{digest}.json"
+    
+    def is_fresh(self, key: str) -> bool:
+        """Check that a saved state exists, is within its TTL and has no expired cookies"""
+        path = self.path_for(key)
+        if not path.exists():
+            return False
+        if time.time() - path.stat().st_mtime > self.ttl_seconds:
+            return False
+        try:
+            state = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return False
+        now = time.time()
+        for cookie in state.get("cookies", []):
+            expires = cookie.get("expires", -1)
+            # -1 marks a session cookie, which never expires on its own
+            if 0 < expires < now:
+                return False
+        return True
+    
+    def invalidate(self, key: str):
+        """Drop the saved state for a credential key"""
+        path = self.path_for(key)
+        if path.exists():
+            path.unlink()
+    
+    def get(self, browser: Browser, key: str, login: Callable[[Page], None],
+            context_args: Optional[Dict] = None) -> str:
+        """Return a fresh storage-state file, logging in through the UI only if needed
+        
+        Args:
+            browser: Browser used to perform the one-off login
+            key: Identifies the credential set, see credential_key()
+            login: Callable that performs the login on a fresh page
+            context_args: Extra arguments for the login context
+        """
+        path = self.path_for(key)
+        if self.is_fresh(key):
+            return str(path)
+        
+        context = browser.new_context(**(context_args or {}))
+        try:
+            page = context.new_page()
+            login(page)
+            # Write atomically so parallel workers never read a partial file
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            context.storage_state(path=str(tmp_path))
+            os.replace(tmp_path, path)
+        finally:
+            context.close()
+        return str(path)
+
+
+def credential_key(user: Dict[str, str], site_url: str) -> str:
+    """Build a cache key from a user dict (test_user or TestData.VALID_USERS entry)
+    
+    A hash of the password is part of the key, so changing it logs in afresh
+    instead of reusing a session of the old credentials.
+    """
+    username = user.get("username") or user.get("email", "")
+    password = hashlib.sha256(user.get("password", "").encode("utf-8")).hexdigest()[:12]
+    return f"{username}:{password}@{site_url}"
@@ -0,0 +1,271 @@
+"""Bulk browser state snapshots
+
+Captures cookies, localStorage and sessionStorage of a context in one call,
+restores them in one call, diffs two snapshots and keeps named snapshots for
+reuse across tests. Resetting an app to a known state this way costs a few
+driver round-trips instead of a new context or a replayed UI flow.
+
+Storage values always travel as evaluate() arguments, never as JS source, so
+quotes and newlines in keys or values are safe.
+
+sessionStorage belongs to a page, not an origin, so a snapshot keeps one
+sessionStorage per origin: that of the captured page, else of the first open
+page on the origin. It can only be restored into open pages; both lossy cases
+emit a warning.
+"""
+
+import json
+import os
+import warnings
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from playwright.sync_api import BrowserContext, Page
+
+
+_READ_STORAGE_JS = """
+() => ({
+    localStorage: Object.fromEntries(Object.entries(localStorage)),
+    sessionStorage: Object.fromEntries(Object.entries(sessionStorage)),
+})
+"""
+
+_WRITE_STORAGE_JS = """
+(state) => {
+    for (const [name, values] of Object.entries(state)) {
+        const storage = window[name];
+        storage.clear();
+        for (const [key, value] of Object.entries(values)) storage.setItem(key, value);
+    }
+}
+"""
+
+_BLANK_HTML = "<!doctype html><title>state</title>"
+
+CookieKey = Tuple[str, str, str]
+
+
+def origin_of(url: str) -> Optional[str]:
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def _cookie_key(cookie: Dict[str, Any]) -> CookieKey:
+    return cookie["name"], cookie.get("domain", ""), cookie.get("path", "/")
+
+
+class StateSnapshot:
+    """Cookies plus per-origin localStorage/sessionStorage"""
+    
+    def __init__(self, cookies: List[Dict[str, Any]], origins: Dict[str, Dict[str, Dict[str, str]]]):
+        self.cookies = cookies
+        self.origins = origins
+    
+    def storage(self, origin: str, kind: str = "localStorage") -> Dict[str, str]:
+        return self.origins.get(origin, {}).get(kind, {})
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"cookies": self.cookies, "origins": self.origins}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StateSnapshot":
+        return cls(data.get("cookies", []), data.get("origins", {}))
+    
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self.to_dict(), indent=1, sort_keys=True))
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: Path) -> "StateSnapshot":
+        return cls.from_dict(json.loads(Path(path).read_text()))
+    
+    def diff(self, other: "StateSnapshot") -> "StateDiff":
+        """What changed going from this snapshot to other"""
+        return StateDiff(self, other)
+
+
+class StateDiff:
+    """Added, removed and changed cookies and storage keys between two snapshots"""
+    
+    def __init__(self, before: StateSnapshot, after: StateSnapshot):
+        old = {_cookie_key(c): c.get("value") for c in before.cookies}
+        new = {_cookie_key(c): c.get("value") for c in after.cookies}
+        self.cookies = self._compare(old, new)
+        self.storage: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for origin in sorted(set(before.origins) | set(after.origins)):
+            for kind in ("localStorage", "sessionStorage"):
+                changes = self._compare(before.storage(origin, kind), after.storage(origin, kind))
+                if any(changes.values()):
+                    self.storage[(origin, kind)] = changes
+    
+    @staticmethod
+    def _compare(old: Dict, new: Dict) -> Dict[str, Any]:
+        return {
+            "added": {k: new[k] for k in new.keys() - old.keys()},
+            "removed": {k: old[k] for k in old.keys() - new.keys()},
+            "changed": {k: (old[k], new[k]) for k in old.keys() & new.keys() if old[k] != new[k]},
+        }
+    
+    def __bool__(self) -> bool:
+        return any(self.cookies.values()) or bool(self.storage)
+    
+    def summary(self) -> str:
+        if not self:
+            return "no changes"
+        lines = []
+        for change, items in self.cookies.items():
+            for (name, domain, path) in sorted(items):
+                lines.append(f"cookie {change}: {name} ({domain}{path})")
+        for (origin, kind), changes in self.storage.items():
+            for change, items in changes.items():
+                for key in sorted(items):
+                    lines.append(f"{kind} {change}: {origin} {key}")
+        return "\n".join(lines)
+
+
+def capture_state(page: Page) -> StateSnapshot:
+    """Snapshot the page's context: cookies and localStorage of every origin, sessionStorage of open pages
+    
+    With several pages on one origin, the sessionStorage of page (or else of the
+    first of them) is kept and a warning names the origin if the others differ.
+    """
+    context = page.context
+    state = context.storage_state()
+    origins = {
+        entry["origin"]: {"localStorage": {item["name"]: item["value"] for item in entry["localStorage"]},
+                          "sessionStorage": {}}
+        for entry in state.get("origins", [])
+    }
+    # sessionStorage is per page - read it from the pages that are open, page itself first
+    read: Dict[str, Dict[str, str]] = {}
+    for open_page in [page] + [other for other in context.pages if other is not page]:
+        origin = origin_of(open_page.url)
+        if not origin:
+            continue
+        storage = open_page.evaluate(_READ_STORAGE_JS)
+        if origin not in read:
+            read[origin] = storage["sessionStorage"]
+            origins[origin] = storage
+        elif storage["sessionStorage"] != read[origin]:
+            kept = "the captured page" if origin_of(page.url) == origin else "the first page on it"
+            warnings.warn(f"Pages on {origin} have different sessionStorage; only that of {kept} is captured",
+                          stacklevel=2)
+    return StateSnapshot(state.get("cookies", []), origins)
+
+
+def _write_origin(context: BrowserContext, origin: str, state: Dict[str, Dict[str, str]]):
+    """Write storage of an origin no open page is on, through a locally fulfilled blank page
+    
+    Only localStorage survives: the blank page's sessionStorage goes with it.
+    """
+    if state.get("sessionStorage"):
+        warnings.warn(f"No open page is on {origin}; its snapshot sessionStorage "
+                      f"({len(state['sessionStorage'])} keys) is not restored", stacklevel=3)
+    page = context.new_page()
+    try:
+        page.route("**/*", lambda route: route.fulfill(status=200, content_type="text/html", body=_BLANK_HTML))
+        page.goto(f"{origin}/")
+        page.evaluate(_WRITE_STORAGE_JS, {"localStorage": state.get("localStorage", {})})
+    finally:
+        page.close()
+
+
+def restore_state(page: Page, snapshot: StateSnapshot, reload: bool = False):
+    """Make the context's cookies and storage match snapshot exactly
+    
+    Every open page gets the snapshot's storage of its origin, sessionStorage
+    included. Origins no page is on only get their localStorage back (with a
+    warning if the snapshot had sessionStorage for them).
+    
+    Args:
+        page: Page whose context is restored; its current origin is written in place
+        snapshot: State to restore
+        reload: Reload the page afterwards so the app re-reads its state
+    """
+    context = page.context
+    context.clear_cookies()
+    if snapshot.cookies:
+        context.add_cookies(snapshot.cookies)
+    
+    current = origin_of(page.url)
+    empty = {"localStorage": {}, "sessionStorage": {}}
+    written = set()
+    for open_page in [page] + [other for other in context.pages if other is not page]:
+        origin = origin_of(open_page.url)
+        if origin:
+            open_page.evaluate(_WRITE_STORAGE_JS, {**empty, **snapshot.origins.get(origin, {})})
+            written.add(origin)
+    # Origins without a page: clear what's there now, then write the snapshot's localStorage
+    present = {entry["origin"] for entry in context.storage_state().get("origins", [])}
+    for origin in sorted((present | set(snapshot.origins)) - written):
+        _write_origin(context, origin, snapshot.origins.get(origin, empty))
+    if reload and current:
+        page.reload()
+
+
+class StateSnapshots:
+    """Named snapshots, in memory and optionally on disk for other workers and runs
+    
+    Example:
+        snapshots.save("empty-cart", capture_state(page))
+        ...
+        restore_state(page, snapshots["empty-cart"], reload=True)
+    """
+    
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory) if directory else None
+        self._snapshots: Dict[str, StateSnapshot] = {}
+    
+    def _path(self, name: str) -> Path:
+        return self.directory / f"{name}.json"
+    
+    def save(self, name: str, snapshot: StateSnapshot, persist: bool = False) -> StateSnapshot:
+        self._snapshots[name] = snapshot
+        if persist and self.directory:
+            snapshot.save(self._path(name))
+        return snapshot
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._snapshots or bool(self.directory and self._path(name).exists())
+    
+    def __getitem__(self, name: str) -> StateSnapshot:
+        if name not in self._snapshots:
+            if not (self.directory and self._path(name).exists()):
+                raise KeyError(f"No state snapshot named {name!r}")
+            self._snapshots[name] = StateSnapshot.load(self._path(name))
+        return self._snapshots[name]
+
+
+class BrowserState:
+    """capture / restore / diff bound to one page and a snapshot registry"""
+    
+    def __init__(self, page: Page, snapshots: StateSnapshots):
+        self.page = page
+        self.snapshots = snapshots
+    
+    def capture(self, name: Optional[str] = None, persist: bool = False) -> StateSnapshot:
+        """Snapshot the current state, storing it under name if given"""
+        snapshot = capture_state(self.page)
+        if name:
+            self.snapshots.save(name, snapshot, persist=persist)
+        return snapshot
+    
+    def restore(self, snapshot: Union[str, StateSnapshot], reload: bool = False):
+        if isinstance(snapshot, str):
+            snapshot = self.snapshots[snapshot]
+        restore_state(self.page, snapshot, reload=reload)
+    
+    def diff(self, before: Union[str, StateSnapshot], after: Union[str, StateSnapshot, None] = None) -> StateDiff:
+        """Changes from before to after (default: the current state)"""
+        before = self.snapshots[before] if isinstance(before, str) else before
+        if after is None:
+            after = self.capture()
+        elif isinstance(after, str):
+            after = self.snapshots[after]
+        return before.diff(after)
@@ -0,0 +1,255 @@
+"""Direct cart seeding for TestShop
+
+Instead of clicking "Add to Cart" in every test, the cart format is learned
+once: a scratch context adds every product through the UI and the storage
+diff (utils.browser_state) reveals which key holds the cart and what one
+entry per product looks like. Tests then write any cart straight into
+storage with an init script that runs before the shop's own scripts, so
+cart.html renders the seeded items on first load and setup cost doesn't grow
+with the number of items.
+
+A template read back from the on-disk cache is checked once per session by
+seeding it in a scratch context and comparing #cart-count; if the shop's cart
+format changed meanwhile, it is learned again.
+"""
+
+import copy
+import json
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from playwright.sync_api import Browser, Page, TimeoutError as PlaywrightTimeoutError
+
+from pages.base_page import BasePage
+from utils.browser_state import capture_state, origin_of
+
+
+PRODUCT_BUTTONS = ".product-card .btn-primary"
+CART_COUNT = "#cart-count"
+ID_FIELDS = ("id", "sku", "productId", "product_id")
+QUANTITY_FIELDS = ("quantity", "qty", "count")
+
+_CART_COUNT_IS_JS = """
+([selector, expected]) => {
+    const el = document.querySelector(selector);
+    return !!el && el.textContent.trim() === expected;
+}
+"""
+
+# Runs on every navigation of the page but writes only once per seed call
+_SEED_CART_JS = """
+(() => {
+    const seed = %s;
+    const flag = "__cartSeeded_" + seed.id;
+    if (location.origin !== seed.origin) return;
+    try {
+        if (sessionStorage.getItem(flag)) return;
+        window[seed.storage].setItem(seed.key, seed.value);
+        sessionStorage.setItem(flag, "1");
+    } catch (e) {}  // about:blank and other opaque origins
+})();
+"""
+
+
+class CartTemplate:
+    """Where the shop keeps its cart and one stored entry per product"""
+    
+    def __init__(self, storage: str, key: str, products: List[Dict[str, Any]],
+                 id_field: Optional[str], quantity_field: Optional[str]):
+        self.storage = storage
+        self.key = key
+        self.products = products
+        self.id_field = id_field
+        self.quantity_field = quantity_field
+    
+    @property
+    def skus(self) -> List[Any]:
+        if self.id_field is None:
+            return list(range(len(self.products)))
+        return [product[self.id_field] for product in self.products]
+    
+    def entry(self, sku: Any) -> Dict[str, Any]:
+        for product, product_sku in zip(self.products, self.skus):
+            if product_sku == sku or str(product_sku) == str(sku):
+                return copy.deepcopy(product)
+        raise KeyError(f"Unknown SKU {sku!r} (known: {self.skus})")
+    
+    def build(self, items: Union[int, Iterable[Any]]) -> List[Dict[str, Any]]:
+        """Cart entries for N items (cycling through the catalogue) or a list of SKUs
+        
+        Repeated SKUs become a quantity when the shop stores one, otherwise repeated entries.
+        """
+        if isinstance(items, int):
+            skus = [self.skus[i % len(self.skus)] for i in range(items)]
+        else:
+            skus = list(items)
+        counts = Counter(skus)
+        cart = []
+        for sku in dict.fromkeys(skus):
+            entry = self.entry(sku)
+            if self.quantity_field:
+                entry[self.quantity_field] = counts[sku]
+                cart.append(entry)
+            else:
+                cart.extend(copy.deepcopy(entry) for _ in range(counts[sku]))
+        return cart
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"storage": self.storage, "key": self.key, "products": self.products,
+                "id_field": self.id_field, "quantity_field": self.quantity_field}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CartTemplate":
+        return cls(data["storage"], data["key"], data["products"], data["id_field"], data["quantity_field"])
+
+
+def _dedupe_products(entries: List[Dict[str, Any]], id_field: Optional[str]) -> List[Dict[str, Any]]:
+    if id_field is None:
+        return entries
+    seen = {}
+    for entry in entries:
+        seen.setdefault(json.dumps(entry[id_field]), entry)
+    return list(seen.values())
+
+
+def learn_cart_template(browser: Browser, site_url: str, context_args: Optional[Dict] = None) -> CartTemplate:
+    """Add every product once in a scratch context and read the cart format from the storage diff"""
+    context = browser.new_context(**(context_args or {}))
+    try:
+        page = context.new_page()
+        page.on("dialog", lambda dialog: dialog.accept())
+        page.goto(f"{site_url}/products.html")
+        before = capture_state(page)
+        buttons = page.locator(PRODUCT_BUTTONS)
+        for index in range(buttons.count()):
+            with BasePage(page).expect_text_change(CART_COUNT):
+                buttons.nth(index).click()
+        diff = before.diff(capture_state(page))
+    finally:
+        context.close()
+    
+    for (origin, storage), changes in diff.storage.items():
+        candidates = {**changes["added"], **{k: new for k, (_, new) in changes["changed"].items()}}
+        for key, value in candidates.items():
+            try:
+                entries = json.loads(value)
+            except (TypeError, ValueError):
+                continue
+            if isinstance(entries, list) and entries and all(isinstance(e, dict) for e in entries):
+                id_field = next((f for f in ID_FIELDS if f in entries[0]), None)
+                quantity_field = next((f for f in QUANTITY_FIELDS if f in entries[0]), None)
+                products = _dedupe_products(entries, id_field)
+                if quantity_field:
+                    for product in products:
+                        product[quantity_field] = 1
+                return CartTemplate(storage, key, products, id_field, quantity_field)
+    raise RuntimeError(f"Could not find a JSON cart in storage after adding products on {site_url}: "
+                       f"{diff.summary()}")
+
+
+def validate_cart_template(browser: Browser, site_url: str, template: CartTemplate,
+                           context_args: Optional[Dict] = None, timeout: int = 5000) -> bool:
+    """Seed two distinct products in a scratch context and check the shop counts them on first load"""
+    skus = template.skus[:2]
+    context = browser.new_context(**(context_args or {}))
+    try:
+        page = context.new_page()
+        CartSeeder(page, site_url, template)(skus)
+        page.goto(f"{site_url}/products.html")
+        page.wait_for_function(_CART_COUNT_IS_JS, arg=[CART_COUNT, str(len(skus))], timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+    finally:
+        context.close()
+
+
+class CartTemplateCache:
+    """Learned cart templates per site, kept on disk so workers and later runs skip the UI pass
+    
+    Entries older than the TTL are ignored and dropped on the next write. A stored
+    template is validated before its first use in a session and re-learned if the
+    shop no longer reads it.
+    """
+    
+    def __init__(self, path: Path, ttl_seconds: int = 24 * 3600):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._templates: Dict[str, CartTemplate] = {}
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Stored entries still within the TTL"""
+        try:
+            stored = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        now = time.time()
+        return {
+            key: entry for key, entry in stored.items()
+            if isinstance(entry, dict) and now - entry.get("learned_at", 0) < self.ttl_seconds
+        }
+    
+    def get(self, browser: Browser, site_url: str, context_args: Optional[Dict] = None,
+            key: Optional[str] = None) -> CartTemplate:
+        """Template of the site, learned through the UI if no fresh one is stored
+        
+        Args:
+            browser: Browser for the scratch context
+            site_url: Base URL of the shop
+            context_args: Extra new_context() arguments for the scratch context
+            key: Cache key, defaults to site_url; pass something stable (such as the served
+                directory) when the URL changes between runs, like a local server's port
+        """
+        key = key or site_url
+        if key in self._templates:
+            return self._templates[key]
+        stored = self._load().get(key)
+        template = CartTemplate.from_dict(stored["template"]) if stored else None
+        if template is not None and not validate_cart_template(browser, site_url, template, context_args):
+            print(f"\n🛒 Stored cart format for {key} no longer matches the shop - learning it again")
+            template = None
+        if template is None:
+            template = learn_cart_template(browser, site_url, context_args)
+            self._save(key, template)
+        self._templates[key] = template
+        return template
+    
+    def _save(self, key: str, template: CartTemplate):
+        """Write one template, keeping what other workers stored meanwhile"""
+        stored = self._load()
+        stored[key] = {"learned_at": time.time(), "template": template.to_dict()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(stored, indent=1))
+        os.replace(tmp_path, self.path)
+
+
+class CartSeeder:
+    """Writes carts for one test's page
+    
+    Example:
+        cart = seed_cart(3)                 # first three products
+        cart = seed_cart(["1", "1", "4"])   # chosen SKUs, repeats become quantities
+        page.goto(f"{testshop_url}/cart.html")
+    """
+    
+    def __init__(self, page: Page, site_url: str, template: CartTemplate):
+        self.page = page
+        self.origin = origin_of(site_url)
+        self.template = template
+        self._seeds = 0
+    
+    def __call__(self, items: Union[int, Iterable[Any]] = 1) -> List[Dict[str, Any]]:
+        cart = self.template.build(items)
+        self._seeds += 1
+        seed = {"id": self._seeds, "origin": self.origin, "storage": self.template.storage,
+                "key": self.template.key, "value": json.dumps(cart)}
+        script = _SEED_CART_JS % json.dumps(seed)
+        self.page.add_init_script(script)
+        # Already on the shop: write now as well, the next navigation renders it
+        if origin_of(self.page.url) == self.origin:
+            self.page.evaluate(script)
+        return cart
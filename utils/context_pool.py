@@ -0,0 +1,152 @@
+"""Worker-level pool of warm browser contexts
+
+Creating and tearing down a BrowserContext is a large share of a short test's
+cost. The pool keeps a few contexts alive per worker, resets them between
+tests and recycles them after a number of uses or past a JS heap threshold.
+Contexts that got state no reset can undo (init scripts, exposed bindings,
+extra headers, geolocation) are recycled instead of reused.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from playwright.sync_api import Browser, BrowserContext, Page
+
+
+# Served instead of the real origin while clearing its storage
+_BLANK_HTML = "<!doctype html><html><body></body></html>"
+
+# Context methods whose effect outlives _reset(); calling one marks the context for recycling
+STICKY_METHODS = ("add_init_script", "expose_binding", "expose_function", "set_extra_http_headers", "set_geolocation")
+
+
+class PooledContext:
+    """A context checked out of the pool together with its fresh page"""
+    
+    def __init__(self, context: BrowserContext):
+        self.context = context
+        self.page: Optional[Page] = None
+        self.uses = 0
+        # Names of the sticky methods called on the context so far
+        self.sticky: Set[str] = set()
+        for name in STICKY_METHODS:
+            setattr(context, name, self._tracked(name, getattr(context, name)))
+    
+    def _tracked(self, name: str, method: Callable) -> Callable:
+        def tracked(*args: Any, **kwargs: Any) -> Any:
+            self.sticky.add(name)
+            return method(*args, **kwargs)
+        return tracked
+
+
+class ContextPool:
+    """Keeps warm contexts per worker and resets them between tests"""
+    
+    def __init__(self, browser: Browser, context_args: Optional[Dict] = None, size: int = 2,
+                 max_uses: int = 25, max_heap_mb: Optional[float] = None):
+        self.browser = browser
+        self.context_args = context_args or {}
+        self.size = size
+        self.max_uses = max_uses
+        self.max_heap_mb = max_heap_mb
+        self.created = 0
+        self.recycled = 0
+        self._idle: List[PooledContext] = []
+        for _ in range(size):
+            self._idle.append(self._create())
+    
+    def _create(self) -> PooledContext:
+        pooled = PooledContext(self.browser.new_context(**self.context_args))
+        pooled.page = pooled.context.new_page()
+        self.created += 1
+        return pooled
+    
+    def acquire(self) -> PooledContext:
+        """Check out a clean context with a fresh page"""
+        pooled = self._idle.pop() if self._idle else self._create()
+        pooled.uses += 1
+        return pooled
+    
+    def release(self, pooled: PooledContext, discard: bool = False):
+        """Return a context to the pool, recycling it if it is worn out
+        
+        Args:
+            pooled: Context previously returned by acquire()
+            discard: Force recycling (e.g. after a failed test)
+        """
+        if discard or self._should_recycle(pooled):
+            self.recycled += 1
+            self._retire(pooled)
+            if len(self._idle) < self.size:
+                self._idle.append(self._create())
+            return
+        try:
+            self._reset(pooled)
+        except Exception:
+            # A context that can't be reset cleanly is not worth reusing
+            self._retire(pooled)
+            pooled = self._create()
+        if len(self._idle) < self.size:
+            self._idle.append(pooled)
+        else:
+            self._retire(pooled)
+    
+    def close(self):
+        """Close every idle context"""
+        while self._idle:
+            self._retire(self._idle.pop())
+    
+    def _should_recycle(self, pooled: PooledContext) -> bool:
+        if pooled.sticky or pooled.uses >= self.max_uses:
+            return True
+        if self.max_heap_mb and pooled.page and not pooled.page.is_closed():
+            return self._heap_mb(pooled.page) > self.max_heap_mb
+        return False
+    
+    @staticmethod
+    def _heap_mb(page: Page) -> float:
+        """Used JS heap in MB (Chromium only; 0 elsewhere)"""
+        try:
+            used = page.evaluate("() => (performance.memory && performance.memory.usedJSHeapSize) || 0")
+        except Exception:
+            return 0.0
+        return used / (1024 * 1024)
+    
+    def _reset(self, pooled: PooledContext):
+        """Clear cookies, storage, routes and pages so the next test starts clean"""
+        context = pooled.context
+        # Pages carry test listeners, viewport changes and dialogs - replace them
+        for page in list(context.pages):
+            page.close()
+        context.unroute_all(behavior="ignoreErrors")
+        context.clear_cookies()
+        context.clear_permissions()
+        context.set_offline(False)
+        
+        page = context.new_page()
+        self._clear_origin_storage(context, page)
+        pooled.page = page
+    
+    @staticmethod
+    def _clear_origin_storage(context: BrowserContext, page: Page):
+        """Clear localStorage of every origin the context touched
+        
+        sessionStorage lives per page, so closing the old pages already dropped it.
+        """
+        origins = [entry["origin"] for entry in context.storage_state().get("origins", [])]
+        if not origins:
+            return
+        # Fulfil the origins locally so clearing them costs no network round-trip
+        page.route("**/*", lambda route: route.fulfill(status=200, content_type="text/html", body=_BLANK_HTML))
+        try:
+            for origin in origins:
+                page.goto(origin)
+                page.evaluate("() => localStorage.clear()")
+        finally:
+            page.unroute_all(behavior="ignoreErrors")
+        page.goto("about:blank")
+    
+    def _retire(self, pooled: PooledContext):
+        try:
+            pooled.context.close()
+        except Exception:
+            pass
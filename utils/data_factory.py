@@ -0,0 +1,186 @@
+"""Reproducible, collision-free test data in bulk
+
+Every factory is seeded from a string (the run's DATA_SEED plus the test id
+or worker id). Records are generated in vectorised NumPy batches and handed
+out from pools, so millions of rows cost about a second.
+
+Unique values (emails) embed two tokens: a namespace hashed from the seed
+and a per-factory sequence number. One factory never repeats a value; two
+factories only can if their seeds hash to the same 56-bit namespace, which
+for a thousand test seeds in a run has odds of about 1 in 10^11. Nothing is
+coordinated between workers. Reusing a seed reproduces exactly the same data
+for a replay.
+"""
+
+import hashlib
+import secrets
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+import numpy as np
+
+
+_BASE36 = np.frombuffer(b"0123456789abcdefghijklmnopqrstuvwxyz", dtype=np.uint8)
+_LOWER = np.frombuffer(b"abcdefghijklmnopqrstuvwxyz", dtype=np.uint8)
+_UPPER = np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype=np.uint8)
+_DIGITS = np.frombuffer(b"0123456789", dtype=np.uint8)
+_SYMBOLS = np.frombuffer(b"!@#$%&*?", dtype=np.uint8)
+_ALNUM = np.concatenate([_LOWER, _UPPER, _DIGITS])
+_LOWER_ALNUM = np.concatenate([_LOWER, _DIGITS])
+
+FIRST_NAMES = np.array([
+    "Ada", "Alan", "Alex", "Anna", "Ben", "Carla", "Chen", "Dana", "David", "Elena",
+    "Emma", "Felix", "Grace", "Hana", "Ivan", "Jana", "Jonas", "Kai", "Lea", "Liam",
+    "Lina", "Luca", "Maria", "Max", "Mia", "Noah", "Omar", "Paula", "Rosa", "Sam",
+    "Sara", "Tom", "Uma", "Vera", "Yusuf", "Zoe",
+])
+LAST_NAMES = np.array([
+    "Bauer", "Becker", "Costa", "Fischer", "Garcia", "Hoffmann", "Ito", "Jansen", "Kim", "Klein",
+    "Kowalski", "Lopez", "Martin", "Meyer", "Muller", "Nguyen", "Novak", "Okafor", "Patel", "Richter",
+    "Rossi", "Schmidt", "Schulz", "Silva", "Smith", "Tanaka", "Wagner", "Weber", "Wolf", "Young",
+])
+
+NAMESPACE_BYTES = 7  # 56-bit hash of the seed
+NAMESPACE_WIDTH = 11  # base36 digits that hold it
+SEQUENCE_WIDTH = 5   # grows automatically past 36**5 values
+
+
+def new_seed() -> str:
+    return secrets.token_hex(6)
+
+
+def _digest(seed: str, size: int) -> int:
+    return int.from_bytes(hashlib.blake2b(seed.encode(), digest_size=size).digest(), "big")
+
+
+def _base36(values: np.ndarray, width: int) -> np.ndarray:
+    """Fixed-width base36 digits of each value as an (n, width) byte matrix"""
+    digits = np.empty((len(values), width), dtype=np.uint8)
+    remaining = values.astype(np.int64)
+    for column in range(width - 1, -1, -1):
+        digits[:, column] = _BASE36[remaining % 36]
+        remaining //= 36
+    return digits
+
+
+def _join(n: int, *parts) -> List[str]:
+    """Concatenate byte matrices and constant strings row-wise into n Python strings
+    
+    Constants are UTF-8 encoded; rows are decoded in bulk while everything is ASCII.
+    """
+    columns = []
+    ascii_only = True
+    for part in parts:
+        if isinstance(part, str):
+            encoded = part.encode("utf-8")
+            ascii_only = ascii_only and len(encoded) == len(part)
+            part = np.broadcast_to(np.frombuffer(encoded, dtype=np.uint8), (n, len(encoded)))
+        columns.append(part)
+    rows = np.ascontiguousarray(np.concatenate(columns, axis=1))
+    values = rows.view(f"S{rows.shape[1]}").ravel()
+    if ascii_only:
+        return values.astype(str).tolist()
+    return [value.decode("utf-8") for value in values.tolist()]
+
+
+class DataFactory:
+    """Seeded generator of unique emails, names, passwords and users
+    
+    Example:
+        factory = DataFactory("a1b2c3:tests/test_testshop.py::test_signup")
+        user = factory.user()                # from a pre-generated pool
+        emails = factory.emails(1_000_000)   # one vectorised batch, all distinct
+    """
+    
+    def __init__(self, seed: Optional[str] = None, pool_size: int = 256):
+        self.seed = seed or new_seed()
+        self.pool_size = pool_size
+        self.rng = np.random.default_rng(_digest(self.seed, 16))
+        namespace = np.array([_digest(self.seed, NAMESPACE_BYTES)], dtype=np.int64)
+        self.namespace = _base36(namespace, NAMESPACE_WIDTH).tobytes().decode()
+        self._sequence = 0
+        self._pools: Dict[tuple, Deque] = {}
+    
+    def _take_sequence(self, n: int) -> np.ndarray:
+        start = self._sequence
+        self._sequence += n
+        return np.arange(start, start + n, dtype=np.int64)
+    
+    def _random_chars(self, n: int, length: int, alphabet: np.ndarray) -> np.ndarray:
+        return alphabet[self.rng.integers(0, len(alphabet), size=(n, length))]
+    
+    def unique_tokens(self, n: int) -> List[str]:
+        """Short lowercase tokens, distinct within the factory and (by namespace) across seeds"""
+        return _join(n, self.namespace, self._sequence_digits(n))
+    
+    def _sequence_digits(self, n: int) -> np.ndarray:
+        sequence = self._take_sequence(n)
+        width = SEQUENCE_WIDTH
+        while 36 ** width <= sequence[-1]:
+            width += 1
+        return _base36(sequence, width)
+    
+    def emails(self, n: int, domain: str = "test.com", prefix: str = "test") -> List[str]:
+        """n distinct addresses like test_k3x9q<namespace><sequence>@test.com"""
+        if n <= 0:
+            return []
+        return _join(n, f"{prefix}_", self._random_chars(n, 5, _LOWER_ALNUM), self.namespace,
+                     self._sequence_digits(n), f"@{domain}")
+    
+    def strings(self, n: int, length: int = 10) -> List[str]:
+        """n random alphanumeric strings (not guaranteed distinct)"""
+        if n <= 0:
+            return []
+        return _join(n, self._random_chars(n, length, _ALNUM))
+    
+    def passwords(self, n: int, length: int = 12) -> List[str]:
+        """Passwords with at least one upper, lower, digit and symbol each"""
+        if n <= 0:
+            return []
+        if length < 4:
+            raise ValueError("Passwords need at least 4 characters")
+        chars = np.concatenate([
+            self._random_chars(n, 1, _UPPER),
+            self._random_chars(n, 1, _LOWER),
+            self._random_chars(n, 1, _DIGITS),
+            self._random_chars(n, 1, _SYMBOLS),
+            self._random_chars(n, length - 4, _ALNUM),
+        ], axis=1)
+        # Shuffle each row so the required classes don't sit at fixed positions
+        order = np.argsort(self.rng.random((n, length)), axis=1)
+        return _join(n, np.take_along_axis(chars, order, axis=1))
+    
+    def names(self, n: int) -> List[str]:
+        if n <= 0:
+            return []
+        first = FIRST_NAMES[self.rng.integers(0, len(FIRST_NAMES), size=n)]
+        last = LAST_NAMES[self.rng.integers(0, len(LAST_NAMES), size=n)]
+        return [f"{a} {b}" for a, b in zip(first.tolist(), last.tolist())]
+    
+    def users(self, n: int, domain: str = "test.com") -> List[Dict[str, str]]:
+        """n user records with distinct emails"""
+        return [
+            {"name": name, "email": email, "password": password}
+            for name, email, password in zip(self.names(n), self.emails(n, domain), self.passwords(n))
+        ]
+    
+    def _from_pool(self, key: tuple, refill):
+        pool = self._pools.get(key)
+        if not pool:
+            pool = self._pools[key] = deque(refill(self.pool_size))
+        return pool.popleft()
+    
+    def email(self, domain: str = "test.com") -> str:
+        return self._from_pool(("email", domain), lambda n: self.emails(n, domain))
+    
+    def string(self, length: int = 10) -> str:
+        return self._from_pool(("string", length), lambda n: self.strings(n, length))
+    
+    def password(self, length: int = 12) -> str:
+        return self._from_pool(("password", length), lambda n: self.passwords(n, length))
+    
+    def name(self) -> str:
+        return self._from_pool(("name",), self.names)
+    
+    def user(self, domain: str = "test.com") -> Dict[str, str]:
+        return self._from_pool(("user", domain), lambda n: self.users(n, domain))
@@ -0,0 +1,208 @@
+"""Duration-aware scheduling for pytest-xdist workers
+
+Records how long every test took across runs and, when running with
+`pytest -n WORKERS`, hands each worker a longest-processing-time-first share
+of the suite instead of xdist's collection-order chunks. Tests that failed in
+one of the last few runs are scheduled before everything else. A worker that
+runs dry steals the shortest queued tests of the busiest worker, so bad
+estimates can't leave workers idle.
+"""
+
+import json
+import os
+import statistics
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+import pytest
+
+try:
+    from xdist.scheduler import LoadScheduling
+except ImportError:  # pytest-xdist is optional - without it only durations are recorded
+    LoadScheduling = object
+
+
+DEFAULT_DURATION = 1.0
+# Weight of the newest run in the moving average of a test's duration
+SMOOTHING = 0.5
+
+
+class DurationHistory:
+    """Smoothed per-test durations and recent failures, persisted as JSON"""
+    
+    def __init__(self, path: Path, failed_runs: int = 3):
+        self.path = Path(path)
+        self.failed_runs = failed_runs
+        self.run = 0
+        self.tests: Dict[str, Dict] = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+                self.run, self.tests = data["run"], data["tests"]
+            except (OSError, ValueError, KeyError):
+                pass
+        self.run += 1
+        known = [entry["duration"] for entry in self.tests.values()]
+        self.median = statistics.median(known) if known else DEFAULT_DURATION
+        self._current: Dict[str, Dict] = {}
+    
+    def expected(self, nodeid: str) -> float:
+        """Expected duration, the median of known tests for new ones"""
+        entry = self.tests.get(nodeid)
+        return entry["duration"] if entry else self.median
+    
+    def recently_failed(self, nodeid: str) -> bool:
+        entry = self.tests.get(nodeid)
+        return bool(entry and entry.get("failed_run") and self.run - entry["failed_run"] <= self.failed_runs)
+    
+    def add_report(self, nodeid: str, duration: float, failed: bool):
+        """Add one phase (setup/call/teardown) of a test of this run"""
+        current = self._current.setdefault(nodeid, {"duration": 0.0, "failed": False})
+        current["duration"] += duration
+        current["failed"] = current["failed"] or failed
+    
+    def save(self):
+        """Fold this run into the history and write it"""
+        if not self._current:
+            return
+        for nodeid, current in self._current.items():
+            entry = self.tests.get(nodeid)
+            if entry:
+                entry["duration"] = SMOOTHING * current["duration"] + (1 - SMOOTHING) * entry["duration"]
+            else:
+                entry = self.tests[nodeid] = {"duration": current["duration"]}
+            if current["failed"]:
+                entry["failed_run"] = self.run
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"run": self.run, "tests": self.tests}, indent=1, sort_keys=True))
+        os.replace(tmp_path, self.path)
+
+
+def lpt_partition(costs: List[Tuple[int, float]], bins: int,
+                  first: Iterable[int] = ()) -> List[List[int]]:
+    """Longest-processing-time-first bin packing
+    
+    Args:
+        costs: (item, expected duration) pairs
+        bins: Number of workers
+        first: Items placed before all others (spread over the bins first)
+    
+    Returns:
+        One list of items per bin, each in the order it should run
+    """
+    first = set(first)
+    ordered = sorted(costs, key=lambda c: (c[0] not in first, -c[1]))
+    loads = [0.0] * bins
+    plan: List[List[int]] = [[] for _ in range(bins)]
+    for item, cost in ordered:
+        target = min(range(bins), key=loads.__getitem__)
+        plan[target].append(item)
+        loads[target] += cost
+    return plan
+
+
+class DurationScheduling(LoadScheduling):
+    """xdist scheduler running an LPT plan per node, with work stealing"""
+    
+    def __init__(self, config, log=None, history: Optional[DurationHistory] = None):
+        super().__init__(config, log)
+        self.history = history
+        self.node2queue: Dict[object, Deque[int]] = {}
+        self.orphans: Deque[int] = deque()
+    
+    def _cost(self, index: int) -> float:
+        return self.history.expected(self.collection[index])
+    
+    def schedule(self):
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+        
+        self.collection = list(self.node2collection.values())[0]
+        self.pending[:] = range(len(self.collection))
+        if not self.collection:
+            return
+        failed = [i for i, nodeid in enumerate(self.collection) if self.history.recently_failed(nodeid)]
+        plan = lpt_partition([(i, self._cost(i)) for i in self.pending], len(self.nodes), first=failed)
+        for node, items in zip(self.nodes, plan):
+            self.node2queue[node] = deque(items)
+            self.log(f"{node.gateway.id}: {len(items)} tests, ~{sum(map(self._cost, items)):.1f}s planned")
+        for node in self.nodes:
+            self.check_schedule(node)
+    
+    def _next_for(self, node) -> Optional[int]:
+        if self.orphans:
+            return self.orphans.popleft()
+        queue = self.node2queue.get(node)
+        if queue:
+            return queue.popleft()
+        # Steal the cheapest queued test from the worker with the most work left
+        busiest = max(self.node2queue.values(), key=lambda q: sum(map(self._cost, q)), default=None)
+        if busiest:
+            return busiest.pop()
+        return None
+    
+    def check_schedule(self, node, duration=0):
+        if node.shutting_down:
+            return
+        # Two tests in flight, so a worker never waits on the controller
+        batch = []
+        while len(self.node2pending[node]) + len(batch) < 2:
+            index = self._next_for(node)
+            if index is None:
+                break
+            batch.append(index)
+        if batch:
+            for index in batch:
+                self.pending.remove(index)
+            self.node2pending[node].extend(batch)
+            node.send_runtest_some(batch)
+        if not self.pending and not self.orphans:
+            node.shutdown()
+    
+    def mark_test_pending(self, item):
+        index = self.collection.index(item)
+        self.pending.insert(0, index)
+        self.orphans.appendleft(index)
+        for node in self.node2pending:
+            self.check_schedule(node)
+    
+    def remove_node(self, node):
+        pending = self.node2pending.pop(node)
+        queue = self.node2queue.pop(node, deque())
+        # Tests the dead node never received go back to the others
+        self.orphans.extend(queue)
+        if not pending:
+            return
+        crashitem = self.collection[pending.pop(0)]
+        self.pending.extend(pending)
+        self.orphans.extend(pending)
+        for other in self.node2pending:
+            self.check_schedule(other)
+        return crashitem
+
+
+class DurationSchedulerPlugin:
+    """Records durations on the controller and provides the xdist scheduler"""
+    
+    def __init__(self, history: DurationHistory):
+        self.history = history
+    
+    def pytest_runtest_logreport(self, report):
+        self.history.add_report(report.nodeid, report.duration, report.failed)
+    
+    def pytest_sessionfinish(self, session):
+        self.history.save()
+    
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        if LoadScheduling is object or config.getoption("dist") != "load":
+            return None
+        return DurationScheduling(config, log, history=self.history)
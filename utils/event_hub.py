@@ -0,0 +1,241 @@
+"""Per-test hub for browser console, dialog and network events
+
+One Playwright listener per event type feeds bounded ring buffers and any
+number of subscribers. Everything is detached when the test ends, so long
+sessions (pooled contexts, many subscriptions) never accumulate listeners,
+and a noisy page can't grow memory past the buffer size. Optionally every
+kept event is also streamed to a JSON-lines file.
+"""
+
+import asyncio
+import inspect
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+
+from playwright.sync_api import Page
+
+
+KINDS = ("console", "pageerror", "dialog", "request", "response", "requestfailed")
+LEVELS = ("debug", "info", "warning", "error")
+
+# Console message types by level; anything unknown counts as info
+_CONSOLE_LEVELS = {
+    "debug": "debug", "trace": "debug", "profile": "debug", "profileEnd": "debug",
+    "count": "debug", "timeEnd": "debug", "dir": "debug", "dirxml": "debug",
+    "warning": "warning",
+    "error": "error", "assert": "error",
+}
+
+
+def level_rank(level: str) -> int:
+    return LEVELS.index(level) if level in LEVELS else 1
+
+
+class Event:
+    """One recorded browser event"""
+    
+    __slots__ = ("kind", "level", "text", "timestamp", "data")
+    
+    def __init__(self, kind: str, level: str, text: str, data: Optional[Dict[str, Any]] = None):
+        self.kind = kind
+        self.level = level
+        self.text = text
+        self.timestamp = time.time()
+        self.data = data or {}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "level": self.level, "text": self.text, "timestamp": self.timestamp, **self.data}
+    
+    def __repr__(self):
+        return f"<{self.kind}:{self.level} {self.text[:80]!r}>"
+
+
+class Subscription:
+    """Handle returned by EventHub.subscribe; cancel() (or leaving the with block) detaches it"""
+    
+    def __init__(self, hub: "EventHub", kind: str, callback: Callable[[Event], Any], level: str):
+        self.hub = hub
+        self.kind = kind
+        self.callback = callback
+        self.level = level
+    
+    def cancel(self):
+        self.hub._unsubscribe(self)
+    
+    def __enter__(self) -> "Subscription":
+        return self
+    
+    def __exit__(self, *exc):
+        self.cancel()
+
+
+def _settle(result):
+    """Dialog actions are coroutines on async pages - schedule them"""
+    if inspect.isawaitable(result):
+        asyncio.ensure_future(result)
+
+
+class EventHub:
+    """Bounded event buffers and subscriptions for one page
+    
+    Example:
+        event_hub.accept_dialogs()                   # one handler, however often it's called
+        with event_hub.subscribe("console", print, level="warning"):
+            page.click("text=Checkout")
+        assert not event_hub.errors()
+    """
+    
+    def __init__(self, page: Page, capacity: int = 500, min_level: str = "debug",
+                 kinds: Iterable[str] = KINDS, stream_path: Optional[Path] = None):
+        if min_level not in LEVELS:
+            raise ValueError(f"Event level must be one of {LEVELS}, got {min_level!r}")
+        self.page = page
+        self.capacity = capacity
+        self.min_level = min_level
+        self.buffers: Dict[str, Deque[Event]] = {kind: deque(maxlen=capacity) for kind in kinds}
+        self.dropped = 0
+        self.stream_path = Path(stream_path) if stream_path else None
+        self._stream = None
+        self._subscriptions: Dict[str, List[Subscription]] = {kind: [] for kind in self.buffers}
+        self._dialog_handler: Optional[Callable] = None
+        self._listeners = []
+        handlers = {
+            "console": self._on_console,
+            "pageerror": self._on_pageerror,
+            "dialog": self._on_dialog,
+            "request": self._on_request,
+            "response": self._on_response,
+            "requestfailed": self._on_requestfailed,
+        }
+        for kind in self.buffers:
+            page.on(kind, handlers[kind])
+            self._listeners.append((kind, handlers[kind]))
+    
+    def _record(self, event: Event):
+        if level_rank(event.level) < level_rank(self.min_level):
+            return
+        buffer = self.buffers[event.kind]
+        if len(buffer) == buffer.maxlen:
+            self.dropped += 1
+        buffer.append(event)
+        if self.stream_path is not None:
+            if self._stream is None:
+                self.stream_path.parent.mkdir(parents=True, exist_ok=True)
+                self._stream = open(self.stream_path, "a", buffering=1)
+            self._stream.write(json.dumps(event.to_dict(), default=str) + "\n")
+        for subscription in list(self._subscriptions[event.kind]):
+            if level_rank(event.level) >= level_rank(subscription.level):
+                subscription.callback(event)
+    
+    def _on_console(self, msg):
+        self._record(Event("console", _CONSOLE_LEVELS.get(msg.type, "info"), msg.text, {"type": msg.type}))
+    
+    def _on_pageerror(self, error):
+        self._record(Event("pageerror", "error", str(error)))
+    
+    def _on_dialog(self, dialog):
+        self._record(Event("dialog", "info", dialog.message, {"type": dialog.type}))
+        # Playwright only auto-dismisses when nobody listens - the hub always does
+        if self._dialog_handler is None:
+            _settle(dialog.dismiss())
+        else:
+            _settle(self._dialog_handler(dialog))
+    
+    def _on_request(self, request):
+        self._record(Event("request", "debug", request.url, {"method": request.method,
+                                                           "resource_type": request.resource_type}))
+    
+    def _on_response(self, response):
+        level = "error" if response.status >= 500 else "warning" if response.status >= 400 else "debug"
+        self._record(Event("response", level, response.url, {"status": response.status}))
+    
+    def _on_requestfailed(self, request):
+        self._record(Event("requestfailed", "error", request.url, {"method": request.method,
+                                                                  "failure": request.failure}))
+    
+    def subscribe(self, kind: str, callback: Callable[[Event], Any], level: str = "debug") -> Subscription:
+        """Call callback for every kind event at or above level until cancelled"""
+        if kind not in self._subscriptions:
+            raise ValueError(f"Hub is not listening for {kind!r} events (listening: {tuple(self.buffers)})")
+        subscription = Subscription(self, kind, callback, level)
+        self._subscriptions[kind].append(subscription)
+        return subscription
+    
+    def _unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscriptions.get(subscription.kind, [])
+        if subscription in subscribers:
+            subscribers.remove(subscription)
+    
+    def on_dialog(self, handler: Optional[Callable]):
+        """Set THE dialog handler (replaces the previous one; None dismisses dialogs)"""
+        self._dialog_handler = handler
+    
+    def accept_dialogs(self, prompt_text: Optional[str] = None):
+        """Accept every alert/confirm/prompt from now on"""
+        if prompt_text is None:
+            self.on_dialog(lambda dialog: dialog.accept())
+        else:
+            self.on_dialog(lambda dialog: dialog.accept(prompt_text))
+    
+    def dismiss_dialogs(self):
+        self.on_dialog(None)
+    
+    def events(self, kind: str, level: str = "debug") -> List[Event]:
+        return [e for e in self.buffers.get(kind, ()) if level_rank(e.level) >= level_rank(level)]
+    
+    def console(self, level: str = "debug") -> List[str]:
+        """Buffered console messages as "type: text" strings"""
+        return [f"{e.data['type']}: {e.text}" for e in self.events("console", level)]
+    
+    def errors(self) -> List[Event]:
+        """Console errors, uncaught page errors and failed requests"""
+        return sorted(
+            self.events("console", "error") + self.events("pageerror") + self.events("requestfailed"),
+            key=lambda e: e.timestamp,
+        )
+    
+    def dialogs(self) -> List[str]:
+        return [e.text for e in self.buffers.get("dialog", ())]
+    
+    def clear(self):
+        for buffer in self.buffers.values():
+            buffer.clear()
+    
+    def close(self):
+        """Detach every page listener and subscriber and close the stream"""
+        for kind, handler in self._listeners:
+            try:
+                self.page.remove_listener(kind, handler)
+            except Exception:
+                pass  # Page already closed
+        self._listeners.clear()
+        for subscribers in self._subscriptions.values():
+            subscribers.clear()
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+class ConsoleLog(deque):
+    """Bounded "type: text" console log that detaches itself (stop() or page close)"""
+    
+    def __init__(self, page: Page, max_entries: int = 500):
+        super().__init__(maxlen=max_entries)
+        self.page = page
+        page.on("console", self._on_console)
+        page.once("close", lambda _: self.stop())
+    
+    def _on_console(self, msg):
+        self.append(f"{msg.type}: {msg.text}")
+    
+    def stop(self):
+        if self.page is None:
+            return
+        try:
+            self.page.remove_listener("console", self._on_console)
+        except Exception:
+            pass  # Page already closed
+        self.page = None
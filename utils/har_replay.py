@@ -0,0 +1,278 @@
+"""HAR record-and-replay router
+
+Record mode captures every request of a test module into one HAR archive.
+Replay mode serves requests from that archive through a context route, so
+runs are offline, deterministic and free of real network latency.
+"""
+
+import base64
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from playwright.sync_api import BrowserContext, Error, Route
+
+
+MODES = ("off", "record", "replay")
+MISS_POLICIES = ("fail", "passthrough", "record")
+
+# Body is stored decoded, so transport headers must not be replayed
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+EntryKey = Tuple[str, str, str]
+
+
+def _strip_query(url: str) -> str:
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+def _body_hash(body: Optional[bytes]) -> str:
+    return hashlib.sha1(body).hexdigest() if body else ""
+
+
+class HarArchive:
+    """In-memory HAR 1.2 archive indexed by method, URL and request body"""
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: List[Dict] = []
+        self.dirty = False
+        self._index: Dict[EntryKey, List[Dict]] = {}
+        self._loose_index: Dict[Tuple[str, str], List[Dict]] = {}
+        self._served: Dict[Tuple, int] = {}
+        # Keys re-recorded by this process; their entries from earlier runs are dropped
+        self._recorded: Set[EntryKey] = set()
+        if self.path.exists():
+            for entry in json.loads(self.path.read_text())["log"]["entries"]:
+                self._add(entry)
+    
+    @staticmethod
+    def _key(entry: Dict) -> EntryKey:
+        request = entry["request"]
+        return request["method"], request["url"], request.get("_bodyHash", "")
+    
+    @staticmethod
+    def _loose_key(entry: Dict) -> Tuple[str, str]:
+        return entry["request"]["method"], _strip_query(entry["request"]["url"])
+    
+    def _add(self, entry: Dict):
+        self.entries.append(entry)
+        self._index.setdefault(self._key(entry), []).append(entry)
+        self._loose_index.setdefault(self._loose_key(entry), []).append(entry)
+    
+    def _drop(self, key: EntryKey):
+        """Forget every entry recorded for key"""
+        stale = self._index.pop(key, [])
+        if not stale:
+            return
+        stale_ids = {id(entry) for entry in stale}
+        self.entries = [entry for entry in self.entries if id(entry) not in stale_ids]
+        for entry in stale:
+            loose = self._loose_index.get(self._loose_key(entry), [])
+            loose[:] = [other for other in loose if id(other) not in stale_ids]
+    
+    def lookup(self, method: str, url: str, body: Optional[bytes]) -> Optional[Dict]:
+        """Find the recorded entry for a request
+        
+        Repeated identical requests are answered in recorded order, the last
+        entry repeating. Falls back to ignoring the query string (cache busters).
+        """
+        key: Tuple = (method, url, _body_hash(body))
+        candidates = self._index.get(key)
+        if not candidates:
+            # Loose matches share one counter, whatever the cache buster was
+            key = ("loose", method, _strip_query(url))
+            candidates = self._loose_index.get(key[1:])
+        if not candidates:
+            return None
+        served = self._served.get(key, 0)
+        self._served[key] = served + 1
+        return candidates[min(served, len(candidates) - 1)]
+    
+    def record(self, method: str, url: str, request_headers: Dict[str, str], body: Optional[bytes],
+               status: int, status_text: str, headers: Dict[str, str], content: bytes, elapsed_ms: float):
+        """Add a captured exchange to the archive, replacing what earlier runs recorded for it"""
+        key = (method, url, _body_hash(body))
+        if key not in self._recorded:
+            self._drop(key)
+            self._recorded.add(key)
+        request = {
+            "method": method,
+            "url": url,
+            "httpVersion": "HTTP/1.1",
+            "headers": [{"name": k, "value": v} for k, v in request_headers.items()],
+            "queryString": [],
+            "cookies": [],
+            "headersSize": -1,
+            "bodySize": len(body) if body else 0,
+            "_bodyHash": _body_hash(body),
+        }
+        if body:
+            request["postData"] = {
+                "mimeType": request_headers.get("content-type", ""),
+                "text": body.decode("utf-8", errors="replace"),
+            }
+        self._add({
+            "startedDateTime": datetime.now(timezone.utc).isoformat(),
+            "time": elapsed_ms,
+            "request": request,
+            "response": {
+                "status": status,
+                "statusText": status_text,
+                "httpVersion": "HTTP/1.1",
+                "headers": [{"name": k, "value": v} for k, v in headers.items()],
+                "cookies": [],
+                "content": {
+                    "size": len(content),
+                    "mimeType": headers.get("content-type", ""),
+                    "text": base64.b64encode(content).decode("ascii"),
+                    "encoding": "base64",
+                },
+                "redirectURL": headers.get("location", ""),
+                "headersSize": -1,
+                "bodySize": len(content),
+            },
+            "cache": {},
+            "timings": {"send": 0, "wait": elapsed_ms, "receive": 0},
+        })
+        self.dirty = True
+    
+    def save(self):
+        """Write the archive, merging entries another worker saved meanwhile"""
+        if not self.dirty:
+            return
+        entries = list(self.entries)
+        if self.path.exists():
+            known = {self._key(entry) for entry in entries}
+            for entry in json.loads(self.path.read_text())["log"]["entries"]:
+                if self._key(entry) not in known:
+                    entries.append(entry)
+        har = {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": "playwright-python-web-template", "version": "1.0"},
+                "entries": entries,
+            }
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(har))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+class HarArchives:
+    """The HAR archives of one session, one per test module, saved together at the end
+    
+    Session-scoped fixtures that tests request directly make pytest reorder the
+    modules into several chunks, so a module can come back after another one
+    ran. Keeping the archives for the whole session loads and saves each once.
+    """
+    
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._archives: Dict[str, HarArchive] = {}
+    
+    def get(self, name: str) -> HarArchive:
+        """Archive of the module (loaded on first use)"""
+        archive = self._archives.get(name)
+        if archive is None:
+            archive = self._archives[name] = HarArchive(self.directory / f"{name}.har")
+        return archive
+    
+    def save(self):
+        for archive in self._archives.values():
+            archive.save()
+
+
+class HarRouter:
+    """Context route that records into or replays from a HarArchive"""
+    
+    def __init__(self, archive: HarArchive, mode: str = "replay", miss_policy: str = "fail"):
+        if mode not in MODES:
+            raise ValueError(f"HAR mode must be one of {MODES}, got {mode!r}")
+        if miss_policy not in MISS_POLICIES:
+            raise ValueError(f"HAR miss policy must be one of {MISS_POLICIES}, got {miss_policy!r}")
+        self.archive = archive
+        self.mode = mode
+        self.miss_policy = miss_policy
+        self.hits = 0
+        self.misses: List[str] = []
+        self._context: Optional[BrowserContext] = None
+    
+    @property
+    def failing_misses(self) -> bool:
+        """True when unrecorded requests were aborted and should fail the test"""
+        return self.mode == "replay" and self.miss_policy == "fail" and bool(self.misses)
+    
+    def _record(self, route: Route):
+        request = route.request
+        started = datetime.now(timezone.utc)
+        try:
+            # Don't follow redirects - the browser must see them to update page.url
+            response = route.fetch(max_redirects=0)
+            content = response.body()
+        except Error as e:
+            self.misses.append(f"{request.method} {request.url} (fetch failed: {str(e).splitlines()[0]})")
+            try:
+                route.abort("failed")
+            except Error:
+                pass  # Context already closed
+            return
+        elapsed_ms = (datetime.now(timezone.utc) - started).total_seconds() * 1000
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+        self.archive.record(
+            request.method, request.url, request.headers, request.post_data_buffer,
+            response.status, response.status_text, headers, content, elapsed_ms,
+        )
+        route.fulfill(status=response.status, headers=headers, body=content)
+    
+    def _handle(self, route: Route):
+        if self.mode == "record":
+            self._record(route)
+            return
+        request = route.request
+        entry = self.archive.lookup(request.method, request.url, request.post_data_buffer)
+        if entry is not None:
+            self.hits += 1
+            response = entry["response"]
+            content = response["content"]
+            body = content.get("text", "")
+            body = base64.b64decode(body) if content.get("encoding") == "base64" else body.encode("utf-8")
+            route.fulfill(
+                status=response["status"],
+                headers={
+                    h["name"]: h["value"] for h in response["headers"]
+                    if h["name"].lower() not in _DROPPED_HEADERS
+                },
+                body=body,
+            )
+            return
+        self.misses.append(f"{request.method} {request.url}")
+        if self.miss_policy == "record":
+            self._record(route)
+        elif self.miss_policy == "passthrough":
+            route.fallback()
+        else:
+            route.abort("internetdisconnected")
+    
+    def attach(self, context: BrowserContext):
+        """Route every request of the context through the archive"""
+        self._context = context
+        context.route("**/*", self._handle)
+    
+    def detach(self):
+        """Remove the route again"""
+        if self._context is None:
+            return
+        try:
+            self._context.unroute("**/*", self._handle)
+        except Exception:
+            # Context may already be closed by pytest-playwright
+            pass
+        self._context = None
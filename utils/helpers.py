@@ -1,21 +1,43 @@
 """Test helper functions and utilities"""
 
-import random
-import string
+import os
 from datetime import datetime
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, Optional
 from playwright.sync_api import Page
+from utils.event_hub import ConsoleLog
+
+if TYPE_CHECKING:
+    from utils.data_factory import DataFactory
+
+
+# Process-wide factory for the helpers below; tests should prefer the seeded data_factory fixture
+_factory: Optional["DataFactory"] = None
+
+
+def _shared_factory() -> "DataFactory":
+    """Factory seeded from DATA_SEED and the xdist worker, created on first use
+    
+    Created lazily because pytest_configure sets DATA_SEED after this module may be imported,
+    and imported lazily so the other helpers don't pull in numpy.
+    """
+    global _factory
+    if _factory is None:
+        from utils.data_factory import DataFactory
+        
+        seed = os.getenv("DATA_SEED")
+        worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+        _factory = DataFactory(f"{seed}:helpers:{worker}" if seed else None)
+    return _factory
 
 
 def generate_random_email(domain: str = "test.com") -> str:
-    """Generate a random email address for testing"""
-    random_string = ''.join(random.choices(string.ascii_lowercase + string.digits, k=10))
-    return f"test_{random_string}@{domain}"
+    """Generate a unique email address for testing (drawn from a pre-generated pool)"""
+    return _shared_factory().email(domain)
 
 
 def generate_random_string(length: int = 10) -> str:
     """Generate a random alphanumeric string"""
-    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+    return _shared_factory().string(length)
 
 
 def generate_timestamp() -> str:
@@ -55,12 +77,12 @@ def take_full_page_screenshot(page: Page, path: str):
 
 def get_local_storage(page: Page, key: str) -> Any:
     """Get value from local storage"""
-    return page.evaluate(f"localStorage.getItem('{key}')")
+    return page.evaluate("key => localStorage.getItem(key)", key)
 
 
 def set_local_storage(page: Page, key: str, value: str):
     """Set value in local storage"""
-    page.evaluate(f"localStorage.setItem('{key}', '{value}')")
+    page.evaluate("([key, value]) => localStorage.setItem(key, value)", [key, value])
 
 
 def clear_local_storage(page: Page):
@@ -103,13 +125,10 @@ def upload_file(page: Page, selector: str, file_path: str):
     page.locator(selector).set_input_files(file_path)
 
 
-def get_page_console_logs(page: Page) -> list:
-    """Collect console logs (must set up listener first)"""
-    logs = []
+def get_page_console_logs(page: Page, max_entries: int = 500) -> ConsoleLog:
+    """Collect console logs (must set up listener first)
     
-    def handle_console(msg):
-        logs.append(f"{msg.type}: {msg.text}")
-    
-    page.on("console", handle_console)
-    return logs
-
+    Keeps the last max_entries messages; the listener is removed on stop() or
+    when the page closes. Inside tests prefer the event_hub fixture.
+    """
+    return ConsoleLog(page, max_entries)
@@ -0,0 +1,509 @@
+"""Test impact analysis for page objects, locators and helpers
+
+Builds a dependency graph from the source (static) and, optionally, from the
+functions each test actually called (dynamic, IMPACT_TRACE=true), then maps a
+git diff to the tests that can be affected by it.
+
+Symbols are qualified names such as `pages.login_page.LoginPageLocators.EMAIL_INPUT`,
+`pages.login_page.LoginPage.login` or `utils.helpers.wait_for_page_load`.
+Anything the graph can't reason about (conftest module code, pytest.ini,
+requirements, other Python files) selects the whole suite.
+
+Usage:
+    python -m utils.impact --base origin/main            # affected test ids
+    python -m utils.impact --base origin/main --explain  # plus why
+    IMPACT_BASE=origin/main pytest                       # run only affected tests
+"""
+
+import argparse
+import ast
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pytest
+
+
+SOURCE_ROOTS = ("pages", "utils", "tests")
+# Files that never influence test outcomes
+IGNORED_FILES = re.compile(r"(\.md|\.txt|\.example|LICENSE|\.gitignore|\.jsonl)$", re.IGNORECASE)
+ALWAYS_RELEVANT = ("requirements.txt", "pytest.ini")
+RUN_ALL = "__all__"
+
+_HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class Symbol:
+    """A function, method, class, class attribute, constant, fixture or test"""
+    
+    def __init__(self, name: str, module: str, kind: str, start: int, end: int, cls: Optional[str] = None):
+        self.name = name
+        self.module = module
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.cls = cls
+        self.names: Set[str] = set()
+        self.attrs: Set[Tuple[Optional[str], str]] = set()
+        self.bases: List[str] = []
+        self.params: List[str] = []
+        self.autouse = False
+        self.nodeid: Optional[str] = None
+        # Fixtures: names of the classes of the returned/yielded value
+        self.returns: Set[str] = set()
+
+
+def _module_name(path: Path) -> str:
+    parts = list(path.with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def _collect_refs(symbol: Symbol, node: ast.AST):
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name):
+            symbol.names.add(child.id)
+        elif isinstance(child, ast.Attribute):
+            receiver = child.value.id if isinstance(child.value, ast.Name) else None
+            symbol.attrs.add((receiver, child.attr))
+
+
+def _returned_classes(node: ast.FunctionDef) -> Set[str]:
+    """Names that may be the class of what a fixture returns or yields
+    
+    From the return annotation (Generator[X, ...] included) and from values
+    built by a call, directly or through a local variable.
+    """
+    names = set()
+    if node.returns is not None:
+        names = {n.id for n in ast.walk(node.returns) if isinstance(n, ast.Name)}
+    built: Dict[str, str] = {}
+    values = []
+    for child in ast.walk(node):
+        if isinstance(child, ast.Assign) and isinstance(child.value, ast.Call):
+            if isinstance(child.value.func, ast.Name):
+                for target in child.targets:
+                    if isinstance(target, ast.Name):
+                        built[target.id] = child.value.func.id
+        elif isinstance(child, (ast.Return, ast.Yield)) and child.value is not None:
+            values.append(child.value)
+    for value in values:
+        if isinstance(value, ast.Call) and isinstance(value.func, ast.Name):
+            names.add(value.func.id)
+        elif isinstance(value, ast.Name) and value.id in built:
+            names.add(built[value.id])
+    return names
+
+
+def _fixture_decorator(node: ast.FunctionDef) -> Optional[ast.AST]:
+    for decorator in node.decorator_list:
+        target = decorator.func if isinstance(decorator, ast.Call) else decorator
+        if isinstance(target, ast.Attribute) and target.attr == "fixture":
+            return decorator
+    return None
+
+
+class SymbolIndex:
+    """Symbols of every module under the source roots, with import aliases"""
+    
+    def __init__(self):
+        self.symbols: Dict[str, Symbol] = {}
+        self.by_module: Dict[str, List[Symbol]] = {}
+        # module -> local name -> qualified target
+        self.aliases: Dict[str, Dict[str, str]] = {}
+        self.module_paths: Dict[str, str] = {}
+    
+    @classmethod
+    def build(cls, root: Path = Path("."), roots: Iterable[str] = SOURCE_ROOTS) -> "SymbolIndex":
+        index = cls()
+        for source_root in roots:
+            for path in sorted((root / source_root).rglob("*.py")):
+                relative = path.relative_to(root)
+                index.add_module(relative.as_posix(), path.read_text())
+        return index
+    
+    def add_module(self, path: str, source: str) -> List[Symbol]:
+        """Parse one module; returns its symbols (also usable for old revisions)"""
+        module = _module_name(Path(path))
+        self.module_paths[module] = path
+        tree = ast.parse(source)
+        aliases = self.aliases.setdefault(module, {})
+        symbols = []
+        is_test_module = Path(path).name.startswith("test_")
+        
+        def add(symbol: Symbol, node: ast.AST):
+            _collect_refs(symbol, node)
+            symbols.append(symbol)
+        
+        def add_function(node, prefix: str, cls_name: Optional[str], test_class: Optional[str]):
+            qualified = f"{prefix}.{node.name}"
+            fixture = _fixture_decorator(node)
+            if fixture is not None:
+                kind = "fixture"
+            elif node.name.startswith("test_") and (is_test_module or test_class):
+                kind = "test"
+            else:
+                kind = "method" if cls_name else "function"
+            symbol = Symbol(qualified, module, kind, node.lineno, node.end_lineno, cls_name)
+            symbol.params = [a.arg for a in node.args.args if a.arg not in ("self", "cls")]
+            if fixture is not None:
+                symbol.returns = _returned_classes(node)
+            if fixture is not None and isinstance(fixture, ast.Call):
+                symbol.autouse = any(
+                    k.arg == "autouse" and isinstance(k.value, ast.Constant) and k.value.value for k in fixture.keywords
+                )
+            if kind == "test":
+                symbol.nodeid = f"{path}::{test_class}::{node.name}" if test_class else f"{path}::{node.name}"
+            # Decorators (markers, parametrize) belong to the symbol too
+            symbol.start = min([d.lineno for d in node.decorator_list] + [node.lineno])
+            add(symbol, node)
+        
+        for node in tree.body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                for alias in node.names:
+                    local = alias.asname or alias.name.split(".")[0]
+                    if isinstance(node, ast.ImportFrom) and node.module:
+                        aliases[local] = f"{node.module}.{alias.name}"
+                    else:
+                        aliases[local] = alias.name if alias.asname else local
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                add_function(node, module, None, None)
+            elif isinstance(node, ast.ClassDef):
+                qualified = f"{module}.{node.name}"
+                class_symbol = Symbol(qualified, module, "class", node.lineno, node.end_lineno)
+                class_symbol.start = min([d.lineno for d in node.decorator_list] + [node.lineno])
+                class_symbol.bases = [b.id for b in node.bases if isinstance(b, ast.Name)]
+                for base in node.bases:
+                    _collect_refs(class_symbol, base)
+                symbols.append(class_symbol)
+                test_class = node.name if node.name.startswith("Test") and is_test_module else None
+                for member in node.body:
+                    if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        add_function(member, qualified, qualified, test_class)
+                    elif isinstance(member, (ast.Assign, ast.AnnAssign)):
+                        targets = member.targets if isinstance(member, ast.Assign) else [member.target]
+                        for target in targets:
+                            if isinstance(target, ast.Name):
+                                add(Symbol(f"{qualified}.{target.id}", module, "attribute",
+                                           member.lineno, member.end_lineno, qualified), member)
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        add(Symbol(f"{module}.{target.id}", module, "constant", node.lineno, node.end_lineno), node)
+        
+        for symbol in symbols:
+            self.symbols[symbol.name] = symbol
+        self.by_module[module] = symbols
+        return symbols
+    
+    def qualify(self, module: str, name: str) -> Optional[str]:
+        """Resolve a bare name used in module to an indexed symbol"""
+        candidate = f"{module}.{name}"
+        if candidate in self.symbols:
+            return candidate
+        target = self.aliases.get(module, {}).get(name)
+        seen = set()
+        # Follow re-exports such as `from utils.helpers import x` in utils/__init__.py
+        while target and target not in self.symbols and target not in seen:
+            seen.add(target)
+            owner, _, short = target.rpartition(".")
+            target = self.aliases.get(owner, {}).get(short)
+        return target if target in self.symbols else None
+    
+    def mro(self, class_name: str) -> List[str]:
+        """The class and its indexed base classes"""
+        order, queue = [], [class_name]
+        while queue:
+            current = queue.pop(0)
+            if current in order or current not in self.symbols:
+                continue
+            order.append(current)
+            symbol = self.symbols[current]
+            queue.extend(filter(None, (self.qualify(symbol.module, base) for base in symbol.bases)))
+        return order
+    
+    def subclasses(self, class_name: str) -> List[str]:
+        return [s.name for s in self.symbols.values() if s.kind == "class" and class_name in self.mro(s.name)[1:]]
+    
+    def member(self, class_names: Iterable[str], attr: str) -> Set[str]:
+        found = set()
+        for class_name in class_names:
+            for owner in self.mro(class_name):
+                if f"{owner}.{attr}" in self.symbols:
+                    found.add(f"{owner}.{attr}")
+                    break
+        return found
+    
+    def fixture_classes(self, fixture: Symbol) -> Set[str]:
+        """Indexed classes a fixture's value can be an instance of"""
+        qualified = (self.qualify(fixture.module, name) for name in fixture.returns)
+        return {name for name in qualified if name and self.symbols[name].kind == "class"}
+    
+    def direct_deps(self, symbol: Symbol) -> Set[str]:
+        """Symbols referenced by symbol's own source"""
+        deps = set()
+        classes = set()
+        # Fixture arguments of tests and fixtures: `data_factory.user()` uses DataFactory.user
+        receivers: Dict[str, Set[str]] = {}
+        if symbol.kind in ("test", "fixture"):
+            fixtures = self.fixtures_for(symbol.module)
+            for param in symbol.params:
+                if param in fixtures:
+                    receivers[param] = self.fixture_classes(fixtures[param])
+                    classes |= receivers[param]
+        for name in symbol.names:
+            qualified = self.qualify(symbol.module, name)
+            if qualified:
+                deps.add(qualified)
+                if self.symbols[qualified].kind == "class":
+                    classes.add(qualified)
+        own_classes = set()
+        if symbol.cls:
+            # self.x may be overridden further down the hierarchy
+            own_classes = {symbol.cls, *self.subclasses(symbol.cls)}
+        for receiver, attr in symbol.attrs:
+            if receiver in ("self", "cls") and own_classes:
+                deps |= self.member(own_classes, attr)
+                continue
+            if receiver in receivers:
+                deps |= self.member(receivers[receiver], attr)
+                continue
+            qualified = self.qualify(symbol.module, receiver) if receiver else None
+            if qualified and self.symbols[qualified].kind == "class":
+                deps |= self.member([qualified], attr)
+            else:
+                # Unknown receiver (an instance in a local variable): any class the symbol uses
+                deps |= self.member(classes, attr)
+        if symbol.kind == "class":
+            # Instantiating a class runs its __init__ chain and class-level attributes
+            for owner in self.mro(symbol.name):
+                deps.update(s.name for s in self.by_module[self.symbols[owner].module]
+                            if s.cls == owner and (s.kind == "attribute" or s.name.endswith(".__init__")))
+                if owner != symbol.name:
+                    deps.add(owner)
+        deps.discard(symbol.name)
+        return deps
+    
+    def fixtures_for(self, module: str) -> Dict[str, Symbol]:
+        """Fixtures visible to a test module: conftest ones, overridden by the module's own"""
+        visible = {}
+        for conftest in sorted(m for m in self.by_module if m.endswith("conftest")):
+            if module.startswith(conftest.rsplit(".", 1)[0]):
+                visible.update({s.name.rsplit(".", 1)[-1]: s for s in self.by_module[conftest] if s.kind == "fixture"})
+        visible.update({s.name.rsplit(".", 1)[-1]: s for s in self.by_module.get(module, []) if s.kind == "fixture"})
+        return visible
+    
+    def closure(self, start: Iterable[str]) -> Set[str]:
+        """Everything reachable from start, fixtures included"""
+        seen: Set[str] = set()
+        queue = list(start)
+        while queue:
+            name = queue.pop()
+            if name in seen or name not in self.symbols:
+                continue
+            seen.add(name)
+            symbol = self.symbols[name]
+            queue.extend(self.direct_deps(symbol))
+            if symbol.kind in ("test", "fixture"):
+                fixtures = self.fixtures_for(symbol.module)
+                queue.extend(fixtures[p].name for p in symbol.params if p in fixtures)
+        return seen
+    
+    def tests(self) -> List[Symbol]:
+        return [s for s in self.symbols.values() if s.kind == "test"]
+    
+    def test_closure(self, test: Symbol) -> Set[str]:
+        autouse = [s.name for s in self.fixtures_for(test.module).values() if s.autouse]
+        return self.closure([test.name, *autouse])
+    
+    def symbols_at(self, module: str, lines: Iterable[int]) -> Set[str]:
+        """Innermost symbols covering the lines; module-level lines mean the whole module"""
+        found = set()
+        symbols = self.by_module.get(module, [])
+        for line in lines:
+            covering = [s for s in symbols if s.start <= line <= s.end]
+            if covering:
+                found.add(min(covering, key=lambda s: s.end - s.start).name)
+            else:
+                found.update(s.name for s in symbols)
+                found.add(f"{module}.<module>")
+        return found
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout
+
+
+def changed_lines(base: str) -> Dict[str, Tuple[Set[int], Set[int]]]:
+    """path -> (old line numbers, new line numbers) changed between base and the working tree"""
+    changes: Dict[str, Tuple[Set[int], Set[int]]] = {}
+    path = None
+    for line in _git("diff", "-U0", "--no-color", "--no-renames", base).splitlines():
+        if line.startswith("+++ ") or line.startswith("--- "):
+            name = line[4:]
+            if name != "/dev/null":
+                path = name[2:]
+                changes.setdefault(path, (set(), set()))
+            continue
+        match = _HUNK.match(line)
+        if match and path:
+            old_start, old_count, new_start, new_count = (
+                int(match.group(1)), int(match.group(2) or 1), int(match.group(3)), int(match.group(4) or 1)
+            )
+            old, new = changes[path]
+            old.update(range(old_start, old_start + old_count))
+            new.update(range(new_start, new_start + new_count))
+            if not new_count:
+                # Pure deletion: the symbol around the gap changed
+                new.add(max(new_start, 1))
+    for path in _git("ls-files", "--others", "--exclude-standard").splitlines():
+        changes[path] = (set(), {1})
+    return changes
+
+
+def changed_symbols(base: str, index: SymbolIndex, root: Path = Path(".")) -> Set[str]:
+    """Changed symbols, or {RUN_ALL} when a change can't be attributed"""
+    changed: Set[str] = set()
+    for path, (old_lines, new_lines) in changed_lines(base).items():
+        if not path.endswith(".py"):
+            if path in ALWAYS_RELEVANT or not IGNORED_FILES.search(path):
+                return {RUN_ALL}
+            continue
+        if not path.startswith(tuple(f"{r}/" for r in SOURCE_ROOTS)):
+            return {RUN_ALL}
+        module = _module_name(Path(path))
+        if (root / path).exists():
+            changed |= index.symbols_at(module, new_lines)
+        if old_lines:
+            try:
+                old_source = _git("show", f"{base}:{path}")
+            except subprocess.CalledProcessError:
+                old_source = None
+            if old_source is not None:
+                old_index = SymbolIndex()
+                old_index.add_module(path, old_source)
+                changed |= old_index.symbols_at(module, old_lines)
+        if module.endswith("conftest") and f"{module}.<module>" in changed:
+            return {RUN_ALL}
+    return changed
+
+
+def load_dynamic_map(directory: Path) -> Dict[str, Set[str]]:
+    """Merge the per-process trace files into function-level test id -> symbols"""
+    merged: Dict[str, Set[str]] = {}
+    for path in sorted(Path(directory).glob("*.json")):
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        for nodeid, symbols in data.items():
+            merged.setdefault(nodeid.split("[", 1)[0], set()).update(symbols)
+    return merged
+
+
+class ImpactTracer:
+    """Pytest plugin recording the page-object/helper functions each test calls"""
+    
+    def __init__(self, index: SymbolIndex, output: Path, root: Path = Path(".")):
+        self.output = Path(output)
+        # (absolute file, first line of the def) -> symbol
+        self.functions: Dict[Tuple[str, int], str] = {}
+        for symbol in index.symbols.values():
+            if symbol.kind in ("function", "method", "fixture"):
+                path = str((root / index.module_paths[symbol.module]).resolve())
+                for line in range(symbol.start, symbol.end + 1):
+                    self.functions.setdefault((path, line), symbol.name)
+        self.files = {path for path, _ in self.functions}
+        self.calls: Dict[str, Set[str]] = {}
+        self._current: Optional[Set[str]] = None
+    
+    def _profile(self, frame, event, arg):
+        if event == "call" and frame.f_code.co_filename in self.files:
+            name = self.functions.get((frame.f_code.co_filename, frame.f_code.co_firstlineno))
+            if name:
+                self._current.add(name)
+    
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        self._current = self.calls.setdefault(item.nodeid, set())
+        sys.setprofile(self._profile)
+        try:
+            yield
+        finally:
+            sys.setprofile(None)
+            self._current = None
+    
+    def pytest_sessionfinish(self, session):
+        if not self.calls:
+            return
+        previous = {}
+        if self.output.exists():
+            try:
+                previous = json.loads(self.output.read_text())
+            except (OSError, ValueError):
+                previous = {}
+        previous.update({nodeid: sorted(calls) for nodeid, calls in self.calls.items()})
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        self.output.write_text(json.dumps(previous, indent=1, sort_keys=True))
+
+
+def select_tests(index: SymbolIndex, changed: Set[str],
+                 dynamic: Optional[Dict[str, Set[str]]] = None) -> Optional[Dict[str, Set[str]]]:
+    """Affected test ids with the changed symbols that reach them (None = run everything)
+    
+    A changed page-object or helper symbol that no test reaches, in a module some
+    test does reach, means the graph missed a call (e.g. through an untyped object);
+    rather than deselect its callers silently, everything runs.
+    """
+    if RUN_ALL in changed:
+        return None
+    dynamic = dynamic or {}
+    selected = {}
+    reached_by_any: Set[str] = set()
+    for test in index.tests():
+        reached = index.test_closure(test)
+        called = dynamic.get(test.nodeid)
+        if called:
+            reached |= index.closure(called)
+        reached_by_any |= reached
+        hits = reached & changed
+        if hits:
+            selected[test.nodeid] = hits
+    used_modules = {index.symbols[name].module for name in reached_by_any}
+    for name in changed - reached_by_any:
+        symbol = index.symbols.get(name)
+        if (symbol is not None and symbol.module.startswith(("pages.", "utils."))
+                and symbol.module in used_modules):
+            return None
+    return selected
+
+
+def affected_tests(base: str, root: Path = Path("."),
+                   dynamic_dir: Optional[Path] = None) -> Optional[Dict[str, Set[str]]]:
+    index = SymbolIndex.build(root)
+    dynamic = load_dynamic_map(dynamic_dir) if dynamic_dir else None
+    return select_tests(index, changed_symbols(base, index, root), dynamic)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="List the tests affected by changes since a git revision")
+    parser.add_argument("--base", default="HEAD", help="Revision to diff the working tree against")
+    parser.add_argument("--dynamic-dir", default=".cache/impact", help="Trace files from IMPACT_TRACE=true runs")
+    parser.add_argument("--explain", action="store_true", help="Show the changed symbols behind each test")
+    args = parser.parse_args(argv)
+    
+    selected = affected_tests(args.base, dynamic_dir=Path(args.dynamic_dir))
+    if selected is None:
+        print("tests/" if not args.explain else "tests/  (change outside the dependency graph - run everything)")
+        return
+    for nodeid in sorted(selected):
+        print(f"{nodeid}  <- {', '.join(sorted(selected[nodeid]))}" if args.explain else nodeid)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Concurrent virtual-user load runner for the TestShop journeys
+
+Runs N virtual users on one event loop, each in its own browser context so
+cookies, localStorage and the cart of one user never leak into another. Each user
+repeats the login -> search -> add to cart -> view cart -> checkout journey
+with think time between steps until the target duration is over, and the run
+reports throughput plus p50/p95/p99 latency per step.
+
+Usage:
+    python -m utils.load_runner --site-dir ../test-ecommerce-site --users 20 --ramp-up 10 \\
+        --think-time 1 --duration 60
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from playwright.async_api import Browser, Page, async_playwright
+
+from pages.async_api.base_page import AsyncBasePage
+from utils.local_server import LocalServer
+
+
+SHOP_USER = {"email": "test@testshop.com", "password": "Test123!"}
+SEARCH_TERMS = ["laptop", "phone", "headphones", "watch"]
+
+# Steps get the virtual user's page object, built once per user and reused for every step
+Step = Callable[[AsyncBasePage, str, Dict[str, str]], Awaitable[Any]]
+
+
+async def step_login(shop: AsyncBasePage, site_url: str, user: Dict[str, str]):
+    page = shop.page
+    await page.goto(f"{site_url}/login.html")
+    await page.fill("#email", user["email"])
+    await page.fill("#password", user["password"])
+    async with shop.expect_url_change():
+        await page.click("button[type='submit']")
+
+
+async def step_search(shop: AsyncBasePage, site_url: str, user: Dict[str, str]):
+    page = shop.page
+    await page.goto(f"{site_url}/products.html")
+    await page.fill("#search-input", random.choice(SEARCH_TERMS))
+    async with shop.expect_dom_mutation():
+        await page.click("text=Search")
+
+
+async def step_add_to_cart(shop: AsyncBasePage, site_url: str, user: Dict[str, str]):
+    page = shop.page
+    await page.goto(f"{site_url}/products.html")
+    async with shop.expect_text_change("#cart-count"):
+        await page.locator(".btn-primary").first.click()
+
+
+async def step_view_cart(shop: AsyncBasePage, site_url: str, user: Dict[str, str]):
+    page = shop.page
+    await page.goto(f"{site_url}/cart.html")
+    await page.locator(".cart-item").first.wait_for(state="visible")
+
+
+async def step_checkout(shop: AsyncBasePage, site_url: str, user: Dict[str, str]):
+    # The cart page is already loaded - wait for the navigation checkout() triggers
+    async with shop.expect_url_change():
+        await shop.page.evaluate("checkout()")
+
+
+SHOP_JOURNEY: List[Tuple[str, Step]] = [
+    ("login", step_login),
+    ("search", step_search),
+    ("add_to_cart", step_add_to_cart),
+    ("view_cart", step_view_cart),
+    ("checkout", step_checkout),
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class LoadReport:
+    """Per-step latencies and errors collected during a load run"""
+    
+    def __init__(self, step_names: List[str]):
+        self.step_names = step_names
+        self.latencies: Dict[str, List[float]] = {name: [] for name in step_names}
+        self.errors: Dict[str, List[str]] = {name: [] for name in step_names}
+        self.iterations = 0
+        self.elapsed = 0.0
+        self.users = 0
+        self.requests_served: Optional[int] = None
+    
+    def step_stats(self, name: str) -> Dict[str, Any]:
+        values = sorted(self.latencies[name])
+        return {
+            "count": len(values),
+            "errors": len(self.errors[name]),
+            "throughput": len(values) / self.elapsed if self.elapsed else 0.0,
+            "p50_ms": percentile(values, 50),
+            "p95_ms": percentile(values, 95),
+            "p99_ms": percentile(values, 99),
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "users": self.users,
+            "elapsed_s": round(self.elapsed, 3),
+            "iterations": self.iterations,
+            "journeys_per_s": self.iterations / self.elapsed if self.elapsed else 0.0,
+            "requests_served": self.requests_served,
+            "steps": {name: self.step_stats(name) for name in self.step_names},
+        }
+    
+    def format(self) -> str:
+        """Plain-text table for the console"""
+        summary = self.to_dict()
+        lines = [
+            f"{self.users} users, {summary['elapsed_s']}s: "
+            f"{self.iterations} journeys ({summary['journeys_per_s']:.2f}/s)",
+            f"{'step':<14}{'count':>7}{'err':>6}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}",
+        ]
+        for name, stats in summary["steps"].items():
+            fmt = lambda v: f"{v:9.0f}" if v is not None else f"{'-':>9}"
+            lines.append(
+                f"{name:<14}{stats['count']:>7}{stats['errors']:>6}{stats['throughput']:>8.2f}"
+                f"{fmt(stats['p50_ms'])}{fmt(stats['p95_ms'])}{fmt(stats['p99_ms'])}"
+            )
+        if self.requests_served is not None:
+            lines.append(f"local server: {self.requests_served} requests "
+                         f"({self.requests_served / self.elapsed if self.elapsed else 0:.1f}/s)")
+        return "\n".join(lines)
+
+
+async def _virtual_user(index: int, browser: Browser, site_url: str, journey: List[Tuple[str, Step]],
+                        report: LoadReport, start_delay: float, think_time: float, deadline: float):
+    await asyncio.sleep(start_delay)
+    # A context per user: the journey's cart and checkout would race on shared localStorage
+    context = await browser.new_context()
+    page = await context.new_page()
+    shop = AsyncBasePage(page)
+    # Add-to-cart and checkout confirm with alerts
+    page.on("dialog", lambda dialog: dialog.accept())
+    try:
+        while time.monotonic() < deadline:
+            for position, (name, step) in enumerate(journey, 1):
+                start = time.perf_counter()
+                try:
+                    await step(shop, site_url, SHOP_USER)
+                except Exception as e:
+                    report.errors[name].append(f"user {index}: {e!r}")
+                    # Start the next journey from scratch
+                    break
+                report.latencies[name].append((time.perf_counter() - start) * 1000)
+                if position == len(journey):
+                    report.iterations += 1
+                if time.monotonic() >= deadline:
+                    return
+                if think_time:
+                    # +-50% jitter so users don't move in lockstep
+                    await asyncio.sleep(random.uniform(0.5, 1.5) * think_time)
+    finally:
+        await context.close()
+
+
+async def run_load(site_url: str, users: int = 10, ramp_up: float = 0, think_time: float = 1.0,
+                   duration: float = 60, browser_name: str = "chromium", headless: bool = True,
+                   journey: Optional[List[Tuple[str, Step]]] = None,
+                   server: Optional[LocalServer] = None) -> LoadReport:
+    """Run `users` virtual users, each in its own browser context
+    
+    Args:
+        site_url: Base URL of the shop
+        ramp_up: Seconds over which user start times are spread evenly
+        think_time: Mean pause between steps in seconds
+        duration: Seconds after the first user starts until no new step begins
+        server: Local server behind site_url; the requests it served during the run are reported
+    """
+    journey = journey or SHOP_JOURNEY
+    report = LoadReport([name for name, _ in journey])
+    report.users = users
+    async with async_playwright() as playwright:
+        browser = await getattr(playwright, browser_name).launch(headless=headless)
+        try:
+            served_before = server.requests_served if server else 0
+            start = time.monotonic()
+            deadline = start + duration
+            await asyncio.gather(*(
+                _virtual_user(i, browser, site_url, journey, report, ramp_up * i / users, think_time, deadline)
+                for i in range(users)
+            ))
+            report.elapsed = time.monotonic() - start
+            if server:
+                report.requests_served = server.requests_served - served_before
+        finally:
+            await browser.close()
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run TestShop journeys as a load test")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--site-dir", default=os.getenv("TESTSHOP_DIR", ""),
+                        help="Serve this TestShop checkout from a local stand-in server (default: TESTSHOP_DIR)")
+    source.add_argument("--url", help="Load an already running shop instead")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--ramp-up", type=float, default=0)
+    parser.add_argument("--think-time", type=float, default=1.0)
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Artificial latency of the local server")
+    parser.add_argument("--browser", default="chromium")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args(argv)
+    if not args.url and not args.site_dir:
+        parser.error("pass --site-dir (or set TESTSHOP_DIR) or --url")
+    
+    options = dict(users=args.users, ramp_up=args.ramp_up, think_time=args.think_time,
+                   duration=args.duration, browser_name=args.browser, headless=not args.headed)
+    if args.url:
+        report = asyncio.run(run_load(args.url.rstrip("/"), **options))
+    else:
+        with LocalServer(args.site_dir, latency_ms=args.latency_ms) as server:
+            report = asyncio.run(run_load(server.url, server=server, **options))
+    print(report.format())
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Local threaded HTTP server for static sites under test
+
+Serves a checkout of the TestShop site (or any static directory) with
+keep-alive, gzip, ETag/304 and an artificial-latency knob, so tests can run
+against sub-millisecond local responses or simulate a slow backend.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+
+
+_COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+_MIN_GZIP_SIZE = 1024
+
+
+class _CachedFile:
+    """File body with its ETag and lazily built gzip variant"""
+    
+    def __init__(self, body: bytes, mtime: float):
+        self.body = body
+        self.mtime = mtime
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self._gzipped: Optional[bytes] = None
+    
+    @property
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6)
+        return self._gzipped
+
+
+class _StaticHandler(SimpleHTTPRequestHandler):
+    """Static file handler with keep-alive, gzip, ETag/304 and latency"""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def __init__(self, *args, server_state: "LocalServer", **kwargs):
+        self.server_state = server_state
+        super().__init__(*args, **kwargs)
+    
+    def log_message(self, format, *args):
+        # Keep pytest output clean
+        pass
+    
+    def do_GET(self):
+        self._serve(send_body=True)
+    
+    def do_HEAD(self):
+        self._serve(send_body=False)
+    
+    def _serve(self, send_body: bool):
+        if self.server_state.latency_ms:
+            time.sleep(self.server_state.latency_ms / 1000)
+        self.server_state.requests_served += 1
+        
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        cached = self.server_state.load(path)
+        if cached is None:
+            self.send_error(404, "File not found")
+            return
+        
+        if self.headers.get("If-None-Match") == cached.etag:
+            self.send_response(304)
+            self.send_header("ETag", cached.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        
+        content_type = self.guess_type(path)
+        body = cached.body
+        use_gzip = (
+            "gzip" in self.headers.get("Accept-Encoding", "")
+            and content_type.startswith(_COMPRESSIBLE_TYPES)
+            and len(body) >= _MIN_GZIP_SIZE
+        )
+        if use_gzip:
+            body = cached.gzipped
+        
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", cached.etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+
+class LocalServer:
+    """Threaded static HTTP server running in a background thread
+    
+    Example:
+        with LocalServer("../test-ecommerce-site", latency_ms=50) as server:
+            page.goto(f"{server.url}/index.html")
+    """
+    
+    def __init__(self, directory: str, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0):
+        self.directory = str(Path(directory).resolve())
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.requests_served = 0
+        self._files: Dict[str, _CachedFile] = {}
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+    
+    def load(self, path: str) -> Optional[_CachedFile]:
+        """Read a file, reusing the in-memory copy while its mtime is unchanged"""
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        cached = self._files.get(path)
+        if cached is None or cached.mtime != mtime:
+            with open(path, "rb") as f:
+                cached = _CachedFile(f.read(), mtime)
+            self._files[path] = cached
+        return cached
+    
+    def start(self) -> "LocalServer":
+        handler = partial(_StaticHandler, directory=self.directory, server_state=self)
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+    
+    def __enter__(self) -> "LocalServer":
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,157 @@
+"""Web performance budgets and baselines
+
+Metrics captured by BasePage.navigate are checked against absolute budgets and
+against a per URL and viewport baseline of earlier passing runs, so a page that
+slowly gets heavier fails before it crosses a hard limit.
+"""
+
+import json
+import os
+import statistics
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pages.performance import METRICS
+
+
+# Smallest increase over the baseline mean that counts as a regression, so a
+# very stable baseline (tiny stdev) doesn't flag a few milliseconds of noise
+MIN_REGRESSION_DELTA = {
+    "ttfb": 25,
+    "dom_content_loaded": 50,
+    "load": 50,
+    "first_paint": 50,
+    "first_contentful_paint": 50,
+    "lcp": 100,
+    "cls": 0.02,
+    "resource_count": 2,
+    "transfer_bytes": 10 * 1024,
+}
+
+
+def baseline_key(url: str, viewport: Optional[Dict[str, int]]) -> str:
+    """Baseline entry for a URL at a viewport size"""
+    size = f"{viewport['width']}x{viewport['height']}" if viewport else "no-viewport"
+    return f"{url} @ {size}"
+
+
+def parse_budgets(value: str) -> Dict[str, float]:
+    """Parse "lcp=2500,cls=0.1" into {"lcp": 2500.0, "cls": 0.1}"""
+    budgets = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        metric, _, limit = item.partition("=")
+        metric = metric.strip()
+        if metric not in METRICS:
+            raise ValueError(f"Unknown performance metric {metric!r}, expected one of {METRICS}")
+        budgets[metric] = float(limit)
+    return budgets
+
+
+class PerformanceBaseline:
+    """Recent passing samples per baseline key and metric, stored as JSON"""
+    
+    def __init__(self, path: Path, max_samples: int = 20):
+        self.path = Path(path)
+        self.max_samples = max_samples
+        self.samples: Dict[str, Dict[str, List[float]]] = {}
+        self._touched = set()
+        if self.path.exists():
+            try:
+                self.samples = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                self.samples = {}
+    
+    def history(self, key: str, metric: str) -> List[float]:
+        return self.samples.get(key, {}).get(metric, [])
+    
+    def add(self, key: str, metrics: Dict[str, Any]):
+        """Append a passing measurement, keeping the newest max_samples"""
+        entry = self.samples.setdefault(key, {})
+        for metric in METRICS:
+            value = metrics.get(metric)
+            if value is None:
+                continue
+            entry[metric] = (entry.get(metric, []) + [value])[-self.max_samples:]
+        self._touched.add(key)
+    
+    def save(self):
+        """Write the baseline, keeping keys other workers updated meanwhile"""
+        if not self._touched:
+            return
+        samples = {}
+        if self.path.exists():
+            try:
+                samples = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                samples = {}
+        for key in self._touched:
+            samples[key] = self.samples[key]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(samples, indent=2, sort_keys=True))
+        os.replace(tmp_path, self.path)
+        self._touched.clear()
+
+
+class PerformanceBudget:
+    """Checks measurements against budgets and the baseline
+    
+    A metric regresses when it exceeds the baseline mean by more than
+    regression_sigma standard deviations (and by at least MIN_REGRESSION_DELTA),
+    once the baseline holds min_samples passing runs.
+    """
+    
+    def __init__(self, budgets: Dict[str, float], baseline: Optional[PerformanceBaseline] = None,
+                 regression_sigma: float = 3.0, min_samples: int = 5):
+        self.budgets = budgets
+        self.baseline = baseline
+        self.regression_sigma = regression_sigma
+        # stdev needs at least two samples
+        self.min_samples = max(min_samples, 2)
+    
+    def check(self, key: str, metrics: Dict[str, Any]) -> List[str]:
+        """Return one message per exceeded budget or regressed metric"""
+        failures = []
+        for metric, limit in self.budgets.items():
+            value = metrics.get(metric)
+            if value is not None and value > limit:
+                failures.append(f"{key}: {metric} {value:.4g} over budget {limit:.4g}")
+        if self.baseline is None or not self.regression_sigma:
+            return failures
+        for metric in METRICS:
+            value = metrics.get(metric)
+            history = self.baseline.history(key, metric)
+            if value is None or len(history) < self.min_samples:
+                continue
+            mean = statistics.mean(history)
+            allowed = max(self.regression_sigma * statistics.stdev(history), MIN_REGRESSION_DELTA.get(metric, 0))
+            if value > mean + allowed:
+                failures.append(
+                    f"{key}: {metric} {value:.4g} regressed from baseline mean {mean:.4g} "
+                    f"(allowed +{allowed:.4g}, n={len(history)})"
+                )
+        return failures
+
+
+class PerformanceRecorder:
+    """Per-test collector that BasePage.navigate reports into"""
+    
+    def __init__(self, budget: PerformanceBudget):
+        self.budget = budget
+        self.measurements: List[Tuple[str, Dict[str, Any]]] = []
+        self.failures: List[str] = []
+    
+    def record(self, url: str, viewport: Optional[Dict[str, int]], metrics: Dict[str, Any]):
+        """Check one navigation's metrics; failures are collected, not raised"""
+        key = baseline_key(url, viewport)
+        self.measurements.append((key, metrics))
+        self.failures.extend(self.budget.check(key, metrics))
+    
+    def update_baseline(self):
+        """Add this test's measurements to the baseline (call only for passing runs)"""
+        if self.budget.baseline is None:
+            return
+        for key, metrics in self.measurements:
+            self.budget.baseline.add(key, metrics)
@@ -0,0 +1,223 @@
+"""Per-test video and trace recording with off / on / retain-on-failure modes
+
+The context of a recorded test gets its own temporary video directory and a
+tracing session. When the test passes and its mode is retain-on-failure, the
+trace chunk is discarded by the driver without ever being packed into a zip
+and the video is deleted with its temp directory. Only kept recordings reach
+videos/ and traces/.
+
+Presets trade detail for cost: "low" records small videos and traces without
+screencast frames (DOM snapshots are still there), which keeps the recorder's
+share of a test's wall time small.
+
+Most of the cost is paid while the test runs (screencast encoding, a DOM
+snapshot per action), so it can't be timed directly. RecordingCalibration runs
+a fixed workload once with and once without recording and turns the
+difference into a slowdown factor; a test's recording cost is that share of
+its duration plus the timed start/stop/save work.
+"""
+
+import re
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from playwright.sync_api import Browser, BrowserContext, Error, Page
+
+
+MODES = ("off", "on", "retain-on-failure")
+
+PRESETS: Dict[str, Dict[str, Any]] = {
+    "low": {"video_size": {"width": 640, "height": 360}, "screenshots": False, "sources": False},
+    "medium": {"video_size": {"width": 960, "height": 540}, "screenshots": True, "sources": False},
+    "full": {"video_size": None, "screenshots": True, "sources": True},  # video at viewport size
+}
+
+
+# Workload of the calibration: actions that each get a DOM snapshot and repaint the screen
+_CALIBRATION_HTML = "<ul>" + "".join(
+    f'<li><button id="b{i}" onclick="this.textContent += \'!\'">Item {i}</button></li>' for i in range(100)
+) + "</ul>"
+_CALIBRATION_ACTIONS = 30
+
+
+def check_mode(mode: str) -> str:
+    mode = mode.lower()
+    if mode not in MODES:
+        raise ValueError(f"Recording mode must be one of {MODES}, got {mode!r}")
+    return mode
+
+
+def artifact_name(nodeid: str) -> str:
+    """File-system safe name for a test's artifacts"""
+    return re.sub(r"[^\w.-]+", "_", nodeid)[-180:]
+
+
+class Recorder:
+    """Video and trace of one test's context
+    
+    Example:
+        recorder = Recorder(nodeid, "retain-on-failure", "retain-on-failure", preset="low")
+        context = browser.new_context(**context_args, **recorder.context_args())
+        recorder.start(context)
+        ...
+        kept = recorder.finish(failed=False)      # closes the context, {} for a passed test
+        recorder.overhead_percent(test_seconds, calibration.slowdown(recorder))
+    """
+    
+    def __init__(self, nodeid: str, video_mode: str = "off", trace_mode: str = "off", preset: str = "low",
+                 videos_dir: Path = Path("videos"), traces_dir: Path = Path("traces")):
+        if preset not in PRESETS:
+            raise ValueError(f"Recording preset must be one of {tuple(PRESETS)}, got {preset!r}")
+        self.name = artifact_name(nodeid)
+        self.video_mode = check_mode(video_mode)
+        self.trace_mode = check_mode(trace_mode)
+        self.preset_name = preset
+        self.preset = PRESETS[preset]
+        self.videos_dir = Path(videos_dir)
+        self.traces_dir = Path(traces_dir)
+        self.overhead_seconds = 0.0
+        self._context: Optional[BrowserContext] = None
+        self._pages: List[Page] = []
+        self._video_dir: Optional[str] = None
+    
+    @property
+    def active(self) -> bool:
+        return self.video_mode != "off" or self.trace_mode != "off"
+    
+    def context_args(self) -> Dict[str, Any]:
+        """Extra new_context() arguments for the video"""
+        if self.video_mode == "off":
+            return {}
+        self._video_dir = tempfile.mkdtemp(prefix="video-")
+        args = {"record_video_dir": self._video_dir}
+        if self.preset["video_size"]:
+            args["record_video_size"] = self.preset["video_size"]
+        return args
+    
+    def start(self, context: BrowserContext):
+        self._context = context
+        # Closed pages leave context.pages but their videos are still worth keeping
+        context.on("page", self._pages.append)
+        if self.trace_mode == "off":
+            return
+        started = time.perf_counter()
+        context.tracing.start(
+            title=self.name,
+            snapshots=True,
+            screenshots=self.preset["screenshots"],
+            sources=self.preset["sources"],
+        )
+        self.overhead_seconds += time.perf_counter() - started
+    
+    @staticmethod
+    def _keep(mode: str, failed: bool) -> bool:
+        return mode == "on" or (mode == "retain-on-failure" and failed)
+    
+    def finish(self, failed: bool) -> Dict[str, Path]:
+        """Stop tracing, close the context and keep or drop the recordings
+        
+        Args:
+            failed: Whether the test failed (decides retain-on-failure)
+        
+        Returns:
+            Paths of the kept artifacts by kind ("video", "trace")
+        """
+        kept: Dict[str, Path] = {}
+        context = self._context
+        videos = [page.video for page in self._pages if page.video] if self.video_mode != "off" else []
+        try:
+            if self.trace_mode != "off":
+                started = time.perf_counter()
+                if self._keep(self.trace_mode, failed):
+                    kept["trace"] = self.traces_dir / f"{self.name}.zip"
+                    self.traces_dir.mkdir(parents=True, exist_ok=True)
+                    context.tracing.stop(path=kept["trace"])
+                else:
+                    context.tracing.stop()  # no path: the driver discards the chunk
+                self.overhead_seconds += time.perf_counter() - started
+        finally:
+            try:
+                # Closing finalises the videos; it's the test's teardown, not recorder cost
+                context.close()
+                if videos and self._keep(self.video_mode, failed):
+                    self._save_videos(videos, kept)
+            finally:
+                if self._video_dir:
+                    shutil.rmtree(self._video_dir, ignore_errors=True)
+        return kept
+    
+    def _save_videos(self, videos: List[Any], kept: Dict[str, Path]):
+        started = time.perf_counter()
+        self.videos_dir.mkdir(parents=True, exist_ok=True)
+        for index, video in enumerate(videos):
+            suffix = "" if len(videos) == 1 else f"-{index + 1}"
+            path = self.videos_dir / f"{self.name}{suffix}.webm"
+            try:
+                video.save_as(path)
+            except Error:
+                continue  # page closed before anything was painted
+            kept.setdefault("video", path)
+        self.overhead_seconds += time.perf_counter() - started
+    
+    def cost_seconds(self, test_seconds: float, slowdown: float = 0.0) -> float:
+        """Timed start/stop/save work plus the calibrated in-test share of test_seconds"""
+        return self.overhead_seconds + test_seconds * slowdown / (1 + slowdown)
+    
+    def overhead_percent(self, test_seconds: float, slowdown: float = 0.0) -> float:
+        """Recorder cost as a percentage of the (recorded) test's duration
+        
+        Args:
+            test_seconds: Duration of the test's call phase
+            slowdown: Relative slowdown of recorded actions (RecordingCalibration.slowdown)
+        """
+        if test_seconds <= 0:
+            return 0.0
+        return 100.0 * self.cost_seconds(test_seconds, slowdown) / test_seconds
+
+
+class RecordingCalibration:
+    """Slowdown of actions under recording, measured once per mode and preset
+    
+    Example:
+        calibration = RecordingCalibration(browser, context_args)
+        slowdown = calibration.slowdown(recorder)   # 0.25 = recorded actions take 25% longer
+    """
+    
+    def __init__(self, browser: Browser, context_args: Optional[Dict[str, Any]] = None):
+        self.browser = browser
+        self.context_args = context_args or {}
+        self._slowdowns: Dict[tuple, float] = {}
+    
+    def _workload_seconds(self, context: BrowserContext) -> float:
+        page = context.new_page()
+        page.set_content(_CALIBRATION_HTML)
+        page.click("#b0")  # warm-up
+        started = time.perf_counter()
+        for index in range(_CALIBRATION_ACTIONS):
+            page.click(f"#b{index}")
+        return time.perf_counter() - started
+    
+    def slowdown(self, recorder: Recorder) -> float:
+        """Relative slowdown of actions with the recorder's video/trace settings (0 if none)"""
+        key = (recorder.video_mode != "off", recorder.trace_mode != "off", recorder.preset_name)
+        if key in self._slowdowns:
+            return self._slowdowns[key]
+        context = self.browser.new_context(**self.context_args)
+        try:
+            plain = self._workload_seconds(context)
+        finally:
+            context.close()
+        # retain-on-failure + a passed finish: the calibration leaves no artifacts behind
+        probe = Recorder("recording-calibration", "retain-on-failure" if key[0] else "off",
+                         "retain-on-failure" if key[1] else "off", preset=recorder.preset_name)
+        context = self.browser.new_context(**self.context_args, **probe.context_args())
+        probe.start(context)
+        try:
+            recorded = self._workload_seconds(context)
+        finally:
+            probe.finish(failed=False)
+        self._slowdowns[key] = max(0.0, recorded / plain - 1) if plain > 0 else 0.0
+        return self._slowdowns[key]
@@ -0,0 +1,174 @@
+"""Resource-blocking router for third-party and heavy assets
+
+Blocks or stubs requests by resource type and domain so tests don't pay for
+trackers, consent SDKs, video or large images their assertions never look at.
+"""
+
+import base64
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+from playwright.sync_api import BrowserContext, Response, Route
+
+
+# Transparent 1x1 GIF - keeps <img> elements laid out and "visible"
+_PIXEL_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+_STUB_BODIES = {
+    "image": ("image/gif", _PIXEL_GIF),
+    "script": ("application/javascript", b""),
+    "stylesheet": ("text/css", b""),
+    "xhr": ("application/json", b"{}"),
+    "fetch": ("application/json", b"{}"),
+}
+
+DEFAULT_BLOCKED_TYPES = ["media", "font"]
+DEFAULT_STUBBED_TYPES = ["image"]
+
+# Analytics/ads hosts - nothing under test depends on them
+DEFAULT_BLOCKED_DOMAINS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "hotjar.com",
+    "bing.com",
+    "criteo.com",
+    "tiktok.com",
+]
+
+
+class ResourceSizeCatalog:
+    """Remembers response sizes per URL so avoided bytes can be estimated
+    
+    Blocked requests never download, so their size is only known if the same URL
+    was answered unblocked earlier in this run or in a previous one. Sizes come
+    from the Content-Length header of responses (no driver round-trip); tests
+    without blocking only feed the catalog when asked to (learn_sizes).
+    """
+    
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self.sizes: Dict[str, int] = self._read()
+        self._learned: Dict[str, int] = {}
+    
+    def _read(self) -> Dict[str, int]:
+        if not (self.path and self.path.exists()):
+            return {}
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+    
+    # Only asset types worth blocking
+    LEARNED_TYPES = {"image", "media", "font", "script", "stylesheet"}
+    
+    def learn(self, response: Response):
+        if response.request.resource_type not in self.LEARNED_TYPES:
+            return
+        length = response.headers.get("content-length", "")
+        if length.isdigit() and int(length) > 0:
+            self.sizes[response.url] = self._learned[response.url] = int(length)
+    
+    def size_of(self, url: str) -> Optional[int]:
+        """Known size of url, None if it was never seen unblocked"""
+        return self.sizes.get(url)
+    
+    def save(self):
+        """Write the sizes learned by this process, keeping what other workers saved meanwhile"""
+        if not (self.path and self._learned):
+            return
+        sizes = {**self._read(), **self._learned}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(sizes))
+        os.replace(tmp_path, self.path)
+        self._learned.clear()
+
+
+class ResourceBlocker:
+    """Context-level route that aborts or stubs matching requests and counts them"""
+    
+    def __init__(self, blocked_types: Iterable[str] = (), blocked_domains: Iterable[str] = (),
+                 stubbed_types: Iterable[str] = (), catalog: Optional[ResourceSizeCatalog] = None,
+                 learn_sizes: bool = False):
+        self.blocked_types = set(blocked_types)
+        self.blocked_domains = [d.lower().lstrip(".") for d in blocked_domains]
+        self.stubbed_types = set(stubbed_types)
+        self.catalog = catalog or ResourceSizeCatalog()
+        # Feed the catalog even when nothing is blocked (costs a callback per response)
+        self.learn_sizes = learn_sizes
+        self.blocked = 0
+        self.stubbed = 0
+        self.bytes_avoided = 0
+        self.unsized = 0
+        self._context: Optional[BrowserContext] = None
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.blocked_types or self.blocked_domains or self.stubbed_types)
+    
+    def _domain_blocked(self, url: str) -> bool:
+        host = (urlparse(url).hostname or "").lower()
+        return any(host == d or host.endswith("." + d) for d in self.blocked_domains)
+    
+    def _count_avoided(self, url: str, served: int = 0):
+        size = self.catalog.size_of(url)
+        if size is None:
+            self.unsized += 1
+        else:
+            self.bytes_avoided += max(size - served, 0)
+    
+    def _handle(self, route: Route):
+        request = route.request
+        resource_type = request.resource_type
+        if resource_type in self.stubbed_types and resource_type in _STUB_BODIES:
+            content_type, body = _STUB_BODIES[resource_type]
+            self.stubbed += 1
+            self._count_avoided(request.url, len(body))
+            route.fulfill(status=200, content_type=content_type, body=body)
+        elif resource_type in self.blocked_types or self._domain_blocked(request.url):
+            self.blocked += 1
+            self._count_avoided(request.url)
+            route.abort("blockedbyclient")
+        else:
+            # Let any other route registered by the test handle it
+            route.fallback()
+    
+    @property
+    def _learning(self) -> bool:
+        return self.enabled or self.learn_sizes
+    
+    def attach(self, context: BrowserContext):
+        """Route the context's requests through the blocker and feed the size catalog (no-op if neither is on)"""
+        self._context = context
+        if self.enabled:
+            context.route("**/*", self._handle)
+        if self._learning:
+            context.on("response", self.catalog.learn)
+    
+    def detach(self):
+        """Remove the route and listener again"""
+        if self._context is None:
+            return
+        try:
+            if self.enabled:
+                self._context.unroute("**/*", self._handle)
+            if self._learning:
+                self._context.remove_listener("response", self.catalog.learn)
+        except Exception:
+            # Context may already be closed by pytest-playwright
+            pass
+        self._context = None
+    
+    def stats(self) -> Dict[str, int]:
+        """Per-test counters of avoided requests and bytes (of the requests with a known size)"""
+        return {
+            "blocked": self.blocked,
+            "stubbed": self.stubbed,
+            "bytes_avoided": self.bytes_avoided,
+            "unsized": self.unsized,
+        }
@@ -0,0 +1,120 @@
+"""Background writer for failure screenshots
+
+Tests hand over screenshot bytes and return immediately; a daemon thread
+optionally re-encodes them, stores each distinct image once under its content
+hash and keeps a manifest mapping tests to images.
+"""
+
+import hashlib
+import io
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from PIL import Image
+except ImportError:  # Only needed for WebP
+    Image = None
+
+
+FORMATS = ("png", "jpeg", "webp")
+
+
+def capture_options(image_format: str, quality: int) -> Dict:
+    """page.screenshot() kwargs for a format - Playwright encodes PNG and JPEG itself"""
+    if image_format == "jpeg":
+        return {"type": "jpeg", "quality": quality}
+    return {"type": "png"}
+
+
+class ScreenshotWriter:
+    """Deduplicating screenshot store fed through a queue
+    
+    Example:
+        writer = ScreenshotWriter(Path("screenshots"), image_format="webp")
+        writer.submit(request.node.nodeid, page.screenshot())
+        writer.close()  # drains the queue and writes the manifest
+    """
+    
+    def __init__(self, directory: Path, image_format: str = "png", quality: int = 80,
+                 manifest_name: str = "manifest.json"):
+        if image_format not in FORMATS:
+            raise ValueError(f"Screenshot format must be one of {FORMATS}, got {image_format!r}")
+        if image_format == "webp" and Image is None:
+            print("\n⚠️ SCREENSHOT_FORMAT=webp needs Pillow - keeping PNG")
+            image_format = "png"
+        self.directory = Path(directory)
+        self.image_format = image_format
+        self.quality = quality
+        self.manifest_path = self.directory / manifest_name
+        self.manifest: Dict[str, List[Dict]] = {}
+        self.duplicates = 0
+        self._seen = set()
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def extension(self) -> str:
+        return "jpg" if self.image_format == "jpeg" else self.image_format
+    
+    def submit(self, nodeid: str, image: bytes) -> Path:
+        """Queue a screenshot and return the path it will be stored at"""
+        digest = hashlib.sha1(image).hexdigest()[:16]
+        path = self.directory / f"{digest}.{self.extension}"
+        with self._lock:
+            duplicate = digest in self._seen
+            self._seen.add(digest)
+            if duplicate:
+                self.duplicates += 1
+            self.manifest.setdefault(nodeid, []).append({
+                "image": path.name,
+                "captured_at": datetime.now().isoformat(timespec="seconds"),
+                "duplicate": duplicate,
+            })
+        if not duplicate:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+                self._thread.start()
+            self._queue.put((path, image))
+        return path
+    
+    def _encode(self, image: bytes) -> bytes:
+        if self.image_format != "webp":
+            return image
+        out = io.BytesIO()
+        Image.open(io.BytesIO(image)).save(out, format="WEBP", quality=self.quality, method=4)
+        return out.getvalue()
+    
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                path, image = item
+                # Another xdist worker may already have stored the same image
+                if not path.exists():
+                    self.directory.mkdir(parents=True, exist_ok=True)
+                    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                    tmp_path.write_bytes(self._encode(image))
+                    os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"\n⚠️ Could not save screenshot {item[0]}: {e}")
+            finally:
+                self._queue.task_done()
+    
+    def close(self):
+        """Wait for pending writes, then write the manifest"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if not self.manifest:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest_path.write_text(json.dumps(self.manifest, indent=2))
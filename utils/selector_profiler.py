@@ -0,0 +1,233 @@
+"""Cost profiler and linter for the locator constants of the page objects
+
+Page objects use union selectors such as 'a[href="/"], .logo, img[alt*="logo"]'.
+Every alternative is resolved on its own on a loaded page (repeated runs,
+median time net of one driver round-trip) and its match count recorded, so
+alternatives that never match, match many elements or are slow to resolve
+(text-engine pseudo classes on a large DOM) can be dropped or rewritten.
+
+The static lint needs no browser: duplicate alternatives, text-engine
+alternatives and bare tag names are reported from the source alone.
+
+Usage:
+    python -m utils.selector_profiler --lint
+    python -m utils.selector_profiler https://www.outfittery.de --only OutfitteryHomePageLocators
+    python -m utils.selector_profiler https://example.com --runs 9 --slow-ms 3 --json reports/selectors.json
+"""
+
+import argparse
+import importlib
+import inspect
+import json
+import pkgutil
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from playwright.sync_api import Error, Page, sync_playwright
+
+
+TEXT_ENGINE = re.compile(r":has-text\(|:text(-is|-matches)?\(|(^|\s)text=|internal:text=")
+BARE_TAG = re.compile(r"^[a-zA-Z][a-zA-Z0-9-]*$")
+BASELINE_SELECTOR = "html"
+
+
+def split_alternatives(selector: str) -> List[str]:
+    """Top-level alternatives of a union selector (commas inside quotes, () and [] don't split)"""
+    parts = []
+    depth, quote, start = 0, None, 0
+    escaped = False
+    for index, char in enumerate(selector):
+        if quote:
+            # A backslash-escaped quote doesn't close the string
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                quote = None
+            continue
+        if char in "\"'":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(selector[start:index].strip())
+            start = index + 1
+    parts.append(selector[start:].strip())
+    return [part for part in parts if part]
+
+
+class LocatorConstant:
+    """An UPPER_CASE selector attribute of a page-object class"""
+    
+    def __init__(self, owner: str, name: str, selector: str):
+        self.owner = owner
+        self.name = name
+        self.selector = selector
+        self.alternatives = split_alternatives(selector)
+    
+    @property
+    def qualified_name(self) -> str:
+        return f"{self.owner}.{self.name}"
+
+
+def collect_locators(package: str = "pages") -> List[LocatorConstant]:
+    """Locator constants of every class defined in the package (shared *Locators classes once)"""
+    found: Dict[str, LocatorConstant] = {}
+    root = importlib.import_module(package)
+    modules = [root] + [importlib.import_module(info.name)
+                        for info in pkgutil.walk_packages(root.__path__, f"{package}.")]
+    for module in modules:
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            for name, value in vars(cls).items():
+                # Multi-line strings are in-page scripts, not selectors
+                if name.isupper() and isinstance(value, str) and "\n" not in value:
+                    found.setdefault(f"{cls.__name__}.{name}", LocatorConstant(cls.__name__, name, value))
+    return sorted(found.values(), key=lambda locator: locator.qualified_name)
+
+
+def lint_locators(locators: Iterable[LocatorConstant]) -> List[Dict[str, str]]:
+    """Problems visible without a browser"""
+    issues = []
+    for locator in locators:
+        seen = set()
+        for alternative in locator.alternatives:
+            if alternative in seen:
+                issues.append({"locator": locator.qualified_name, "alternative": alternative,
+                               "issue": "duplicate", "detail": "listed twice in the union"})
+            seen.add(alternative)
+            if TEXT_ENGINE.search(alternative):
+                issues.append({"locator": locator.qualified_name, "alternative": alternative, "issue": "text-engine",
+                               "detail": "scans the text of every candidate element; prefer an id, role or attribute"})
+            if BARE_TAG.match(alternative):
+                issues.append({"locator": locator.qualified_name, "alternative": alternative, "issue": "broad",
+                               "detail": "a bare tag name tends to match more than one element"})
+    return issues
+
+
+def _time_count(page: Page, selector: str, runs: int) -> Dict[str, Any]:
+    locator = page.locator(selector)
+    count = locator.count()  # warm-up, also compiles the selector in the page
+    durations = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        count = locator.count()
+        durations.append((time.perf_counter() - started) * 1000)
+    return {"count": count, "median_ms": statistics.median(durations), "max_ms": max(durations)}
+
+
+def profile_page(page: Page, locators: Iterable[LocatorConstant], runs: int = 5,
+                 slow_ms: float = 5.0) -> List[Dict[str, Any]]:
+    """Match count and resolution time of every alternative of every locator on the loaded page
+    
+    Args:
+        page: Page already showing the document to profile
+        locators: Locator constants to resolve
+        runs: Timed repetitions per alternative (the median is reported)
+        slow_ms: Net median above which an alternative is flagged as slow
+    
+    Returns:
+        One row per alternative plus one per whole union (alternative None), each with
+        count, median_ms (net of a trivial selector's round-trip), max_ms and flags
+    """
+    baseline = _time_count(page, BASELINE_SELECTOR, runs)["median_ms"]
+    rows = []
+    for locator in locators:
+        targets = locator.alternatives + ([None] if len(locator.alternatives) > 1 else [])
+        for alternative in targets:
+            row = {"url": page.url, "locator": locator.qualified_name, "alternative": alternative, "flags": []}
+            try:
+                row.update(_time_count(page, alternative or locator.selector, runs))
+            except Error as e:
+                row.update(count=None, median_ms=None, max_ms=None)
+                row["flags"].append("invalid")
+                row["error"] = str(e).splitlines()[0]
+                rows.append(row)
+                continue
+            row["median_ms"] = max(0.0, row["median_ms"] - baseline)
+            if row["count"] == 0:
+                row["flags"].append("no-match")
+            elif row["count"] > 1:
+                row["flags"].append("ambiguous")
+            if row["median_ms"] > slow_ms:
+                row["flags"].append("slow")
+            if alternative and TEXT_ENGINE.search(alternative):
+                row["flags"].append("text-engine")
+            rows.append(row)
+    return rows
+
+
+def never_matching(rows: List[Dict[str, Any]]) -> List[str]:
+    """Alternatives with no match on any of the profiled pages, as "Locator: alternative" """
+    matched = {}
+    for row in rows:
+        if row["alternative"] is None:
+            continue
+        key = f"{row['locator']}: {row['alternative']}"
+        matched[key] = matched.get(key, False) or bool(row["count"])
+    return sorted(key for key, hit in matched.items() if not hit)
+
+
+def format_report(rows: List[Dict[str, Any]], issues: List[Dict[str, str]]) -> str:
+    """Plain-text report: flagged alternatives per page, then lint issues"""
+    lines = []
+    for url in dict.fromkeys(row["url"] for row in rows):
+        lines.append(f"\n{url}")
+        lines.append(f"  {'count':>5}  {'ms':>7}  {'flags':<28} selector")
+        for row in (r for r in rows if r["url"] == url):
+            count = "-" if row["count"] is None else row["count"]
+            median = "-" if row["median_ms"] is None else f"{row['median_ms']:.2f}"
+            target = f"{row['locator']}: {row['alternative'] or '(whole union)'}"
+            lines.append(f"  {count:>5}  {median:>7}  {','.join(row['flags']):<28} {target}")
+    if rows:
+        missing = never_matching(rows)
+        lines.append(f"\nNever matching on any page ({len(missing)}):")
+        lines.extend(f"  {key}" for key in missing)
+    if issues:
+        lines.append(f"\nLint ({len(issues)}):")
+        lines.extend(f"  {i['issue']:<12} {i['locator']}: {i['alternative']} - {i['detail']}" for i in issues)
+    return "\n".join(lines).lstrip("\n")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Profile and lint the locator constants in pages/")
+    parser.add_argument("urls", nargs="*", help="Pages to resolve the locators on")
+    parser.add_argument("--only", action="append", default=[], help="Locator class to include (repeatable)")
+    parser.add_argument("--runs", type=int, default=5, help="Timed repetitions per selector")
+    parser.add_argument("--slow-ms", type=float, default=5.0, help="Net median that counts as slow")
+    parser.add_argument("--lint", action="store_true", help="Static lint only, no browser")
+    parser.add_argument("--json", dest="json_path", help="Also write rows and lint issues as JSON")
+    parser.add_argument("--browser", default="chromium")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args(argv)
+    if not args.lint and not args.urls:
+        parser.error("pass at least one URL, or --lint")
+    
+    locators = [locator for locator in collect_locators() if not args.only or locator.owner in args.only]
+    issues = lint_locators(locators)
+    rows: List[Dict[str, Any]] = []
+    if not args.lint:
+        with sync_playwright() as playwright:
+            browser = getattr(playwright, args.browser).launch(headless=not args.headed)
+            page = browser.new_page()
+            for url in args.urls:
+                page.goto(url, wait_until="load")
+                rows.extend(profile_page(page, locators, runs=args.runs, slow_ms=args.slow_ms))
+            browser.close()
+    
+    print(format_report(rows, issues))
+    if args.json_path:
+        path = Path(args.json_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"rows": rows, "never_matching": never_matching(rows), "lint": issues}, indent=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""Per-action latency breakdowns from Playwright trace zips
+
+Reads trace zips (pytest-playwright's --tracing, TRACE_MODE=on|retain-on-failure)
+as streams: trace.trace and trace.network are parsed line by line straight
+from the archive, snapshot and screencast lines are skipped before JSON
+decoding and resources/ is never touched.
+
+The time of every Playwright call is split into:
+    python         - gap since the previous call ended (test / page-object code)
+    actionability  - waiting for the element to exist, be visible, stable, enabled...
+    navigation     - navigations and load states, minus the time requests were in flight
+    network        - requests in flight during navigation
+    action         - the rest: the browser-side input or evaluation itself
+
+Calls are keyed by the page-object method that issued them (from the Python
+stack recorded in the trace), the Playwright API and the selector, and
+summed over all traces of a run into a ranked hot-spot report.
+
+Usage:
+    python -m utils.trace_analyzer traces/ test-results/
+    python -m utils.trace_analyzer traces/ --by method --top 15 --json reports/trace_hotspots.json
+"""
+
+import argparse
+import bisect
+import io
+import json
+import re
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+CATEGORIES = ("python", "actionability", "navigation", "network", "action")
+GROUPINGS = {
+    "call": ("method", "api", "locator"),
+    "method": ("method",),
+    "locator": ("locator",),
+    "api": ("api",),
+}
+
+_WANTED = {"context-options", "before", "log", "after", "resource-snapshot"}
+_TYPE = re.compile(r'"type":"([\w-]+)"')
+
+# What the driver does from a call-log message until the next one; first match wins
+_LOG_PHASES = [
+    ("action", re.compile(r"have been finished|resolved to|is visible, enabled and stable|"
+                          r"is visible and stable|done scrolling|action done", re.IGNORECASE)),
+    ("navigation", re.compile(r"navigat|waiting until|load state", re.IGNORECASE)),
+    ("actionability", re.compile(r"^(waiting|retrying|element is not|element is outside|"
+                                 r"element was detached|.*intercepts pointer events)", re.IGNORECASE)),
+]
+_NAVIGATION_METHODS = {"goto", "reload", "goBack", "goForward", "waitForURL", "waitForLoadState",
+                       "waitForNavigation"}
+
+
+def _phase_of(message: str) -> str:
+    text = message.strip()
+    for phase, pattern in _LOG_PHASES:
+        if pattern.search(text):
+            return phase
+    return "action"
+
+
+class TraceAction:
+    """One Playwright call from a trace, with its call log and time breakdown"""
+    
+    def __init__(self, call_id: str, api: str, method: str, start: float, params: Dict[str, Any]):
+        self.call_id = call_id
+        self.api = api
+        self.method = method
+        self.start = start
+        self.end: Optional[float] = None
+        self.params = params
+        self.logs: List[Tuple[float, str]] = []
+        self.error: Optional[str] = None
+        self.frames: List[Dict[str, Any]] = []
+        self.caller = "<unknown>"
+        self.location = ""
+        self.breakdown: Dict[str, float] = {}
+        self.requests = 0
+    
+    @property
+    def duration(self) -> float:
+        return (self.end or self.start) - self.start
+    
+    @property
+    def locator(self) -> str:
+        return self.params.get("selector") or self.params.get("url") or ""
+    
+    def segments(self) -> List[Tuple[str, float, float]]:
+        """(phase, start, end) spans covering the call, from its call log"""
+        phase = "navigation" if self.method in _NAVIGATION_METHODS else "action"
+        spans = []
+        cursor = self.start
+        for time, message in sorted(self.logs):
+            time = min(max(time, cursor), self.end)
+            spans.append((phase, cursor, time))
+            cursor = time
+            if self.method not in _NAVIGATION_METHODS:
+                phase = _phase_of(message)
+        spans.append((phase, cursor, self.end))
+        return [span for span in spans if span[2] > span[1]]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"api": self.api, "caller": self.caller, "location": self.location, "locator": self.locator,
+                "duration_ms": round(self.duration, 2), "requests": self.requests, "error": self.error,
+                "breakdown_ms": {k: round(v, 2) for k, v in self.breakdown.items()}}
+
+
+def _caller(frames: List[Dict[str, Any]], root: Optional[Path]) -> Tuple[str, str]:
+    """Page-object method (else helper, else test) that made the call, and its file:line
+    
+    Frames are innermost first; the outermost page-object frame is the method the test
+    called, not the BasePage primitive it delegates to.
+    """
+    def relative(frame):
+        path = Path(frame.get("file", ""))
+        if root is not None:
+            try:
+                return path.resolve().relative_to(root.resolve()).as_posix()
+            except ValueError:
+                pass
+        return path.as_posix()
+    
+    located = [(relative(frame), frame) for frame in frames]
+    for directory in ("pages/", "utils/"):
+        matches = [(path, frame) for path, frame in located
+                   if f"/{directory}" in f"/{path}" and "action_timing" not in path]
+        if matches:
+            path, frame = matches[-1]
+            return frame.get("function", "?"), f"{path}:{frame.get('line', 0)}"
+    if located:
+        path, frame = located[0]
+        return frame.get("function", "?"), f"{path}:{frame.get('line', 0)}"
+    return "<unknown>", ""
+
+
+def iter_trace_events(path: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(entry name, event) of the action and network events in a trace zip, streamed"""
+    with zipfile.ZipFile(path) as archive:
+        for name in archive.namelist():
+            if not name.endswith((".trace", ".network")):
+                continue
+            with archive.open(name) as raw:
+                for line in io.TextIOWrapper(raw, encoding="utf-8"):
+                    match = _TYPE.search(line, 0, 80)
+                    if match is None or match.group(1) not in _WANTED:
+                        continue  # snapshots and screencast frames are most of the bytes
+                    try:
+                        yield name, json.loads(line)
+                    except ValueError:
+                        continue  # truncated last line of an interrupted trace
+
+
+def _read_stacks(path: Path) -> Dict[str, List[Dict[str, Any]]]:
+    """call id -> Python frames, innermost first"""
+    with zipfile.ZipFile(path) as archive:
+        names = [name for name in archive.namelist() if name.endswith(".stacks")]
+        stacks = {}
+        for name in names:
+            with archive.open(name) as raw:
+                data = json.load(raw)
+            files = data.get("files", [])
+            for call_id, frames in data.get("stacks", []):
+                stacks[f"call@{call_id}"] = [
+                    {"file": files[file_index], "line": line, "column": column, "function": function}
+                    for file_index, line, column, function in frames
+                ]
+    return stacks
+
+
+def _merge(intervals: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    merged: List[Tuple[float, float]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _overlap(merged: List[Tuple[float, float]], starts: List[float], start: float, end: float) -> float:
+    """Time within [start, end] covered by the merged intervals"""
+    total = 0.0
+    index = max(bisect.bisect_right(starts, start) - 1, 0)
+    while index < len(merged) and merged[index][0] < end:
+        total += max(0.0, min(end, merged[index][1]) - max(start, merged[index][0]))
+        index += 1
+    return total
+
+
+class Trace:
+    """The actions and network requests of one trace zip"""
+    
+    def __init__(self, path: Path, title: str, actions: List[TraceAction], requests: List[Dict[str, Any]]):
+        self.path = Path(path)
+        self.title = title
+        self.actions = actions
+        self.requests = requests
+    
+    @classmethod
+    def load(cls, path: Path, root: Optional[Path] = None) -> "Trace":
+        path = Path(path)
+        title = path.parent.name if path.name == "trace.zip" else path.stem
+        actions: Dict[str, TraceAction] = {}
+        requests: List[Dict[str, Any]] = []
+        for _, event in iter_trace_events(path):
+            kind = event["type"]
+            if kind == "context-options":
+                title = event.get("title") or title
+            elif kind == "before":
+                actions[event["callId"]] = TraceAction(event["callId"], event.get("apiName", ""),
+                                                       event.get("method", ""), event["startTime"],
+                                                       event.get("params") or {})
+            elif kind == "log" and event.get("callId") in actions:
+                actions[event["callId"]].logs.append((event["time"], event.get("message", "")))
+            elif kind == "after" and event.get("callId") in actions:
+                action = actions[event["callId"]]
+                action.end = event["endTime"]
+                if event.get("error"):
+                    action.error = event["error"].get("message", str(event["error"]))
+            elif kind == "resource-snapshot":
+                snapshot = event["snapshot"]
+                start = snapshot.get("_monotonicTime")
+                if start is not None:
+                    requests.append({"url": snapshot["request"]["url"], "start": start,
+                                     "end": start + max(snapshot.get("time") or 0, 0),
+                                     "status": snapshot.get("response", {}).get("status")})
+        
+        stacks = _read_stacks(path)
+        finished = sorted((a for a in actions.values() if a.end is not None), key=lambda a: a.start)
+        for action in finished:
+            action.frames = stacks.get(action.call_id, [])
+            action.caller, action.location = _caller(action.frames, root)
+        trace = cls(path, title, finished, requests)
+        trace.attribute()
+        return trace
+    
+    def attribute(self):
+        """Fill in every action's breakdown (see the module docstring for the categories)"""
+        merged = _merge([(r["start"], r["end"]) for r in self.requests])
+        starts = [start for start, _ in merged]
+        request_starts = sorted(r["start"] for r in self.requests)
+        previous_end = None
+        for action in self.actions:
+            breakdown = dict.fromkeys(CATEGORIES, 0.0)
+            if previous_end is not None:
+                breakdown["python"] = max(0.0, action.start - previous_end)
+            for phase, start, end in action.segments():
+                if phase == "navigation":
+                    in_flight = _overlap(merged, starts, start, end)
+                    breakdown["network"] += in_flight
+                    breakdown["navigation"] += end - start - in_flight
+                else:
+                    breakdown[phase] += end - start
+            action.breakdown = breakdown
+            action.requests = (bisect.bisect_right(request_starts, action.end)
+                               - bisect.bisect_left(request_starts, action.start))
+            # Nested calls (expect_navigation around a click) don't open a Python gap
+            previous_end = action.end if previous_end is None else max(previous_end, action.end)
+
+
+class HotSpots:
+    """Breakdowns summed over many traces and ranked by total time"""
+    
+    def __init__(self, by: str = "call"):
+        if by not in GROUPINGS:
+            raise ValueError(f"Grouping must be one of {tuple(GROUPINGS)}, got {by!r}")
+        self.by = by
+        self.traces = 0
+        self.groups: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+    
+    def _key(self, action: TraceAction) -> Tuple[str, ...]:
+        fields = {"method": action.caller, "api": action.api, "locator": action.locator}
+        return tuple(fields[name] for name in GROUPINGS[self.by])
+    
+    def add(self, trace: Trace):
+        self.traces += 1
+        for action in trace.actions:
+            group = self.groups.setdefault(self._key(action), {
+                "calls": 0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0, "requests": 0,
+                "breakdown_ms": dict.fromkeys(CATEGORIES, 0.0), "tests": set(), "location": action.location,
+            })
+            total = sum(action.breakdown.values())
+            group["calls"] += 1
+            group["total_ms"] += total
+            group["max_ms"] = max(group["max_ms"], total)
+            group["errors"] += bool(action.error)
+            group["requests"] += action.requests
+            group["tests"].add(trace.title)
+            for category, value in action.breakdown.items():
+                group["breakdown_ms"][category] += value
+    
+    def ranked(self) -> List[Tuple[Tuple[str, ...], Dict[str, Any]]]:
+        return sorted(self.groups.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+    
+    def to_dict(self, top: Optional[int] = None) -> Dict[str, Any]:
+        fields = GROUPINGS[self.by]
+        rows = []
+        for key, group in self.ranked()[:top]:
+            rows.append({
+                **dict(zip(fields, key)),
+                **{k: v for k, v in group.items() if k not in ("tests", "breakdown_ms", "total_ms", "max_ms")},
+                "total_ms": round(group["total_ms"], 2),
+                "max_ms": round(group["max_ms"], 2),
+                "breakdown_ms": {k: round(v, 2) for k, v in group["breakdown_ms"].items()},
+                "tests": len(group["tests"]),
+            })
+        return {"traces": self.traces, "by": self.by, "hotspots": rows}
+    
+    def format(self, top: int = 20) -> str:
+        """Plain-text ranked table"""
+        lines = [f"Hot spots over {self.traces} trace(s), by {self.by}"]
+        header = f"{'#':>3}  {'total s':>8}  {'calls':>5}  " + "  ".join(f"{c[:8]:>8}" for c in CATEGORIES)
+        lines.append(header)
+        for rank, (key, group) in enumerate(self.ranked()[:top], 1):
+            shares = "  ".join(f"{group['breakdown_ms'][c] / 1000:>8.2f}" for c in CATEGORIES)
+            lines.append(f"{rank:>3}  {group['total_ms'] / 1000:>8.2f}  {group['calls']:>5}  {shares}")
+            lines.append(f"     {' | '.join(part for part in key if part)[:160]}")
+        return "\n".join(lines)
+
+
+def find_traces(paths: Iterable[Path]) -> List[Path]:
+    """Trace zips given directly or found under directories"""
+    found = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            found.extend(sorted(path.rglob("*.zip")))
+        elif path.suffix == ".zip":
+            found.append(path)
+    return found
+
+
+def analyze_traces(paths: Iterable[Path], by: str = "call", root: Optional[Path] = Path(".")) -> HotSpots:
+    """Load every trace under paths and aggregate their hot spots"""
+    hotspots = HotSpots(by)
+    for path in find_traces(paths):
+        try:
+            hotspots.add(Trace.load(path, root))
+        except (zipfile.BadZipFile, KeyError) as e:
+            print(f"⚠️ Skipping {path}: {e}")
+    return hotspots
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Rank where test time goes across Playwright trace zips")
+    parser.add_argument("paths", nargs="*", default=["traces", "test-results"], help="Trace zips or directories")
+    parser.add_argument("--by", choices=sorted(GROUPINGS), default="call", help="Grouping of the hot spots")
+    parser.add_argument("--top", type=int, default=20, help="Number of hot spots to show")
+    parser.add_argument("--json", dest="json_path", help="Also write the ranked report as JSON")
+    args = parser.parse_args(argv)
+    
+    hotspots = analyze_traces(args.paths, by=args.by)
+    print(hotspots.format(args.top))
+    if args.json_path:
+        path = Path(args.json_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(hotspots.to_dict(args.top), indent=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Viewport matrix runner
+
+Runs the same check in one browser context per viewport or device descriptor.
+Contexts are created on the session's browser (pytest-playwright's `browser`
+fixture), so --browser, --headed and the launch options apply and no second
+driver or browser is started; a new context costs a few milliseconds.
+
+Firefox has no mobile emulation, so device descriptors with is_mobile are
+reported as skipped there instead of failing.
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from playwright.sync_api import Browser, Page
+
+from utils.test_data import TestData
+
+
+# Receives a fresh page sized for the target and the target's name
+MatrixCheck = Callable[[Page, str], Any]
+Target = Union[str, Tuple[str, Dict[str, Any]]]
+
+
+class MatrixResult:
+    """Per-target outcome and timing of one matrix run"""
+    
+    def __init__(self, outcomes: List[Dict[str, Any]], wall_time: float):
+        self.outcomes = outcomes
+        self.wall_time = wall_time
+    
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        for outcome in self.outcomes:
+            if outcome["name"] == name:
+                return outcome
+        raise KeyError(name)
+    
+    @property
+    def failures(self) -> List[Dict[str, Any]]:
+        return [outcome for outcome in self.outcomes if outcome["error"]]
+    
+    @property
+    def skipped(self) -> List[Dict[str, Any]]:
+        return [outcome for outcome in self.outcomes if outcome["skipped"]]
+    
+    def summary(self) -> str:
+        lines = [f"{len(self.outcomes)} viewports in {self.wall_time:.2f}s ({len(self.skipped)} skipped)"]
+        for outcome in self.outcomes:
+            size = outcome["viewport"]
+            size = f"{size['width']}x{size['height']}" if size else "-"
+            if outcome["error"]:
+                status = f"FAILED: {outcome['error']}"
+            elif outcome["skipped"]:
+                status = f"skipped: {outcome['skipped']}"
+            else:
+                status = "ok"
+            lines.append(f"  {outcome['name']:<20}{size:>11}{outcome['duration']:>7.2f}s  {status}")
+        return "\n".join(lines)
+    
+    def assert_all(self):
+        """Raise one AssertionError naming every failed target"""
+        if self.failures:
+            raise AssertionError(
+                f"{len(self.failures)} of {len(self.outcomes)} viewport(s) failed:\n"
+                + "\n".join(f"  - {o['name']}: {o['error']}" for o in self.failures)
+            )
+
+
+class ViewportMatrix:
+    """Runs a check across many viewports, one context each on a shared browser
+    
+    Example:
+        def check(page, name):
+            page.goto(base_url)
+            assert page.locator("h1").is_visible()
+        
+        result = matrix.run(check)                       # every TestData.VIEWPORTS entry
+        result = matrix.run(check, ["mobile", "iPhone 13"])  # viewport names or device descriptors
+        result.assert_all()
+    """
+    
+    def __init__(self, browser: Browser, devices: Dict[str, Dict[str, Any]], context_args: Optional[Dict] = None):
+        self.browser = browser
+        self.devices = devices
+        self.browser_name = browser.browser_type.name
+        # Size comes from the target, everything else (base_url, locale...) is shared
+        self.context_args = {
+            k: v for k, v in (context_args or {}).items() if k not in ("viewport", "screen", "no_viewport")
+        }
+    
+    def resolve(self, target: Target) -> Tuple[str, Dict[str, Any]]:
+        """Context options for a TestData.VIEWPORTS name, a Playwright device name or (name, options)"""
+        if isinstance(target, tuple):
+            return target
+        if target in TestData.VIEWPORTS:
+            return target, {"viewport": TestData.VIEWPORTS[target]}
+        if target in self.devices:
+            device = dict(self.devices[target])
+            device.pop("default_browser_type", None)
+            return target, device
+        raise KeyError(f"Unknown viewport or device {target!r}")
+    
+    def _skip_reason(self, options: Dict[str, Any]) -> Optional[str]:
+        if options.get("is_mobile") and self.browser_name == "firefox":
+            return "is_mobile is not supported in Firefox"
+        return None
+    
+    def _run_one(self, check: MatrixCheck, name: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        outcome = {"name": name, "viewport": options.get("viewport"), "result": None, "error": None,
+                   "skipped": self._skip_reason(options), "duration": 0.0}
+        if outcome["skipped"]:
+            return outcome
+        start = time.perf_counter()
+        context = self.browser.new_context(**{**self.context_args, **options})
+        try:
+            page = context.new_page()
+            outcome["result"] = check(page, name)
+        except Exception as e:
+            outcome["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            context.close()
+            outcome["duration"] = time.perf_counter() - start
+        return outcome
+    
+    def run(self, check: MatrixCheck, targets: Optional[Iterable[Target]] = None) -> MatrixResult:
+        """Run check once per target (default: every TestData.VIEWPORTS entry)"""
+        resolved = [self.resolve(t) for t in (targets if targets is not None else TestData.VIEWPORTS)]
+        start = time.perf_counter()
+        outcomes = [self._run_one(check, name, options) for name, options in resolved]
+        return MatrixResult(outcomes, time.perf_counter() - start)
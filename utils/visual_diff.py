@@ -0,0 +1,230 @@
+"""Visual regression engine
+
+Compares screenshots against stored baselines tile by tile in NumPy. Each
+tile is first checked for exact equality; only differing tiles get the
+perceptual (YIQ) colour distance, and scanning stops as soon as the
+diff-pixel budget is exceeded. Float math is done on one tile at a time, so a
+4K full-page screenshot never needs a full-size float copy.
+
+Needs numpy and Pillow, both pinned in requirements.txt.
+"""
+
+import io
+from pathlib import Path
+from typing import Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+
+# (x, y, width, height) in screenshot pixels
+Region = Tuple[int, int, int, int]
+
+# Largest possible YIQ delta between two colours (black vs white), see pixelmatch
+_MAX_YIQ_DELTA = 35215.0
+
+
+def load_image(source: Union[bytes, str, Path]) -> np.ndarray:
+    """Decode PNG/JPEG bytes or a file into an HxWx3 uint8 RGB array"""
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    with Image.open(source) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def save_image(array: np.ndarray, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(array).save(path)
+
+
+def _yiq_delta(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Perceptual colour distance per pixel, 0 (same) to 1 (black vs white)"""
+    a = a.astype(np.float32)
+    b = b.astype(np.float32)
+    r, g, bl = a[..., 0] - b[..., 0], a[..., 1] - b[..., 1], a[..., 2] - b[..., 2]
+    y = r * 0.29889531 + g * 0.58662247 + bl * 0.11448223
+    i = r * 0.59597799 - g * 0.27417610 - bl * 0.32180189
+    q = r * 0.21147017 - g * 0.52261711 + bl * 0.31114694
+    return (0.5053 * y * y + 0.299 * i * i + 0.1957 * q * q) / _MAX_YIQ_DELTA
+
+
+class DiffResult:
+    """Outcome of compare_images"""
+    
+    def __init__(self, diff_pixels: int, budget: int, compared_pixels: int, tiles_checked: int,
+                 tiles_total: int, reason: str = "", baseline: Optional[np.ndarray] = None,
+                 diff_tiles: Optional[list] = None, tile: int = 256):
+        self.diff_pixels = diff_pixels
+        self.budget = budget
+        self.compared_pixels = compared_pixels
+        self.tiles_checked = tiles_checked
+        self.tiles_total = tiles_total
+        self.reason = reason
+        self._baseline = baseline
+        self._diff_tiles = diff_tiles
+        self._tile = tile
+        self._heatmap: Optional[np.ndarray] = None
+    
+    @property
+    def passed(self) -> bool:
+        return not self.reason and self.diff_pixels <= self.budget
+    
+    @property
+    def heatmap(self) -> Optional[np.ndarray]:
+        """RGB heatmap of the differing tiles, built on first access (None without differences)"""
+        if self._heatmap is None and self._diff_tiles:
+            self._heatmap = _heatmap(self._baseline, self._diff_tiles, self._tile)
+        return self._heatmap
+    
+    @property
+    def early_exit(self) -> bool:
+        """True when scanning stopped before the last tile"""
+        return self.tiles_checked < self.tiles_total
+    
+    @property
+    def diff_ratio(self) -> float:
+        return self.diff_pixels / self.compared_pixels if self.compared_pixels else 0.0
+    
+    def summary(self) -> str:
+        if self.reason:
+            return self.reason
+        scanned = " (stopped early)" if self.early_exit else ""
+        return (f"{self.diff_pixels} differing pixels, budget {self.budget} "
+                f"({self.diff_ratio:.4%} of compared area){scanned}")
+
+
+def _tiles(height: int, width: int, tile: int) -> Iterator[Tuple[int, int]]:
+    """Top-left corners of the tiles, row by row"""
+    for top in range(0, height, tile):
+        for left in range(0, width, tile):
+            yield top, left
+
+
+def _mask_for_tile(masks: Sequence[Region], top: int, left: int, height: int, width: int) -> Optional[np.ndarray]:
+    """Boolean array, True where the tile is masked out (None if no mask touches it)"""
+    keep = None
+    for x, y, w, h in masks:
+        y0, y1 = max(y - top, 0), min(y + h - top, height)
+        x0, x1 = max(x - left, 0), min(x + w - left, width)
+        if y0 >= y1 or x0 >= x1:
+            continue
+        if keep is None:
+            keep = np.zeros((height, width), dtype=bool)
+        keep[y0:y1, x0:x1] = True
+    return keep
+
+
+def _masked_area(masks: Sequence[Region], height: int, width: int) -> int:
+    if not masks:
+        return 0
+    covered = np.zeros((height, width), dtype=bool)
+    for x, y, w, h in masks:
+        covered[max(y, 0):max(y + h, 0), max(x, 0):max(x + w, 0)] = True
+    return int(covered.sum())
+
+
+def _heatmap(baseline: np.ndarray, diff_tiles: list, tile: int) -> np.ndarray:
+    """Baseline dimmed to grey with differing pixels in red, built one tile at a time"""
+    heat = np.empty_like(baseline)
+    for top, left in _tiles(*baseline.shape[:2], tile):
+        b = baseline[top:top + tile, left:left + tile].astype(np.uint16)
+        grey = ((b[..., 0] * 77 + b[..., 1] * 150 + b[..., 2] * 29) >> 10).astype(np.uint8)
+        heat[top:top + tile, left:left + tile] = grey[..., None]
+    for top, left, changed, intensity in diff_tiles:
+        region = heat[top:top + tile, left:left + tile]
+        region[changed] = 0
+        region[..., 0][changed] = intensity[changed]
+    return heat
+
+
+def compare_images(actual: np.ndarray, baseline: np.ndarray, masks: Sequence[Region] = (),
+                   tolerance: float = 0.1, max_diff_ratio: float = 0.001, max_diff_pixels: Optional[int] = None,
+                   tile: int = 256, heatmap: bool = True, early_exit: bool = True) -> DiffResult:
+    """Compare two RGB arrays
+    
+    Args:
+        masks: Regions ignored by the comparison (clocks, ads, carousels)
+        tolerance: Per-pixel perceptual threshold, 0 (exact) to 1; 0.1 ignores
+            anti-aliasing and compression noise
+        max_diff_ratio: Share of compared pixels allowed to differ
+        max_diff_pixels: Absolute budget, overrides max_diff_ratio
+        tile: Tile edge in pixels
+        heatmap: Keep what DiffResult.heatmap needs (baseline dimmed to grey, differences in
+            red); the image itself is only built when read, and after an early exit it
+            only shows the tiles scanned so far
+        early_exit: Stop at the first tile that pushes the count over budget
+    """
+    if actual.shape != baseline.shape:
+        return DiffResult(0, 0, 0, 0, 0, reason=f"Size changed: {baseline.shape[1]}x{baseline.shape[0]} "
+                                                f"-> {actual.shape[1]}x{actual.shape[0]}")
+    height, width = actual.shape[:2]
+    compared = height * width - _masked_area(masks, height, width)
+    budget = max_diff_pixels if max_diff_pixels is not None else int(compared * max_diff_ratio)
+    threshold = tolerance * tolerance
+    tiles_total = -(-height // tile) * -(-width // tile)
+    
+    diff_pixels = 0
+    tiles_checked = 0
+    diff_tiles = []
+    for top, left in _tiles(height, width, tile):
+        tiles_checked += 1
+        a = actual[top:top + tile, left:left + tile]
+        b = baseline[top:top + tile, left:left + tile]
+        if np.array_equal(a, b):
+            continue
+        delta = _yiq_delta(a, b)
+        changed = delta > threshold
+        ignored = _mask_for_tile(masks, top, left, *changed.shape)
+        if ignored is not None:
+            changed &= ~ignored
+        count = int(changed.sum())
+        if not count:
+            continue
+        diff_pixels += count
+        if heatmap:
+            intensity = (128 + np.minimum(delta * 4, 1) * 127).astype(np.uint8)
+            diff_tiles.append((top, left, changed, intensity))
+        if early_exit and diff_pixels > budget:
+            break
+    return DiffResult(diff_pixels, budget, compared, tiles_checked, tiles_total,
+                      baseline=baseline, diff_tiles=diff_tiles, tile=tile)
+
+
+class VisualBaselines:
+    """Baseline images on disk plus the artifacts of failed comparisons"""
+    
+    def __init__(self, baseline_dir: Path, artifacts_dir: Path, update: bool = False, **compare_options):
+        self.baseline_dir = Path(baseline_dir)
+        self.artifacts_dir = Path(artifacts_dir)
+        self.update = update
+        self.compare_options = compare_options
+    
+    def baseline_path(self, name: str) -> Path:
+        return self.baseline_dir / f"{name}.png"
+    
+    def check(self, name: str, screenshot: bytes, masks: Sequence[Region] = (), **options) -> DiffResult:
+        """Compare a screenshot with its baseline, creating the baseline on first use
+        
+        Raises:
+            AssertionError: With paths to the actual image and heatmap if they differ
+        """
+        path = self.baseline_path(name)
+        actual = load_image(screenshot)
+        if self.update or not path.exists():
+            existed = path.exists()
+            save_image(actual, path)
+            print(f"\n🖼️ Baseline {'updated' if existed else 'created'}: {path}")
+            return DiffResult(0, 0, actual.shape[0] * actual.shape[1], 0, 0)
+        
+        result = compare_images(actual, load_image(path), masks, **{**self.compare_options, **options})
+        if not result.passed:
+            actual_path = self.artifacts_dir / f"{name}-actual.png"
+            save_image(actual, actual_path)
+            details = [f"Visual regression in '{name}': {result.summary()}", f"  actual:   {actual_path}"]
+            if result.heatmap is not None:
+                heatmap_path = self.artifacts_dir / f"{name}-diff.png"
+                save_image(result.heatmap, heatmap_path)
+                details.append(f"  heatmap:  {heatmap_path}")
+            details.append(f"  baseline: {path}")
+            raise AssertionError("\n".join(details))
+        return result